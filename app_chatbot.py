@@ -19,16 +19,14 @@ Derived features (auto-generated):
 Model Output:
 - energy_consumption_kwh: float (total only, no breakdown)
 
-Model Performance (Regenerated Plots 2026-02-14):
-- R² = 0.9888
-- MAE = 14.58 kWh
-- RMSE = 18.56 kWh
+Model Performance:
+- R², MAE and RMSE are read from the metrics sidecar written by the training
+  scripts (models/electricbills_predict.metrics.json, bound to the model's
+  sha256); the predictor loads it once and the UI shows predictor.metrics
 - Pickle Protocol: 4 (Python 3.11 compatible)
 """
 
 import streamlit as st
-import time
-from pathlib import Path
 
 # Import components
 from components.landing import render_landing_page
@@ -39,7 +37,11 @@ from components.sidebar import render_sidebar
 
 # Import utilities
 from conversation.manager import ConversationManager
-from utils.model_predictor import ElectricityPredictor
+from utils.latency_budget import ux_delay
+from utils.style_registry import emit_style, file_css
+from core.warmup import FAILED
+from utils.app_warmup import APP_STYLESHEETS, start_app_warmup
+from utils.model_predictor import predict_with_feedback, report_load_problems
 from utils.js_injector import inject_smooth_scroll, inject_custom_scrollbar, inject_loading_overlay, inject_quick_reply_styles
 
 # Page configuration
@@ -53,30 +55,71 @@ st.set_page_config(
 # APP VERSION - Change this to force cache clear on Streamlit Cloud
 APP_VERSION = "2.0.0"
 
+# Longest a prediction waits on a warm-up still in progress before asking the user to retry
+MODEL_WAIT_TIMEOUT_S = 10
+
 # Initialize managers
 if 'conv_manager' not in st.session_state:
     st.session_state.conv_manager = ConversationManager()
 
-# Model should be cached globally (Resource) with version to bust cache
-@st.cache_resource(ttl="1h") 
-def get_predictor(version=APP_VERSION):
-    """Load predictor with version-based cache busting"""
-    return ElectricityPredictor()
-
+# One hot-swappable predictor per process, loaded and warmed on a background
+# thread: model load, a full-grid dummy batch, calendar and CSS caches. It is
+# started by scripts/serve_app.py before the server accepts connections (or
+# by the first run of this script); the landing page and the questions render
+# meanwhile, and the health endpoint (port in ROO_LOT_HEALTH_PORT) reports
+# ready only afterwards. A failed warm-up (e.g. no model yet) is retried with
+# backoff on later runs, so a model published afterwards is picked up.
+# Each rerun then stats the registry pointer and model files; a newly
+# published model is loaded and warmed in the background and swapped in
+# when ready, so no request waits on a reload.
 conv_manager = st.session_state.conv_manager
-predictor = get_predictor(version=APP_VERSION)
+warmup = start_app_warmup()
+if warmup.ready:
+    warmup.value.refresh()
+
+def wait_for_predictor():
+    """Serving predictor; waits briefly if the startup warm-up is still running (None if it failed or is still loading)"""
+    if not warmup.ready:
+        warmup.wait(MODEL_WAIT_TIMEOUT_S)
+    if not warmup.ready and warmup.status != FAILED:
+        st.info("⏳ กำลังเตรียมโมเดล กรุณาลองใหม่อีกครั้งในไม่กี่วินาที")
+        return None
+    if not warmup.ready:
+        # The warm-up thread cannot call Streamlit; report its error here
+        st.error(f"Error loading model: {warmup.error}")
+        return None
+    predictor = warmup.value.current
+    report_load_problems(predictor)
+    return predictor
 
 # Display version in debug mode
 if st.sidebar.checkbox("🔧 Debug Info", value=False):
     st.sidebar.info(f"App Version: {APP_VERSION}")
     st.sidebar.info(f"Questions Count: {len(conv_manager.questions)}")
+    health = warmup.health()
+    st.sidebar.info(f"Warm-up: {health['status']} {health['steps_ms']}")
+    if warmup.ready:
+        predictor_handle = warmup.value
+        predictor = predictor_handle.current
+        cache_stats = predictor.result_cache.stats()
+        st.sidebar.info(
+            f"Result Cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses "
+            f"({cache_stats['hit_rate']:.0%}), {cache_stats['evictions']} evictions"
+        )
+        st.sidebar.info(
+            f"Model: {predictor.registry_version or 'models/ (no registry)'}, "
+            f"{predictor_handle.swaps} hot swaps" + (" (loading...)" if predictor_handle.loading else "")
+        )
+        if predictor_handle.last_error:
+            st.sidebar.warning(f"Last model reload failed: {predictor_handle.last_error}")
+    elif health['error']:
+        st.sidebar.warning(f"Warm-up failed: {health['error']}")
 
-# Load global CSS
+# Load global CSS (read once per process, sent once per session)
 def load_global_css():
-    css_path = Path("assets/styles.css")
-    if css_path.exists():
-        with open(css_path) as f:
-            st.markdown(f'<style>{f.read()}</style>', unsafe_allow_html=True)
+    css = file_css(APP_STYLESHEETS['global'])
+    if css:
+        emit_style('global', css)
     
     # Inject component styles
     inject_message_styles()
@@ -114,7 +157,9 @@ def render_chat_interface():
             </div>
         </div>
     </div>
+    """, unsafe_allow_html=True)
     
+    emit_style('chat-header', """
     <style>
     .chat-header {
         background-color: var(--color-bg-surface);
@@ -167,15 +212,12 @@ def render_chat_interface():
         animation: pulse 2s ease-in-out infinite;
     }
     </style>
-    """, unsafe_allow_html=True)
+    """)
     
     # Display messages
     messages_container = st.container()
     with messages_container:
-        if 'messages' not in st.session_state:
-            st.session_state.messages = []
-            
-        for message in st.session_state.messages:
+        for message in conv_manager.messages:
             render_message(
                 role=message["role"],
                 content=message["content"],
@@ -214,7 +256,7 @@ def render_chat_interface():
                             st.session_state.is_typing = True
                             # Force manager call
                             conv_manager.process_user_input(reply)
-                            time.sleep(0.3)  # Brief delay for UX
+                            ux_delay(0.3)  # Brief delay for UX (0 unless a latency budget is set)
                             st.rerun()
         
         st.markdown('</div>', unsafe_allow_html=True)
@@ -275,7 +317,7 @@ def render_chat_interface():
             if submitted and user_input:
                 st.session_state.is_typing = True
                 conv_manager.process_user_input(user_input)
-                time.sleep(0.3)
+                ux_delay(0.3)
                 st.rerun()
     
     st.markdown('</div>', unsafe_allow_html=True)
@@ -292,24 +334,21 @@ def render_results_section():
         inject_loading_overlay()
         
         with st.spinner(""):
-            time.sleep(1.5)  # Simulate processing time for UX
+            ux_delay(1.5)  # Overlay animates client-side; server pause only within the latency budget
             user_inputs = conv_manager.get_collected_inputs()
-            prediction = predictor.predict(user_inputs)
+            predictor = wait_for_predictor()
+            if predictor is None and warmup.status != FAILED:
+                # Model still loading: leave the prediction for the next rerun
+                st.session_state.is_processing = False
+                return
+            prediction = predict_with_feedback(predictor, user_inputs) if predictor is not None else None
             
             if prediction:
                 st.session_state.current_prediction = prediction
                 st.session_state.is_processing = False
                 
-                # Add check for chat_history existence
-                if 'chat_history' not in st.session_state:
-                    st.session_state.chat_history = []
-                
-                # Save to history
-                st.session_state.chat_history.append({
-                    'timestamp': time.strftime("%Y-%m-%d %H:%M"),
-                    'predicted_bill': prediction['amount'],
-                    'inputs': user_inputs
-                })
+                # Save to history (single append path, capped by the session store)
+                conv_manager.save_to_history()
                 
             else:
                 st.error("⚠️ เกิดข้อผิดพลาดในการคำนวณ กรุณาลองใหม่อีกครั้ง")
@@ -333,12 +372,8 @@ def render_results_section():
     # Divider
     st.markdown('<div style="margin: 2rem 0; border-top: 1px solid var(--color-border);"></div>', unsafe_allow_html=True)
     
-    # Follow-up question
-    st.markdown("""
-    <div class="followup-section fade-in">
-        <div class="followup-question">ลองทำนายอีกรอบมั้ยครับ? 🤔</div>
-    </div>
-    
+    # Follow-up question (styles sent once per session)
+    emit_style('followup', """
     <style>
     .followup-section {
         text-align: center;
@@ -352,6 +387,11 @@ def render_results_section():
         margin-bottom: 1.5rem;
     }
     </style>
+    """)
+    st.markdown("""
+    <div class="followup-section fade-in">
+        <div class="followup-question">ลองทำนายอีกรอบมั้ยครับ? 🤔</div>
+    </div>
     """, unsafe_allow_html=True)
     
     col1, col2 = st.columns(2)
@@ -363,8 +403,8 @@ def render_results_section():
     with col2:
         if st.button("📝 ปรับค่าเดิม", key="edit_btn", use_container_width=True):
             # For Phase 2, just reset (will implement edit in Phase 4)
-            st.info("ฟีเจอร์นี้จะพร้อมใช้งานใน Phase 4")
-            time.sleep(1)
+            # Toast lives client-side, so it survives the rerun without blocking
+            st.toast("ฟีเจอร์นี้จะพร้อมใช้งานใน Phase 4")
             conv_manager.reset_conversation()
             st.rerun()
 
@@ -374,20 +414,19 @@ def main():
     # Initialize session state if not present (critical fix)
     if 'conversation_stage' not in st.session_state:
         st.session_state.conversation_stage = 0
-    if 'messages' not in st.session_state:
-        st.session_state.messages = []
     if 'user_inputs' not in st.session_state:
         st.session_state.user_inputs = {}
     if 'current_prediction' not in st.session_state:
         st.session_state.current_prediction = None
-    if 'chat_history' not in st.session_state:
-        st.session_state.chat_history = []
         
     stage = st.session_state.conversation_stage
     
     if stage == 0:
         # Landing page
-        if render_landing_page():
+        # Figures appear once the warm-up has loaded the model (no waiting here)
+        predictor = warmup.value.current if warmup.ready else None
+        metrics = predictor.metrics.as_result() if predictor is not None and predictor.metrics is not None else None
+        if render_landing_page(metrics):
             conv_manager.start_conversation()
             st.rerun()
     else:
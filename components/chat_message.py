@@ -3,6 +3,7 @@ Roo-Lot Chatbot - Chat Message Component
 """
 
 import streamlit as st
+from utils.style_registry import emit_style
 
 def render_message(role: str, content: str, timestamp: str):
     """
@@ -43,8 +44,8 @@ def render_message(role: str, content: str, timestamp: str):
         """, unsafe_allow_html=True)
 
 def inject_message_styles():
-    """Inject CSS styles for chat messages"""
-    st.markdown("""
+    """Inject CSS styles for chat messages (sent once per session)"""
+    emit_style('message', """
     <style>
     .message-container {
         display: flex;
@@ -122,4 +123,4 @@ def inject_message_styles():
         }
     }
     </style>
-    """, unsafe_allow_html=True)
+    """)
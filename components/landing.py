@@ -3,11 +3,22 @@ Roo-Lot Chatbot - Landing Page Component (Refactored for Robustness)
 """
 
 import streamlit as st
+from utils.style_registry import emit_style
 
-def render_landing_page():
-    """Render minimalist landing page with dark theme using native components"""
+def render_landing_page(metrics: dict = None):
+    """
+    Render minimalist landing page with dark theme using native components
+    
+    Args:
+        metrics: Test metrics of the served model ('r2_score', 'mae' in kWh),
+            as in a prediction's 'model_metrics'; None hides the figures
+    """
+    r2_text = f"R² {metrics['r2_score']:.4f}" if metrics else "—"
+    mae_text = f"±{metrics['mae']:.1f} kWh" if metrics else "—"
+    accuracy_line = (f"<br/>\n            ความแม่นยำ {metrics['r2_score']*100:.2f}% · คลาดเคลื่อนเฉลี่ย {mae_text}"
+                     if metrics else "")
     
-    # CSS for layout and styling
+    # CSS for layout and styling (sent once per session)
     current_css = """
     <style>
     /* Reset & Layout */
@@ -126,10 +137,10 @@ def render_landing_page():
     }
     </style>
     """
-    st.markdown(current_css, unsafe_allow_html=True)
+    emit_style('landing', current_css)
     
     # 1. Header Section
-    st.markdown("""
+    st.markdown(f"""
     <div class="landing-container">
         <div class="glow-orb"></div>
         <div class="landing-logo">
@@ -141,8 +152,7 @@ def render_landing_page():
             ด้วย Machine Learning
         </h1>
         <p class="landing-subheadline">
-            รู้อะไร ไม่เท่ารู้หลอด – วิเคราะห์การใช้ไฟฟ้าด้วย AI<br/>
-            ความแม่นยำ 98.88% · คาดเคลื่อนเฉลี่ย ±61 บาท
+            รู้อะไร ไม่เท่ารู้หลอด – วิเคราะห์การใช้ไฟฟ้าด้วย AI{accuracy_line}
         </p>
     </div>
     """, unsafe_allow_html=True)
@@ -154,15 +164,15 @@ def render_landing_page():
         start_clicked = st.button("เริ่มวิเคราะห์เลย ➤", type="primary", use_container_width=True)
     
     # 3. Footer/Metrics Section
-    st.markdown("""
+    st.markdown(f"""
     <div class="landing-metrics">
         <div class="metric-item">
-            <div class="metric-value">R² 0.9888</div>
+            <div class="metric-value">{r2_text}</div>
             <div class="metric-label">Accuracy</div>
         </div>
         <div class="metric-divider"></div>
         <div class="metric-item">
-            <div class="metric-value">±61฿</div>
+            <div class="metric-value">{mae_text}</div>
             <div class="metric-label">MAE</div>
         </div>
         <div class="metric-divider"></div>
@@ -4,13 +4,15 @@ Roo-Lot Chatbot - Result Card Component
 IMPORTANT: Display ONLY what the model actually predicts (Report Chapter 4.2)
 - Model outputs: Total energy_consumption_kwh (float)
 - Model does NOT output: AC vs Appliances breakdown
-- Model metrics: R² = 0.9888, MAE = 14.58 kWh, RMSE = 18.56 kWh
+- Model metrics: read from prediction_data['model_metrics'], i.e. the
+  metrics sidecar the predictor loaded with the served model (never hardcoded)
 
 Last Updated: 2026-02-14 00:15 ICT (Updated metrics to match regenerated plots)
 """
 
 import streamlit as st
 import plotly.graph_objects as go
+from utils.style_registry import emit_style
 
 def render_result_card(prediction_data: dict, expanded: bool = False):
     """
@@ -24,18 +26,30 @@ def render_result_card(prediction_data: dict, expanded: bool = False):
     amount = prediction_data['amount']
     kwh = prediction_data.get('kwh', amount)
     
-    # Get MODEL metrics from Report Chapter 4.2 (Regenerated Plots 2026-02-14)
-    MODEL_R2 = 0.9888       # 98.88% accuracy
-    MODEL_MAE_KWH = 14.58   # Mean Absolute Error in kWh
-    MODEL_RMSE_KWH = 18.56  # Root Mean Squared Error in kWh
-    PRICE_PER_KWH = 4.2     # Approximate THB/unit
+    # Test metrics of the served model (metrics sidecar; None when missing or stale)
+    metrics = prediction_data.get('model_metrics') or {}
+    model_r2 = metrics.get('r2_score')
+    mae_kwh = metrics.get('mae')
+    rmse_kwh = metrics.get('rmse')
     
-    # Calculate error in THB
-    mae_thb = MODEL_MAE_KWH * PRICE_PER_KWH    # ≈ 61 THB
-    rmse_thb = MODEL_RMSE_KWH * PRICE_PER_KWH  # ≈ 78 THB
+    # Amount comes from the tiered tariff (blocks + Ft + service + VAT), so the
+    # test-set errors are converted at this bill's average rate
+    bill = prediction_data.get('bill') or {}
+    average_rate = bill.get('average_rate') or (amount / kwh if kwh else 0)
+    mae_thb = mae_kwh * average_rate if mae_kwh is not None else None
+    rmse_thb = rmse_kwh * average_rate if rmse_kwh is not None else None
+    # Typical error: ± test MAE priced at this bill (the per-tree band is model
+    # agreement, narrower than the measured error, so it is never shown here)
+    range_thb = prediction_data.get('range')
+    if range_thb is None:
+        range_thb = mae_thb
+    r2_text = f"{model_r2*100:.1f}%" if model_r2 is not None else "—"
+    range_text = f"±{range_thb:.2f}฿" if range_thb is not None else "—"
+    tariff_line = (f"{kwh:.2f} kWh · เฉลี่ย {average_rate:.2f} THB/unit (รวม Ft ค่าบริการ VAT)"
+                   if bill else f"{kwh:.2f} kWh")
     
-    # CSS Styles
-    st.markdown("""
+    # CSS Styles (sent once per session)
+    emit_style('result-card', """
     <style>
     .result-card {
         background-color: var(--color-bg-surface);
@@ -142,7 +156,7 @@ def render_result_card(prediction_data: dict, expanded: bool = False):
         }
     }
     </style>
-    """, unsafe_allow_html=True)
+    """)
 
     # Main Result Card - NO FABRICATED BREAKDOWN
     st.markdown(f"""<div class="result-card scale-in">
@@ -155,15 +169,15 @@ def render_result_card(prediction_data: dict, expanded: bool = False):
 <span class="amount-unit">THB</span>
 </div>
 <div class="result-subtitle">
-{kwh:.2f} kWh × {PRICE_PER_KWH} THB/unit
+{tariff_line}
 </div>
 <div class="result-stats-grid">
 <div class="stat-cell">
-<div class="stat-value">{MODEL_R2*100:.1f}%</div>
+<div class="stat-value">{r2_text}</div>
 <div class="stat-label">R² Score</div>
 </div>
 <div class="stat-cell">
-<div class="stat-value">±{mae_thb:.2f}฿</div>
+<div class="stat-value">{range_text}</div>
 <div class="stat-label">Typical Error</div>
 </div>
 </div>
@@ -181,13 +195,13 @@ def render_result_card(prediction_data: dict, expanded: bool = False):
     
     # Detailed Analysis (optional expand)
     with st.expander("📊 ดูรายละเอียดเพิ่มเติม", expanded=expanded):
-        render_detailed_analysis(prediction_data, MODEL_R2, MODEL_MAE_KWH, MODEL_RMSE_KWH, mae_thb, rmse_thb)
+        render_detailed_analysis(prediction_data, model_r2, mae_kwh, rmse_kwh, mae_thb, rmse_thb)
 
 def render_detailed_analysis(prediction_data: dict, r2: float, mae_kwh: float, rmse_kwh: float, mae_thb: float, rmse_thb: float):
-    """Render detailed analysis - HONEST metrics only"""
+    """Render detailed analysis - HONEST metrics only (None metrics shown as unavailable)"""
     
-    # Fix metric label colors for dark theme
-    st.markdown("""
+    # Fix metric label colors for dark theme (sent once per session)
+    emit_style('metric-labels', """
     <style>
     [data-testid="stMetricLabel"] {
         color: #e0e0e0 !important;
@@ -196,40 +210,73 @@ def render_detailed_analysis(prediction_data: dict, r2: float, mae_kwh: float, r
         color: #ffffff !important;
     }
     </style>
-    """, unsafe_allow_html=True)
+    """)
     
     st.markdown("### 📊 รายละเอียดการวิเคราะห์")
     
     col1, col2, col3 = st.columns(3)
     
+    unavailable = "ยังไม่มีผลประเมินสำหรับโมเดลนี้"
+    
     with col1:
         st.metric(
             "R² Score",
-            f"{r2*100:.2f}%",
-            help="Model Accuracy - โมเดลอธิบายความแปรปรวนของข้อมูลได้ 98.88%"
+            f"{r2*100:.2f}%" if r2 is not None else "—",
+            help=(f"Model Accuracy - โมเดลอธิบายความแปรปรวนของข้อมูลได้ {r2*100:.2f}%"
+                  if r2 is not None else unavailable)
         )
     
     with col2:
         st.metric(
             "MAE",
-            f"{mae_thb:.0f}฿",
-            help=f"Mean Absolute Error - ความคลาดเคลื่อนเฉลี่ย {mae_kwh:.2f} kWh ≈ {mae_thb:.0f} บาท"
+            f"{mae_thb:.0f}฿" if mae_thb is not None else "—",
+            help=(f"Mean Absolute Error - ความคลาดเคลื่อนเฉลี่ย {mae_kwh:.2f} kWh ≈ {mae_thb:.0f} บาท"
+                  if mae_thb is not None else unavailable)
         )
     
     with col3:
         st.metric(
             "RMSE",
-            f"{rmse_thb:.0f}฿",
-            help=f"Root Mean Squared Error - {rmse_kwh:.2f} kWh ≈ {rmse_thb:.0f} บาท"
+            f"{rmse_thb:.0f}฿" if rmse_thb is not None else "—",
+            help=(f"Root Mean Squared Error - {rmse_kwh:.2f} kWh ≈ {rmse_thb:.0f} บาท"
+                  if rmse_thb is not None else unavailable)
         )
     
-    # Prediction interval
+    # Likely range - from the measured (test MAE) error, priced at this bill
     amount = prediction_data['amount']
-    st.info(f"""
+    typical_error = prediction_data.get('range')
+    if typical_error is None:
+        typical_error = mae_thb
+    if typical_error is None:
+        st.info(f"💡 {unavailable} จึงยังแสดงช่วงความคลาดเคลื่อนไม่ได้")
+    else:
+        st.info(f"""
 🎯 **ช่วงค่าที่เป็นไปได้**: 
-{amount - mae_thb:.0f} - {amount + mae_thb:.0f} ฿
+{max(amount - typical_error, 0):.0f} - {amount + typical_error:.0f} ฿
 
-💡 ค่าจริงมักอยู่ในช่วง ±{mae_thb:.0f} บาท จากค่าที่ทำนาย
+💡 ค่าจริงมักอยู่ในช่วง ±{typical_error:.0f} บาท จากค่าที่ทำนาย (คลาดเคลื่อนเฉลี่ยจากชุดทดสอบ)
+""")
+
+    # Tree agreement - how closely the forest's trees agree for this household
+    # (model uncertainty only, not a calibrated error range)
+    interval = prediction_data.get('interval') or {}
+    if interval.get('source') == 'forest':
+        st.caption(
+            f"🌳 ความสอดคล้องของโมเดล: {interval['coverage'] * 100:.0f}% ของต้นไม้ทำนายอยู่ในช่วง "
+            f"{interval['amount_low']:.0f}-{interval['amount_high']:.0f} ฿ "
+            f"({interval['kwh_low']:.0f}-{interval['kwh_high']:.0f} kWh) - "
+            f"บอกความมั่นใจของโมเดล ไม่ใช่ช่วงความคลาดเคลื่อนจริง"
+        )
+    
+    # Bill breakdown (tiered tariff)
+    bill = prediction_data.get('bill')
+    if bill:
+        st.markdown(f"""
+🧾 **องค์ประกอบค่าไฟ** ({bill['schedule']})
+- ค่าพลังงาน (อัตราก้าวหน้า): {bill['energy']:,.2f} ฿
+- ค่า Ft: {bill['ft']:,.2f} ฿
+- ค่าบริการ: {bill['service']:,.2f} ฿
+- VAT: {bill['vat']:,.2f} ฿
 """)
     
     # System Limitations Disclosure
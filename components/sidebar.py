@@ -4,6 +4,7 @@ Roo-Lot Chatbot - Sidebar Component
 
 import streamlit as st
 from datetime import datetime
+from utils.style_registry import emit_style
 
 def render_sidebar(conversation_manager):
     """
@@ -42,7 +43,7 @@ def render_sidebar(conversation_manager):
         st.markdown('<div class="sidebar-section">', unsafe_allow_html=True)
         st.markdown('<div class="sidebar-section-title">ประวัติแชท</div>', unsafe_allow_html=True)
         
-        chat_history = st.session_state.get('chat_history', [])
+        chat_history = conversation_manager.chat_history
         
         if len(chat_history) == 0:
             st.markdown("""
@@ -89,14 +90,14 @@ def render_sidebar(conversation_manager):
             
             # Clear History Button
             if st.button("🗑️ Clear History", key="clear_history_btn", use_container_width=True):
-                st.session_state.chat_history = []
-                st.session_state.messages = []
+                conversation_manager.clear_history()
+                conversation_manager.clear_messages()
                 st.session_state.user_inputs = {}
                 st.session_state.current_prediction = None
                 st.session_state.conversation_stage = 1
                 st.rerun()
 
-            st.markdown("""
+            emit_style('settings-panel', """
             <style>
             .settings-panel {
                 background-color: var(--color-bg-surface);
@@ -113,7 +114,7 @@ def render_sidebar(conversation_manager):
                 text-transform: uppercase;
             }
             </style>
-            """, unsafe_allow_html=True)
+            """)
             
         st.markdown('</div>', unsafe_allow_html=True)
 
@@ -154,8 +155,8 @@ def render_history_item(history_item: dict, index: int, conversation_manager, vi
              st.rerun()
 
 def inject_sidebar_styles():
-    """Inject CSS styles for sidebar"""
-    st.markdown("""
+    """Inject CSS styles for sidebar (sent once per session)"""
+    emit_style('sidebar', """
     <style>
     /* Sidebar container */
     [data-testid="stSidebar"] {
@@ -289,4 +290,4 @@ def inject_sidebar_styles():
         border-color: var(--color-border-hover) !important;
     }
     </style>
-    """, unsafe_allow_html=True)
+    """)
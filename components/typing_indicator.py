@@ -3,40 +3,29 @@ Roo-Lot Chatbot - Typing Indicator Component
 """
 
 import streamlit as st
-import time
+from utils.latency_budget import ux_delay
+from utils.style_registry import emit_style
 
 def render_typing_indicator(duration: float = 1.0):
     """
     Render typing indicator animation
     
+    The indicator hides itself client-side (CSS animation) after `duration`,
+    so the script thread does not block. A server-side pause only happens
+    within the configured latency budget (utils.latency_budget).
+    
     Args:
         duration: How long to show the indicator (seconds)
     """
     
-    # Render typing animation
-    typing_html = st.markdown("""
-    <div class="typing-indicator-container">
-        <div class="message-avatar">
-            <svg width="24" height="24" viewBox="0 0 24 24" fill="none">
-                <path d="M12 2L2 7L12 12L22 7L12 2Z" stroke="#3b82f6" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"/>
-                <path d="M2 17L12 22L22 17" stroke="#3b82f6" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"/>
-                <path d="M2 12L12 17L22 12" stroke="#3b82f6" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"/>
-            </svg>
-        </div>
-        <div class="typing-indicator">
-            <div class="typing-dot"></div>
-            <div class="typing-dot"></div>
-            <div class="typing-dot"></div>
-        </div>
-    </div>
-    
+    emit_style('typing-indicator', """
     <style>
     .typing-indicator-container {
         display: flex;
         align-items: center;
         gap: 12px;
         margin: 16px 0;
-        animation: fadeIn 0.3s ease-out;
+        animation: fadeIn 0.3s ease-out, typingDone 0.2s ease-in forwards;
     }
     
     .typing-indicator {
@@ -65,6 +54,15 @@ def render_typing_indicator(duration: float = 1.0):
         animation-delay: 0.4s;
     }
     
+    @keyframes typingDone {
+        to {
+            opacity: 0;
+            height: 0;
+            margin: 0;
+            overflow: hidden;
+        }
+    }
+    
     @keyframes typingPulse {
         0%, 60%, 100% {
             opacity: 0.3;
@@ -76,10 +74,26 @@ def render_typing_indicator(duration: float = 1.0):
         }
     }
     </style>
-    """, unsafe_allow_html=True)
+    """)
     
-    # Wait for duration
-    time.sleep(duration)
+    # Render typing animation
+    typing_html = st.markdown(f"""
+    <div class="typing-indicator-container" style="animation-delay: 0s, {duration}s;">
+        <div class="message-avatar">
+            <svg width="24" height="24" viewBox="0 0 24 24" fill="none">
+                <path d="M12 2L2 7L12 12L22 7L12 2Z" stroke="#3b82f6" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"/>
+                <path d="M2 17L12 22L22 17" stroke="#3b82f6" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"/>
+                <path d="M2 12L12 17L22 12" stroke="#3b82f6" stroke-width="2" stroke-linecap="round" stroke-linejoin="round"/>
+            </svg>
+        </div>
+        <div class="typing-indicator">
+            <div class="typing-dot"></div>
+            <div class="typing-dot"></div>
+            <div class="typing-dot"></div>
+        </div>
+    </div>
+    """, unsafe_allow_html=True)
     
-    # Clear the typing indicator
-    typing_html.empty()
+    # Clear server-side only if a latency budget allowed a pause
+    if ux_delay(duration) > 0:
+        typing_html.empty()
@@ -4,5 +4,13 @@ Roo-Lot Chatbot - Conversation Module
 
 from .manager import ConversationManager
 from .questions import QUESTIONS
+from .session_store import SessionStore, MemorySessionStore, SQLiteSessionStore, get_session_store
 
-__all__ = ['ConversationManager', 'QUESTIONS']
+__all__ = [
+    'ConversationManager',
+    'QUESTIONS',
+    'SessionStore',
+    'MemorySessionStore',
+    'SQLiteSessionStore',
+    'get_session_store'
+]
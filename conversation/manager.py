@@ -6,31 +6,37 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 import streamlit as st
 import time
+import uuid
 from .questions import QUESTIONS
 from .validator import InputValidator
+from .session_store import SessionStore, get_session_store, compact_message, expand_message
 
 class ConversationManager:
-    """Manages conversation flow and state"""
+    """
+    Manages conversation flow and state
     
-    def __init__(self):
+    Messages and prediction history live in a server-side SessionStore
+    (capped, compact records); st.session_state keeps only the session id
+    and small scalars.
+    """
+    
+    def __init__(self, store: Optional[SessionStore] = None):
         self.questions = QUESTIONS
         self.validator = InputValidator()
+        self.store = store if store is not None else get_session_store()
         self._initialize_session_state()
     
     def _initialize_session_state(self):
         """Initialize session state variables"""
+        if 'session_id' not in st.session_state:
+            st.session_state.session_id = uuid.uuid4().hex
+        
         if 'conversation_stage' not in st.session_state:
             st.session_state.conversation_stage = 0  # 0=landing, 1-6=questions, 7=result
         
-        if 'messages' not in st.session_state:
-            st.session_state.messages = []
-        
         if 'user_inputs' not in st.session_state:
             st.session_state.user_inputs = {}
         
-        if 'chat_history' not in st.session_state:
-            st.session_state.chat_history = []
-        
         if 'current_prediction' not in st.session_state:
             st.session_state.current_prediction = None
         
@@ -43,10 +49,41 @@ class ConversationManager:
         if 'is_typing' not in st.session_state:
             st.session_state.is_typing = False
     
+    @property
+    def session_id(self) -> str:
+        """Store key for the current Streamlit session"""
+        if 'session_id' not in st.session_state:
+            st.session_state.session_id = uuid.uuid4().hex
+        return st.session_state.session_id
+    
+    @property
+    def messages(self) -> List[Dict]:
+        """Chat messages of the current conversation (newest last)"""
+        return [expand_message(record) for record in self.store.get(self.session_id)['messages']]
+    
+    @property
+    def chat_history(self) -> List[Dict]:
+        """Saved predictions (newest last, at most MAX_HISTORY)"""
+        return list(self.store.get(self.session_id)['history'])
+    
+    def _update_record(self, **changes):
+        """Apply changes to the stored session record"""
+        record = self.store.get(self.session_id)
+        record.update(changes)
+        self.store.put(self.session_id, record)
+    
+    def clear_messages(self):
+        """Drop all messages of the current conversation"""
+        self._update_record(messages=[])
+    
+    def clear_history(self):
+        """Drop the saved prediction history"""
+        self._update_record(history=[])
+    
     def start_conversation(self):
         """Start a new conversation"""
         st.session_state.conversation_stage = 1
-        st.session_state.messages = []
+        self.clear_messages()
         st.session_state.user_inputs = {}
         st.session_state.current_prediction = None
         st.session_state.show_detailed_results = False
@@ -61,7 +98,7 @@ class ConversationManager:
         # Save current conversation to history if prediction exists (Handled by app_chatbot generally, but safe to do here if needed?? No, let's stick to what we decided: remove double save)
         # Reset states
         st.session_state.conversation_stage = 1
-        st.session_state.messages = []
+        self.clear_messages()
         st.session_state.user_inputs = {}
         st.session_state.current_prediction = None
         st.session_state.show_detailed_results = False
@@ -79,6 +116,12 @@ class ConversationManager:
             return self.questions[input_count]
         return None
     
+    def _append_message(self, message: Dict):
+        """Store a message compactly (the store caps the per-session count)"""
+        record = self.store.get(self.session_id)
+        record['messages'] = record['messages'] + [compact_message(message)]
+        self.store.put(self.session_id, record)
+    
     def add_bot_message(self, content: str):
         """Add a bot message to conversation"""
         message = {
@@ -86,7 +129,7 @@ class ConversationManager:
             "content": content,
             "timestamp": datetime.now().strftime("%H:%M")
         }
-        st.session_state.messages.append(message)
+        self._append_message(message)
     
     def add_user_message(self, content: str):
         """Add a user message to conversation"""
@@ -95,7 +138,7 @@ class ConversationManager:
             "content": content,
             "timestamp": datetime.now().strftime("%H:%M")
         }
-        st.session_state.messages.append(message)
+        self._append_message(message)
     
     def process_user_input(self, user_input: str) -> bool:
         """
@@ -143,8 +186,8 @@ class ConversationManager:
         return st.session_state.user_inputs.copy()
     
     def save_to_history(self):
-        """Save current conversation to history"""
-        if not st.session_state.current_prediction:
+        """Save current conversation to history (the only place history grows)"""
+        if not st.session_state.get('current_prediction'):
             return
         
         history_item = {
@@ -154,29 +197,24 @@ class ConversationManager:
             # "messages": st.session_state.messages.copy() # Optional, maybe too heavy
         }
         
-        if 'chat_history' not in st.session_state:
-             st.session_state.chat_history = []
-
-        st.session_state.chat_history.append(history_item)
-        
-        # Keep only last 10 conversations
-        if len(st.session_state.chat_history) > 10:
-            st.session_state.chat_history = st.session_state.chat_history[-10:]
+        # The store keeps only the last MAX_HISTORY (10) conversations
+        record = self.store.get(self.session_id)
+        record['history'] = record['history'] + [history_item]
+        self.store.put(self.session_id, record)
     
     def load_from_history(self, history_index: int):
         """Load a conversation from history"""
         # history_index is likely index from reversed list in UI
         # We need actual index
-        if 'chat_history' in st.session_state:
-             if 0 <= history_index < len(st.session_state.chat_history):
-                history_item = st.session_state.chat_history[history_index]
-                
-                # st.session_state.messages = history_item.get("messages", []).copy()
-                st.session_state.messages = [] # Reset messages if not stored
-                st.session_state.user_inputs = history_item["inputs"].copy()
-                st.session_state.conversation_stage = 2  # Result stage
-                st.session_state.current_prediction = None  # Will re-predict
-                st.session_state.show_detailed_results = False
-                
-                return True
+        chat_history = self.chat_history
+        if 0 <= history_index < len(chat_history):
+            history_item = chat_history[history_index]
+            
+            self.clear_messages() # Reset messages if not stored
+            st.session_state.user_inputs = history_item["inputs"].copy()
+            st.session_state.conversation_stage = 2  # Result stage
+            st.session_state.current_prediction = None  # Will re-predict
+            st.session_state.show_detailed_results = False
+            
+            return True
         return False
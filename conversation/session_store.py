@@ -0,0 +1,220 @@
+"""
+Roo-Lot Chatbot - Session Store
+
+Server-side storage for the growing parts of a conversation (chat messages
+and prediction history), so st.session_state only holds a session id and a
+few scalars. Every record is capped (MAX_MESSAGES / MAX_HISTORY) and stored
+compactly, and the backends bound the number of live sessions:
+
+- MemorySessionStore: process-wide LRU with idle TTL eviction (default)
+- SQLiteSessionStore: file-backed, shared by every worker on the host
+
+Select the backend with ROO_LOT_SESSION_STORE: 'memory' or 'sqlite:<path>'.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+SESSION_STORE_ENV = 'ROO_LOT_SESSION_STORE'
+
+# Per-session caps
+MAX_MESSAGES = 50
+MAX_HISTORY = 10
+
+# Process-wide limits
+DEFAULT_MAX_SESSIONS = 1000
+DEFAULT_TTL_SECONDS = 60 * 60
+
+# Compact message record: [role code, content, timestamp]
+ROLE_CODES = {'assistant': 'a', 'user': 'u'}
+ROLE_NAMES = {code: role for role, code in ROLE_CODES.items()}
+
+
+def compact_message(message: Dict) -> List:
+    """Message dict -> [role code, content, timestamp]"""
+    role = message.get('role', 'assistant')
+    return [ROLE_CODES.get(role, role), message.get('content', ''), message.get('timestamp', '')]
+
+
+def expand_message(record: List) -> Dict:
+    """[role code, content, timestamp] -> message dict used by the UI"""
+    code, content, timestamp = record
+    return {'role': ROLE_NAMES.get(code, code), 'content': content, 'timestamp': timestamp}
+
+
+def empty_record() -> Dict:
+    """Fresh per-session record"""
+    return {'messages': [], 'history': []}
+
+
+def apply_caps(record: Dict) -> Dict:
+    """Keep only the newest MAX_MESSAGES messages and MAX_HISTORY history items"""
+    record['messages'] = record.get('messages', [])[-MAX_MESSAGES:]
+    record['history'] = record.get('history', [])[-MAX_HISTORY:]
+    return record
+
+
+class SessionStore:
+    """Backend interface: one capped record per session id"""
+
+    def get(self, session_id: str) -> Dict:
+        """Return the session record (a fresh one if missing or expired)"""
+        raise NotImplementedError
+
+    def put(self, session_id: str, record: Dict) -> None:
+        """Store the session record (caps applied)"""
+        raise NotImplementedError
+
+    def delete(self, session_id: str) -> None:
+        """Drop a session"""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+
+class MemorySessionStore(SessionStore):
+    """
+    In-process LRU store with idle TTL eviction
+
+    Args:
+        max_sessions: Least recently used sessions beyond this are evicted
+        ttl_seconds: Sessions idle longer than this are evicted
+        clock: Time source (injectable for tests)
+    """
+
+    def __init__(self, max_sessions: int = DEFAULT_MAX_SESSIONS,
+                 ttl_seconds: float = DEFAULT_TTL_SECONDS, clock=time.monotonic):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._records = OrderedDict()  # session_id -> (last_access, record)
+        self._lock = threading.Lock()
+
+    def get(self, session_id: str) -> Dict:
+        now = self.clock()
+        with self._lock:
+            self._evict_expired(now)
+            entry = self._records.get(session_id)
+            if entry is None:
+                return empty_record()
+            self._records[session_id] = (now, entry[1])
+            self._records.move_to_end(session_id)
+            return entry[1]
+
+    def put(self, session_id: str, record: Dict) -> None:
+        now = self.clock()
+        with self._lock:
+            self._records[session_id] = (now, apply_caps(record))
+            self._records.move_to_end(session_id)
+            self._evict_expired(now)
+            while len(self._records) > self.max_sessions:
+                self._records.popitem(last=False)
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._records.pop(session_id, None)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def _evict_expired(self, now: float) -> None:
+        """Pop idle sessions from the LRU end (oldest access first)"""
+        while self._records:
+            session_id, (last_access, _) = next(iter(self._records.items()))
+            if now - last_access <= self.ttl_seconds:
+                break
+            self._records.popitem(last=False)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    SQLite file store shared by all worker processes on a host
+
+    Args:
+        path: Database file
+        ttl_seconds: Sessions idle longer than this are deleted
+        clock: Time source (injectable for tests)
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = DEFAULT_TTL_SECONDS, clock=time.time):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS sessions ('
+            'session_id TEXT PRIMARY KEY, updated REAL NOT NULL, data TEXT NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS sessions_updated ON sessions (updated)')
+
+    def get(self, session_id: str) -> Dict:
+        now = self.clock()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT updated, data FROM sessions WHERE session_id = ?', (session_id,)
+            ).fetchone()
+            if row is None or now - row[0] > self.ttl_seconds:
+                return empty_record()
+            self._conn.execute('UPDATE sessions SET updated = ? WHERE session_id = ?', (now, session_id))
+        return json.loads(row[1])
+
+    def put(self, session_id: str, record: Dict) -> None:
+        now = self.clock()
+        data = json.dumps(apply_caps(record), ensure_ascii=False, separators=(',', ':'))
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO sessions (session_id, updated, data) VALUES (?, ?, ?)',
+                (session_id, now, data)
+            )
+            self._conn.execute('DELETE FROM sessions WHERE updated < ?', (now - self.ttl_seconds,))
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            self._conn.execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM sessions').fetchone()[0]
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def create_session_store(spec: Optional[str] = None) -> SessionStore:
+    """
+    Build a backend from a spec string
+
+    Args:
+        spec: 'memory' or 'sqlite:<path>' (default: ROO_LOT_SESSION_STORE or 'memory')
+
+    Returns:
+        SessionStore
+    """
+    spec = spec or os.environ.get(SESSION_STORE_ENV, 'memory')
+    if spec == 'memory':
+        return MemorySessionStore()
+    if spec.startswith('sqlite:'):
+        return SQLiteSessionStore(spec[len('sqlite:'):])
+    raise ValueError(f"Unknown session store: {spec}")
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_session_store() -> SessionStore:
+    """Process-wide default store (created on first use)"""
+    global _default_store
+    if _default_store is None:
+        with _default_store_lock:
+            if _default_store is None:
+                _default_store = create_session_store()
+    return _default_store
@@ -0,0 +1,44 @@
+"""
+Roo-Lot Core - Headless Prediction Module
+
+Importable without Streamlit, plotly or matplotlib.
+"""
+
+from .errors import PredictionError, ModelNotLoadedError, InputValidationError
+from .predictor import PredictionCore, model_signature, FEATURE_COLUMNS, REFERENCE_YEAR
+from .tariff import Tariff, TariffSchedule, default_tariff, load_tariff
+from .prediction_table import PredictionTable
+from .compiled_model import CompiledModel
+from .model_metrics import ModelMetrics, load_model_metrics, write_model_metrics
+from .model_registry import ModelRegistry, registry_for
+from .hot_swap import HotSwapPredictor
+from .warmup import Warmup, warm_predictor, serve_health, process_warmup
+from .result_cache import ResultCache, get_result_cache
+
+__all__ = [
+    'PredictionCore',
+    'model_signature',
+    'PredictionTable',
+    'CompiledModel',
+    'ModelMetrics',
+    'load_model_metrics',
+    'write_model_metrics',
+    'ModelRegistry',
+    'registry_for',
+    'HotSwapPredictor',
+    'Warmup',
+    'warm_predictor',
+    'serve_health',
+    'process_warmup',
+    'Tariff',
+    'TariffSchedule',
+    'default_tariff',
+    'load_tariff',
+    'ResultCache',
+    'get_result_cache',
+    'PredictionError',
+    'ModelNotLoadedError',
+    'InputValidationError',
+    'FEATURE_COLUMNS',
+    'REFERENCE_YEAR'
+]
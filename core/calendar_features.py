@@ -0,0 +1,116 @@
+"""
+Roo-Lot Core - Calendar Features
+
+Season flags and weekend ratio for every (year, month) between YEAR_MIN and
+YEAR_MAX, precomputed once at import with NumPy. Training, plotting and
+serving all derive these features through the same indexed lookup, so they
+stay consistent and cost microseconds instead of a pd.date_range per row.
+
+Seasons (Thailand, MUST match training):
+- hot:   Mar-Jun (3, 4, 5, 6)
+- rainy: Jul-Oct (7, 8, 9, 10)
+- cool:  Nov-Feb (11, 12, 1, 2)
+"""
+import numpy as np
+
+YEAR_MIN = 1900
+YEAR_MAX = 2199
+
+HOT_MONTHS = [3, 4, 5, 6]
+RAINY_MONTHS = [7, 8, 9, 10]
+
+# Index 0 is unused so months (1-12) index directly
+SEASON_HOT = np.isin(np.arange(13), HOT_MONTHS).astype(np.int8)
+SEASON_RAINY = np.isin(np.arange(13), RAINY_MONTHS).astype(np.int8)
+
+
+def _build_month_tables():
+    """Days in month and weekend ratio for every month in [YEAR_MIN, YEAR_MAX]"""
+    month_starts = np.arange(f'{YEAR_MIN}-01', f'{YEAR_MAX + 1}-02', dtype='datetime64[M]').astype('datetime64[D]')
+    days_in_month = np.diff(month_starts).astype(np.int64)
+
+    # 1970-01-01 was a Thursday -> weekday index 3 (Monday=0 ... Sunday=6)
+    first_weekday = (month_starts[:-1].astype(np.int64) + 3) % 7
+    day_offsets = np.arange(31)
+    weekday = (first_weekday[:, None] + day_offsets) % 7
+    in_month = day_offsets < days_in_month[:, None]
+    weekend_days = ((weekday >= 5) & in_month).sum(axis=1)
+
+    shape = (YEAR_MAX - YEAR_MIN + 1, 12)
+    return days_in_month.reshape(shape), (weekend_days / days_in_month).reshape(shape)
+
+
+DAYS_IN_MONTH, WEEKEND_RATIO = _build_month_tables()
+
+
+def _year_month_index(year, month):
+    """Validate and convert (year, month) to table indices"""
+    year = np.asarray(year, dtype=np.int64)
+    month = np.asarray(month, dtype=np.int64)
+    if np.any((year < YEAR_MIN) | (year > YEAR_MAX)):
+        raise ValueError(f"Year must be between {YEAR_MIN} and {YEAR_MAX}")
+    if np.any((month < 1) | (month > 12)):
+        raise ValueError("Month must be between 1 and 12")
+    return year - YEAR_MIN, month - 1
+
+
+def season_flags(month):
+    """
+    Season one-hot flags for month(s)
+
+    Returns:
+        tuple: (season_hot, season_rainy) int8 arrays
+    """
+    month = np.asarray(month, dtype=np.int64)
+    if np.any((month < 1) | (month > 12)):
+        raise ValueError("Month must be between 1 and 12")
+    return SEASON_HOT[month], SEASON_RAINY[month]
+
+
+def season_name(month: int) -> str:
+    """Season label for a single month: 'hot', 'rainy' or 'cool'"""
+    if month in HOT_MONTHS:
+        return 'hot'
+    if month in RAINY_MONTHS:
+        return 'rainy'
+    return 'cool'
+
+
+def weekend_ratio(year, month):
+    """Share of Saturdays/Sundays in the month(s) - scalar or array"""
+    year_idx, month_idx = _year_month_index(year, month)
+    return WEEKEND_RATIO[year_idx, month_idx]
+
+
+def calendar_features(year, month) -> dict:
+    """
+    All calendar-derived model features for (year, month) pairs
+
+    Args:
+        year: int or array of years
+        month: int or array of months (1-12)
+
+    Returns:
+        dict: 'season_hot', 'season_rainy', 'weekend_ratio' arrays
+    """
+    year_idx, month_idx = _year_month_index(year, month)
+    return {
+        'season_hot': SEASON_HOT[month_idx + 1],
+        'season_rainy': SEASON_RAINY[month_idx + 1],
+        'weekend_ratio': WEEKEND_RATIO[year_idx, month_idx]
+    }
+
+
+def features_from_dates(dates) -> dict:
+    """
+    Calendar features for an array of dates (Series, DatetimeIndex or datetime64)
+
+    Returns:
+        dict: 'month', 'season_hot', 'season_rainy', 'weekend_ratio' arrays
+    """
+    months_since_epoch = np.asarray(dates, dtype='datetime64[M]').astype(np.int64)
+    year = months_since_epoch // 12 + 1970
+    month = months_since_epoch % 12 + 1
+    features = calendar_features(year, month)
+    features['month'] = month
+    return features
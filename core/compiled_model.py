@@ -0,0 +1,317 @@
+"""
+Roo-Lot Core - Compiled Model
+
+Flattens a fitted sklearn pipeline (StandardScaler + linear model or
+RandomForest/DecisionTree) into plain NumPy arrays and evaluates it with
+NumPy only. Serving a compiled model needs neither joblib nor sklearn, loads
+in milliseconds and keeps a much smaller resident footprint per worker.
+
+Artifact layout (.compiled.npz next to the .pkl, stored uncompressed):
+- kind: 'linear' or 'forest'
+- feature_names, scaler_mean, scaler_scale
+- linear: coef, intercept
+- forest: children_left, children_right, feature, threshold, value
+  (all trees concatenated, child indices already offset, leaves looping onto
+  themselves), roots, max_depth
+- fingerprint: fingerprint of the source .pkl
+
+Arrays are memory-mapped read-only on load, so every Streamlit worker on a
+host shares one page-cached copy instead of holding its own.
+"""
+import os
+import struct
+import zipfile
+import numpy as np
+
+from .prediction_table import fingerprint_file
+
+# Bump when the artifact layout changes
+COMPILED_SCHEMA_VERSION = 2
+COMPILED_FINGERPRINT_SALT = f"compiled-v{COMPILED_SCHEMA_VERSION}"
+
+# Rows evaluated per forest traversal pass (bounds the rows x trees index matrix)
+FOREST_ROW_CHUNK = 8192
+
+# Default tolerance (kWh) when checking compiled vs sklearn predictions
+DEFAULT_TOLERANCE = 1e-6
+
+TREE_LEAF = -1
+
+
+def compiled_path_for(model_path: str) -> str:
+    """Return the compiled artifact path saved next to a model file"""
+    root, _ = os.path.splitext(model_path)
+    return f"{root}.compiled.npz"
+
+
+def mmap_npz(path: str) -> dict:
+    """
+    Memory-map every member of an uncompressed .npz read-only
+
+    np.load ignores mmap_mode for .npz archives, but members written by
+    np.savez are stored as-is, so each one can be mapped at its data offset.
+    Compressed members and 0-d scalars are read into memory instead.
+
+    Returns:
+        dict: name -> np.memmap / np.ndarray
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, 'rb') as f:
+        for info in archive.infolist():
+            name = info.filename[:-4] if info.filename.endswith('.npy') else info.filename
+            if info.compress_type != zipfile.ZIP_STORED:
+                with archive.open(info) as member:
+                    arrays[name] = np.lib.format.read_array(member, allow_pickle=False)
+                continue
+
+            # Local file header: 30 fixed bytes, then file name and extra field
+            f.seek(info.header_offset)
+            name_len, extra_len = struct.unpack('<HH', f.read(30)[26:30])
+            f.seek(info.header_offset + 30 + name_len + extra_len)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            if dtype.hasobject:
+                raise ValueError(f"Object array {name} cannot be memory-mapped")
+
+            if shape == () or 0 in shape:
+                arrays[name] = np.frombuffer(f.read(dtype.itemsize * int(np.prod(shape))), dtype=dtype).reshape(shape)
+            else:
+                arrays[name] = np.memmap(path, dtype=dtype, mode='r', offset=f.tell(),
+                                         shape=shape, order='F' if fortran_order else 'C')
+    return arrays
+
+
+class CompiledModel:
+    """NumPy-only evaluator for a flattened pipeline"""
+
+    def __init__(self, kind: str, arrays: dict, feature_names=None, fingerprint: str = None):
+        if kind not in ('linear', 'forest'):
+            raise ValueError(f"Unsupported compiled model kind: {kind}")
+        self.kind = kind
+        self.arrays = arrays
+        self.feature_names = list(feature_names) if feature_names is not None else None
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def from_pipeline(cls, pipeline, feature_names=None) -> 'CompiledModel':
+        """
+        Flatten a fitted pipeline or bare estimator
+
+        Args:
+            pipeline: Fitted sklearn Pipeline ([scaler,] estimator) or estimator
+            feature_names: Column order (defaults to feature_names_in_)
+
+        Returns:
+            CompiledModel
+        """
+        steps = [step for _, step in pipeline.steps] if hasattr(pipeline, 'steps') else [pipeline]
+        *transforms, estimator = steps
+
+        if feature_names is None:
+            feature_names = getattr(pipeline, 'feature_names_in_', None)
+
+        n_features = getattr(estimator, 'n_features_in_', None)
+        mean = np.zeros(n_features)
+        scale = np.ones(n_features)
+        for transform in transforms:
+            if not hasattr(transform, 'scale_') and not hasattr(transform, 'mean_'):
+                raise ValueError(f"Cannot compile pipeline step {type(transform).__name__}")
+            # Compose successive standardizations: (x - m) / s
+            use_mean = getattr(transform, 'with_mean', True) and getattr(transform, 'mean_', None) is not None
+            use_scale = getattr(transform, 'with_std', True) and getattr(transform, 'scale_', None) is not None
+            step_mean = transform.mean_ if use_mean else 0.0
+            step_scale = transform.scale_ if use_scale else 1.0
+            mean = mean + step_mean * scale
+            scale = scale * step_scale
+
+        arrays = {
+            'scaler_mean': np.asarray(mean, dtype=np.float64),
+            'scaler_scale': np.asarray(scale, dtype=np.float64)
+        }
+
+        if hasattr(estimator, 'coef_'):
+            arrays['coef'] = np.asarray(estimator.coef_, dtype=np.float64).ravel()
+            arrays['intercept'] = np.asarray(estimator.intercept_, dtype=np.float64).reshape(())
+            return cls('linear', arrays, feature_names)
+
+        trees = [tree.tree_ for tree in estimator.estimators_] if hasattr(estimator, 'estimators_') else [estimator.tree_]
+        if not trees or not all(tree.value.shape[1:] == (1, 1) for tree in trees):
+            raise ValueError(f"Cannot compile estimator {type(estimator).__name__}")
+
+        sizes = np.array([tree.node_count for tree in trees])
+        roots = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+        children_left = np.concatenate([t.children_left + r for t, r in zip(trees, roots)])
+        children_right = np.concatenate([t.children_right + r for t, r in zip(trees, roots)])
+        is_leaf = np.concatenate([t.children_left == TREE_LEAF for t in trees])
+        node_ids = np.arange(len(is_leaf))
+
+        # Leaves loop onto themselves with a +inf threshold, so every row can
+        # take exactly max_depth steps without leaf masks. Stored in this form
+        # so the memory-mapped arrays are used directly (no per-process copy).
+        arrays.update({
+            'children_left': np.where(is_leaf, node_ids, children_left).astype(np.int32),
+            'children_right': np.where(is_leaf, node_ids, children_right).astype(np.int32),
+            'feature': np.where(is_leaf, 0, np.concatenate([t.feature for t in trees])).astype(np.int32),
+            'threshold': np.where(is_leaf, np.inf, np.concatenate([t.threshold for t in trees])).astype(np.float64),
+            'value': np.concatenate([t.value[:, 0, 0] for t in trees]).astype(np.float64),
+            'roots': roots.astype(np.int32),
+            'max_depth': np.array(max(t.max_depth for t in trees))
+        })
+        return cls('forest', arrays, feature_names)
+
+    @classmethod
+    def load(cls, path: str, fingerprint: str = None, mmap: bool = True):
+        """
+        Load a compiled artifact
+
+        Args:
+            path: .compiled.npz path
+            fingerprint: Expected source fingerprint (None skips the check)
+            mmap: Memory-map arrays read-only (shared page cache across workers)
+
+        Returns:
+            CompiledModel or None if missing, unreadable or stale
+        """
+        if not os.path.exists(path):
+            return None
+        try:
+            if mmap:
+                data = mmap_npz(path)
+            else:
+                with np.load(path, allow_pickle=False) as npz:
+                    data = {key: npz[key] for key in npz.files}
+
+            stored_fingerprint = str(data['fingerprint'])
+            if fingerprint is not None and stored_fingerprint != fingerprint:
+                return None
+            meta = {'kind', 'feature_names', 'fingerprint'}
+            arrays = {key: value for key, value in data.items() if key not in meta}
+            return cls(str(data['kind']), arrays, data.get('feature_names'), stored_fingerprint)
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+            return None
+
+    def save(self, path: str, fingerprint: str) -> None:
+        """Save uncompressed arrays (written atomically)"""
+        extra = {'kind': np.array(self.kind), 'fingerprint': np.array(fingerprint)}
+        if self.feature_names is not None:
+            extra['feature_names'] = np.array(self.feature_names)
+        # Per-process temp name: several workers may export the same artifact at startup
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, **self.arrays, **extra)
+        os.replace(tmp_path, path)
+        self.fingerprint = fingerprint
+
+    def predict(self, X) -> np.ndarray:
+        """
+        Predict with NumPy only
+
+        Args:
+            X: DataFrame (columns reordered to feature_names) or 2D array
+
+        Returns:
+            np.ndarray: Predictions, one per row
+        """
+        X_scaled = self._scaled(X)
+
+        if self.kind == 'linear':
+            return X_scaled @ self.arrays['coef'] + self.arrays['intercept']
+
+        # Per-chunk means: the (rows, trees) matrix never exceeds FOREST_ROW_CHUNK rows
+        return np.concatenate([
+            leaves.mean(axis=1) for leaves in self._leaf_chunks(X_scaled)
+        ]) if len(X_scaled) else np.empty(0)
+
+    def predict_spread(self, X, quantiles) -> tuple:
+        """
+        Mean and quantiles of the trees' predictions in one traversal (forests only)
+
+        Args:
+            X: As for predict()
+            quantiles: Quantile levels across trees, e.g. (0.1, 0.9)
+
+        Returns:
+            tuple: (mean (rows,), quantile values (len(quantiles), rows)); the mean equals predict(X)
+        """
+        if self.kind != 'forest':
+            raise ValueError("Per-tree spread needs a forest model")
+        X_scaled = self._scaled(X)
+        means, spreads = [np.empty(0)], [np.empty((len(quantiles), 0))]
+        for leaves in self._leaf_chunks(X_scaled):
+            means.append(leaves.mean(axis=1))
+            spreads.append(np.quantile(leaves, quantiles, axis=1))
+        return np.concatenate(means), np.concatenate(spreads, axis=1)
+
+    def _scaled(self, X) -> np.ndarray:
+        if hasattr(X, 'columns') and self.feature_names is not None:
+            X = X[self.feature_names]
+        X = np.asarray(X, dtype=np.float64)
+        if X.ndim == 1:
+            X = X.reshape(1, -1)
+        return (X - self.arrays['scaler_mean']) / self.arrays['scaler_scale']
+
+    def _leaf_chunks(self, X_scaled: np.ndarray):
+        """(rows, trees) leaf values, FOREST_ROW_CHUNK rows at a time"""
+        # sklearn trees compare float32 inputs against float64 thresholds
+        X_scaled = X_scaled.astype(np.float32)
+        for start in range(0, len(X_scaled), FOREST_ROW_CHUNK):
+            yield self._forest_leaves(X_scaled[start:start + FOREST_ROW_CHUNK])
+
+    def _forest_leaves(self, X: np.ndarray) -> np.ndarray:
+        """Walk every tree for every row in lock-step; leaf value per (row, tree)"""
+        left = self.arrays['children_left']
+        right = self.arrays['children_right']
+        feature = self.arrays['feature']
+        threshold = self.arrays['threshold']
+
+        flat_X = X.ravel()
+        row_offsets = (np.arange(len(X)) * X.shape[1])[:, None]
+        nodes = np.repeat(self.arrays['roots'][None, :], len(X), axis=0)
+
+        for _ in range(int(self.arrays['max_depth'])):
+            go_left = flat_X[row_offsets + feature[nodes]] <= threshold[nodes]
+            nodes = np.where(go_left, left[nodes], right[nodes])
+
+        return self.arrays['value'][nodes]
+
+    def verify(self, reference, X, tolerance: float = DEFAULT_TOLERANCE) -> float:
+        """
+        Check the compiled predictions reproduce the reference model
+
+        Returns:
+            float: Max absolute difference
+
+        Raises:
+            ValueError: Difference above tolerance
+        """
+        expected = np.asarray(reference.predict(X), dtype=np.float64)
+        max_diff = float(np.max(np.abs(self.predict(X) - expected))) if len(expected) else 0.0
+        if max_diff > tolerance:
+            raise ValueError(f"Compiled model differs from pipeline by {max_diff:.3g} (tolerance {tolerance:g})")
+        return max_diff
+
+
+def export_compiled_model(pipeline, model_path: str, X_check, tolerance: float = DEFAULT_TOLERANCE) -> str:
+    """
+    Training export step: compile, verify and save next to the saved .pkl
+
+    Args:
+        pipeline: Fitted pipeline that was just dumped to model_path
+        model_path: Path of the saved .pkl (used for the fingerprint)
+        X_check: Rows used to verify compiled vs pipeline predictions
+        tolerance: Max allowed absolute difference
+
+    Returns:
+        str: Path of the compiled artifact
+    """
+    compiled = CompiledModel.from_pipeline(pipeline, feature_names=getattr(X_check, 'columns', None))
+    max_diff = compiled.verify(pipeline, X_check, tolerance)
+
+    path = compiled_path_for(model_path)
+    compiled.save(path, fingerprint_file(model_path, salt=COMPILED_FINGERPRINT_SALT))
+    print(f"Compiled model saved to {path} (max diff {max_diff:.2e})")
+    return path
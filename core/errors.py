@@ -0,0 +1,34 @@
+"""
+Roo-Lot Core - Structured Errors
+
+The core never talks to a UI. Problems are raised as these exceptions and
+each front-end (Streamlit app, CLI, batch job) decides how to report them.
+"""
+
+
+class PredictionError(Exception):
+    """Base class for all prediction core errors"""
+
+    def __init__(self, message: str):
+        super().__init__(message)
+        self.message = message
+
+
+class ModelNotLoadedError(PredictionError):
+    """Raised when predicting without a loaded model"""
+
+    def __init__(self, message: str = "Model is not loaded"):
+        super().__init__(message)
+
+
+class InputValidationError(PredictionError):
+    """Raised when a user input is outside the supported range"""
+
+    def __init__(self, field: str, value, message: str):
+        super().__init__(message)
+        self.field = field
+        self.value = value
+
+    def to_dict(self) -> dict:
+        """Structured form for JSON responses / logs"""
+        return {'field': self.field, 'value': self.value, 'message': self.message}
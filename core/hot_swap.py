@@ -0,0 +1,86 @@
+"""
+Roo-Lot Core - Hot-Swappable Predictor
+
+Holds the predictor that requests use and replaces it when the model files
+change, without ever making a request wait for a load:
+
+- refresh() compares model_signature() (a few os.stat calls, including the
+  registry's current.json) with the one the current predictor was built
+  from. On a change it starts ONE background thread that builds a new
+  predictor and returns immediately.
+- Requests keep reading `current` - the old predictor - until the new one is
+  fully loaded (and warmed, if a warm callable is given); the swap is a
+  single attribute assignment.
+- A failed load (exception or no model) keeps the old predictor and records
+  the reason in last_error.
+"""
+import threading
+from typing import Callable, Optional
+
+from .predictor import model_signature
+
+
+class HotSwapPredictor:
+    """
+    Current predictor plus a non-blocking background reload
+
+    Args:
+        factory: Builds a loaded predictor (e.g. PredictionCore or ElectricityPredictor)
+        signature: Cheap change detector (default: model_signature of the default models dir)
+        warm: Run on a freshly loaded predictor before it is swapped in (e.g. core.warmup.warm_predictor)
+    """
+
+    def __init__(self, factory: Callable, signature: Callable[[], tuple] = model_signature,
+                 warm: Optional[Callable] = None):
+        self._factory = factory
+        self._signature = signature
+        self._warm = warm
+        self._lock = threading.Lock()
+        self._loader: Optional[threading.Thread] = None
+        self.signature = signature()
+        self.current = factory()
+        self.swaps = 0
+        self.last_error: Optional[str] = None
+
+    def refresh(self) -> bool:
+        """
+        Start a background reload if the model files changed (never blocks on a load)
+
+        Returns:
+            bool: True if a reload was started by this call
+        """
+        signature = self._signature()
+        if signature == self.signature:
+            return False
+        with self._lock:
+            if self.loading:
+                return False
+            self._loader = threading.Thread(target=self._load, args=(signature,),
+                                            name='model-hot-swap', daemon=True)
+            self._loader.start()
+        return True
+
+    @property
+    def loading(self) -> bool:
+        return self._loader is not None and self._loader.is_alive()
+
+    def _load(self, signature: tuple) -> None:
+        try:
+            candidate = self._factory()
+            error = None if candidate.model is not None else (candidate.load_error or "No model found")
+            if error is None and self._warm is not None:
+                self._warm(candidate)
+        except Exception as e:
+            error = str(e)
+        if error is None:
+            self.current = candidate
+            self.swaps += 1
+        self.last_error = error
+        # Also on failure: the same broken files are not retried on every request
+        self.signature = signature
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Block until a running reload finishes (scripts and tests; requests never call this)"""
+        loader = self._loader
+        if loader is not None:
+            loader.join(timeout)
@@ -0,0 +1,71 @@
+"""
+Roo-Lot Core - Per-Prediction Intervals
+
+A RandomForest prediction is the mean of its trees' leaf values. The same
+traversal that produces the point estimate already has every tree's
+output, so the spread across trees comes for free: the interval is the
+(1 - coverage) / 2 and (1 + coverage) / 2 quantiles of the per-tree
+predictions, computed in the same vectorized pass as the mean.
+
+The per-tree spread measures how much the model itself is unsure for that
+input (few similar training rows, disagreeing trees); it does not include
+irreducible noise, so it is a model-uncertainty band rather than a
+calibrated prediction interval.
+
+Models without trees (linear pipelines, mocks) get no interval (None) and
+callers fall back to the global test MAE.
+"""
+from typing import NamedTuple, Optional
+
+import numpy as np
+
+from .compiled_model import CompiledModel
+
+# Central share of the trees' predictions covered by the interval
+DEFAULT_COVERAGE = 0.8
+
+
+class IntervalPrediction(NamedTuple):
+    """Point estimates with optional per-row bounds"""
+    kwh: np.ndarray
+    lower: Optional[np.ndarray]
+    upper: Optional[np.ndarray]
+
+
+def as_compiled_forest(model) -> Optional[CompiledModel]:
+    """Model as a CompiledModel forest, flattening sklearn forests on the fly (None if not a forest)"""
+    if isinstance(model, CompiledModel):
+        return model if model.kind == 'forest' else None
+    try:
+        estimator = model.steps[-1][1] if hasattr(model, 'steps') else model
+        if not hasattr(estimator, 'estimators_') or not hasattr(estimator.estimators_[0], 'tree_'):
+            return None
+        return CompiledModel.from_pipeline(model)
+    except (TypeError, AttributeError, IndexError, KeyError, ValueError):
+        # Not a flattenable forest (custom pipeline step, stand-in model)
+        return None
+
+
+def predict_interval(model, X, coverage: float = DEFAULT_COVERAGE,
+                     forest: Optional[CompiledModel] = None) -> IntervalPrediction:
+    """
+    Point estimate and per-tree quantile interval in one pass
+
+    Args:
+        model: Fitted model (CompiledModel, sklearn pipeline/forest, anything with predict)
+        X: Feature rows
+        coverage: Central share of tree predictions inside [lower, upper]
+        forest: Already compiled forest of `model` (skips flattening)
+
+    Returns:
+        IntervalPrediction (lower/upper None when the model has no trees)
+    """
+    if not 0 < coverage < 1:
+        raise ValueError("coverage must be between 0 and 1")
+    forest = forest if forest is not None else as_compiled_forest(model)
+    if forest is None:
+        return IntervalPrediction(np.asarray(model.predict(X), dtype=np.float64), None, None)
+
+    tail = (1 - coverage) / 2
+    kwh, (lower, upper) = forest.predict_spread(X, (tail, 1 - tail))
+    return IntervalPrediction(kwh, lower, upper)
@@ -0,0 +1,119 @@
+"""
+Roo-Lot Core - Model Metrics Sidecar
+
+Test-set metrics (R², MAE, RMSE) are written by the evaluation step of the
+training scripts next to the model file they were computed on:
+
+    models/electricbills_predict.pkl
+    models/electricbills_predict.metrics.json
+
+The sidecar records the sha256 of that model file. The predictor reads it
+once when the model is loaded and ignores it if the hash does not match (a
+model replaced without re-evaluation), so the numbers shown in the UI always
+belong to the model being served and a new model brings its own metrics -
+no code change, no evaluation at request time.
+"""
+import json
+import os
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional
+
+from .prediction_table import fingerprint_file
+
+# Bump when the sidecar layout changes
+METRICS_SCHEMA_VERSION = 1
+
+
+class ModelMetrics(NamedTuple):
+    """Test metrics of one model file (kWh per month)"""
+    r2: float
+    mae_kwh: float
+    rmse_kwh: float
+    model_sha256: str
+    source: str = ''
+    evaluated_at: str = ''
+    n_samples: Optional[int] = None
+
+    def as_result(self) -> Dict:
+        """'model_metrics' entry of a prediction result"""
+        return {
+            'r2_score': self.r2,
+            'mae': self.mae_kwh,
+            'rmse': self.rmse_kwh,
+            'source': self.source,
+            'evaluated_at': self.evaluated_at,
+            'model_sha256': self.model_sha256[:16]
+        }
+
+
+def metrics_path_for(model_path: str) -> str:
+    """Return the metrics sidecar path saved next to a model file"""
+    root, _ = os.path.splitext(model_path)
+    return f"{root}.metrics.json"
+
+
+def model_sha256(model_path: str) -> str:
+    """Plain sha256 of the model file (same digest as the run log and model_metadata.json)"""
+    return fingerprint_file(model_path, salt='')
+
+
+def write_model_metrics(model_path: str, r2: float, mae_kwh: float, rmse_kwh: float,
+                        source: str, n_samples: Optional[int] = None) -> ModelMetrics:
+    """
+    Write the metrics sidecar for a saved model (atomically)
+
+    Call after the model file is written: the sidecar is bound to its hash.
+
+    Args:
+        model_path: Saved model file the metrics were computed on
+        r2: Test R²
+        mae_kwh: Test MAE (monthly kWh)
+        rmse_kwh: Test RMSE (monthly kWh)
+        source: Script that evaluated the model
+        n_samples: Test rows used
+
+    Returns:
+        ModelMetrics as written
+    """
+    metrics = ModelMetrics(
+        r2=float(r2),
+        mae_kwh=float(mae_kwh),
+        rmse_kwh=float(rmse_kwh),
+        model_sha256=model_sha256(model_path),
+        source=source,
+        evaluated_at=datetime.now().isoformat(timespec='seconds'),
+        n_samples=None if n_samples is None else int(n_samples)
+    )
+    path = metrics_path_for(model_path)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({'schema': METRICS_SCHEMA_VERSION, **metrics._asdict()}, f, indent=2)
+    os.replace(tmp_path, path)
+    return metrics
+
+
+def load_model_metrics(model_path: str, sha256: Optional[str] = None) -> Optional[ModelMetrics]:
+    """
+    Load the sidecar of a model file, refusing metrics of another model
+
+    Args:
+        model_path: Model file being served
+        sha256: Its digest if already known (hashed here otherwise)
+
+    Returns:
+        ModelMetrics or None if missing, unreadable or written for a different file
+    """
+    path = metrics_path_for(model_path)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('schema') != METRICS_SCHEMA_VERSION:
+            return None
+        metrics = ModelMetrics(**{field: data[field] for field in ModelMetrics._fields if field in data})
+        if metrics.model_sha256 != (sha256 or model_sha256(model_path)):
+            return None
+        return metrics
+    except (OSError, ValueError, TypeError, AttributeError):
+        return None
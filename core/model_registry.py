@@ -0,0 +1,254 @@
+"""
+Roo-Lot Core - File-Based Model Registry
+
+Training used to joblib.dump straight over models/electricbills_predict.pkl,
+so a worker reloading mid-write could read a torn file. Models are now
+published as immutable, content-addressed versions:
+
+    models/registry/
+        versions/<sha256 of the .pkl, 16 hex>/
+            electricbills_predict.pkl
+            electricbills_predict.compiled.npz
+            electricbills_predict.metrics.json
+            scaler.pkl
+            manifest.json
+        current.json            <- {"version": ..., "previous": ...}
+
+A version directory is assembled in a staging directory inside the registry
+and renamed into place in one step, and current.json is replaced atomically
+(write + fsync + os.replace). A reader therefore sees either the old or the
+new version, never a partial one; switching back is one activate() call.
+
+Derived sidecars (compiled artifact, metrics) are bound to the .pkl by hash,
+so they may be added to an existing version later (each written atomically)
+without changing its identity.
+
+Without a registry (fresh checkout) models are loaded from models/ as before;
+publish() also mirrors the files there atomically for scripts that read the
+legacy paths.
+"""
+import json
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from .prediction_table import fingerprint_file
+
+REGISTRY_DIRNAME = 'registry'
+VERSIONS_DIRNAME = 'versions'
+STAGING_DIRNAME = '.staging'
+POINTER_FILENAME = 'current.json'
+MANIFEST_FILENAME = 'manifest.json'
+
+# Model file that names a version (its sha256 is the version id)
+DEFAULT_MODEL_FILENAME = 'electricbills_predict.pkl'
+
+# Hex digits of the model sha256 used as the version id
+VERSION_ID_LENGTH = 16
+
+
+def _atomic_write_text(path: str, text: str) -> None:
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _atomic_copy(src: str, dst: str) -> None:
+    tmp_path = f'{dst}.tmp'
+    shutil.copyfile(src, tmp_path)
+    with open(tmp_path, 'rb') as f:
+        os.fsync(f.fileno())
+    os.replace(tmp_path, dst)
+
+
+class ModelRegistry:
+    """
+    Content-addressed model versions with an atomic "current" pointer
+
+    Args:
+        root: Registry directory (created on first publish)
+        model_filename: File whose sha256 identifies a version
+    """
+
+    def __init__(self, root: str, model_filename: str = DEFAULT_MODEL_FILENAME):
+        self.root = root
+        self.model_filename = model_filename
+        self.versions_path = os.path.join(root, VERSIONS_DIRNAME)
+        self.pointer_path = os.path.join(root, POINTER_FILENAME)
+
+    def stage(self) -> str:
+        """New empty staging directory (same filesystem as the versions, so publish can rename it)"""
+        staging_root = os.path.join(self.root, STAGING_DIRNAME)
+        os.makedirs(staging_root, exist_ok=True)
+        return tempfile.mkdtemp(prefix='stage-', dir=staging_root)
+
+    def publish(self, staging_dir: str, source: str = '', info: Optional[Dict] = None,
+                activate: bool = True, mirror_to: Optional[str] = None) -> str:
+        """
+        Turn a staging directory into a version and (optionally) make it current
+
+        Args:
+            staging_dir: Directory from stage() holding the model file and its sidecars
+            source: Script that produced the model
+            info: Extra manifest fields (metrics, selected model, ...)
+            activate: Switch the current pointer to this version
+            mirror_to: Also copy the files into this directory (legacy layout), atomically per file
+
+        Returns:
+            str: Version id
+        """
+        model_file = os.path.join(staging_dir, self.model_filename)
+        if not os.path.isfile(model_file):
+            raise FileNotFoundError(f"{self.model_filename} missing from {staging_dir}")
+        sha256 = fingerprint_file(model_file, salt='')
+        version = sha256[:VERSION_ID_LENGTH]
+        files = sorted(name for name in os.listdir(staging_dir) if name != MANIFEST_FILENAME)
+        manifest = {
+            'version': version,
+            'model_file': self.model_filename,
+            'model_sha256': sha256,
+            'files': {name: os.path.getsize(os.path.join(staging_dir, name)) for name in files},
+            'created_at': datetime.now().isoformat(),
+            'source': source
+        }
+        manifest.update(info or {})
+        _atomic_write_text(os.path.join(staging_dir, MANIFEST_FILENAME), json.dumps(manifest, indent=2))
+
+        if mirror_to:
+            # Legacy layout first: the pointer never names a model that is not in place everywhere
+            os.makedirs(mirror_to, exist_ok=True)
+            for name in files:
+                _atomic_copy(os.path.join(staging_dir, name), os.path.join(mirror_to, name))
+
+        target = self.version_path(version)
+        os.makedirs(self.versions_path, exist_ok=True)
+        try:
+            os.rename(staging_dir, target)
+        except OSError:
+            # Same model published before: refresh its sidecars file by file
+            for name in files + [MANIFEST_FILENAME]:
+                os.replace(os.path.join(staging_dir, name), os.path.join(target, name))
+            shutil.rmtree(staging_dir, ignore_errors=True)
+
+        if activate:
+            self.activate(version)
+        return version
+
+    def activate(self, version: str) -> None:
+        """Point current.json at an existing version (atomic replace)"""
+        if self.manifest(version) is None:
+            raise ValueError(f"Unknown model version: {version}")
+        pointer = self._read_pointer() or {}
+        # Re-activating the current version (to signal refreshed sidecars) keeps its previous
+        previous = pointer.get('previous') if pointer.get('version') == version else pointer.get('version')
+        pointer = {
+            'version': version,
+            'previous': previous,
+            'activated_at': datetime.now().isoformat(timespec='seconds')
+        }
+        _atomic_write_text(self.pointer_path, json.dumps(pointer, indent=2))
+
+    def rollback(self) -> str:
+        """Re-activate the version that was current before the last activate()"""
+        pointer = self._read_pointer() or {}
+        if not pointer.get('previous'):
+            raise ValueError("No previous model version to roll back to")
+        self.activate(pointer['previous'])
+        return pointer['previous']
+
+    def _read_pointer(self) -> Optional[Dict]:
+        try:
+            with open(self.pointer_path, encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def current(self) -> Optional[str]:
+        """Current version id (None if nothing published or the pointer is unreadable)"""
+        pointer = self._read_pointer()
+        return pointer.get('version') if isinstance(pointer, dict) else None
+
+    def version_path(self, version: str) -> str:
+        return os.path.join(self.versions_path, version)
+
+    def current_dir(self) -> Optional[str]:
+        """Directory of the current version (None without one)"""
+        version = self.current()
+        if version is None or not os.path.isdir(self.version_path(version)):
+            return None
+        return self.version_path(version)
+
+    def manifest(self, version: str) -> Optional[Dict]:
+        try:
+            with open(os.path.join(self.version_path(version), MANIFEST_FILENAME), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def versions(self) -> List[Dict]:
+        """Manifests of all versions, oldest first"""
+        if not os.path.isdir(self.versions_path):
+            return []
+        manifests = [self.manifest(name) for name in os.listdir(self.versions_path)]
+        return sorted((m for m in manifests if m), key=lambda m: m['created_at'])
+
+    def verify(self, version: str) -> bool:
+        """True if the version's model file still hashes to its id"""
+        manifest = self.manifest(version)
+        if manifest is None:
+            return False
+        try:
+            path = os.path.join(self.version_path(version), manifest['model_file'])
+            return fingerprint_file(path, salt='') == manifest['model_sha256']
+        except (OSError, KeyError):
+            return False
+
+    def prune(self, keep: int = 3) -> List[str]:
+        """
+        Delete the oldest versions, never the current or previous one
+
+        Loaded models stay valid (their files are open or mapped), but keep a
+        few versions so a worker that has just read the pointer can still load.
+
+        Returns:
+            list: Removed version ids
+        """
+        pointer = self._read_pointer() or {}
+        protected = {pointer.get('version'), pointer.get('previous')}
+        versions = [m['version'] for m in self.versions()]
+        removable = [v for v in versions[:max(len(versions) - keep, 0)] if v not in protected]
+        for version in removable:
+            shutil.rmtree(self.version_path(version), ignore_errors=True)
+        return removable
+
+    def pointer_signature(self) -> Optional[tuple]:
+        """(mtime_ns, size, inode) of current.json - a stat, no read (None without a registry)"""
+        try:
+            stat = os.stat(self.pointer_path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
+def registry_for(models_path: str) -> ModelRegistry:
+    """The registry kept under a models directory (models/registry)"""
+    return ModelRegistry(os.path.join(models_path, REGISTRY_DIRNAME))
+
+
+def resolve_model_dir(models_path: str):
+    """
+    Directory to load models from: the current registry version, else models_path itself
+
+    Returns:
+        tuple: (directory, version id or None)
+    """
+    registry = registry_for(models_path)
+    directory = registry.current_dir()
+    if directory is None:
+        return models_path, None
+    return directory, os.path.basename(directory)
@@ -0,0 +1,151 @@
+"""
+Roo-Lot Core - Prediction Table
+
+The predictor only accepts household_size 1-10, has_ac 0/1 and month 1-12,
+so the whole input space is 10 x 2 x 12 = 240 cells. The table evaluates
+every cell in ONE batched model.predict() call and afterwards serving is a
+plain array lookup (no pandas, no sklearn on the request path).
+
+For forests the same batched pass also stores each cell's interval (per-tree
+quantiles, see core.intervals), so honest per-household ranges cost a lookup.
+
+The table is fingerprinted against the model file (sha256) so a table built
+from an older model is never served.
+"""
+
+import hashlib
+import os
+import numpy as np
+
+# Input space covered by the table (MUST match ElectricityPredictor validation)
+HOUSEHOLD_SIZES = np.arange(1, 11)
+AC_VALUES = np.array([0, 1])
+MONTHS = np.arange(1, 13)
+
+TABLE_SHAPE = (len(HOUSEHOLD_SIZES), len(AC_VALUES), len(MONTHS))
+
+# Bump when the table layout or feature derivation changes
+TABLE_SCHEMA_VERSION = 2
+
+
+def fingerprint_file(path: str, salt: str = f"schema-v{TABLE_SCHEMA_VERSION}") -> str:
+    """
+    Compute a content fingerprint (sha256) for a model file
+
+    Args:
+        path: Path to the model file
+        salt: Artifact schema tag mixed into the digest (defaults to the table schema)
+
+    Returns:
+        str: Hex digest of salt + file content
+    """
+    digest = hashlib.sha256()
+    digest.update(salt.encode())
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def table_path_for(model_path: str) -> str:
+    """Return the table artifact path saved next to a model file"""
+    root, _ = os.path.splitext(model_path)
+    return f"{root}.table.npz"
+
+
+def input_grid():
+    """
+    Enumerate the full input space in table order
+
+    Returns:
+        tuple: (household_size, has_ac, month) flat int arrays of length 240
+    """
+    household, ac, month = np.meshgrid(HOUSEHOLD_SIZES, AC_VALUES, MONTHS, indexing='ij')
+    return household.ravel(), ac.ravel(), month.ravel()
+
+
+class PredictionTable:
+    """Precomputed monthly kWh (and interval bounds when available) for every cell"""
+
+    def __init__(self, kwh: np.ndarray, fingerprint: str, lower: np.ndarray = None,
+                 upper: np.ndarray = None, coverage: float = None):
+        if kwh.shape != TABLE_SHAPE:
+            raise ValueError(f"Prediction table must have shape {TABLE_SHAPE}, got {kwh.shape}")
+        if not np.all(np.isfinite(kwh)):
+            raise ValueError("Prediction table contains non-finite values")
+        if (lower is None) != (upper is None):
+            raise ValueError("Interval bounds must be given together")
+        if lower is not None and (lower.shape != TABLE_SHAPE or upper.shape != TABLE_SHAPE):
+            raise ValueError(f"Interval bounds must have shape {TABLE_SHAPE}")
+        self.kwh = kwh
+        self.lower = lower
+        self.upper = upper
+        self.coverage = coverage
+        self.fingerprint = fingerprint
+
+    @property
+    def has_intervals(self) -> bool:
+        return self.lower is not None
+
+    @classmethod
+    def build(cls, model, features, fingerprint: str) -> 'PredictionTable':
+        """
+        Evaluate all cells with a single batched predict call
+
+        Args:
+            model: Fitted model/pipeline exposing predict()
+            features: Feature rows for the 240 cells, in input_grid() order
+            fingerprint: Fingerprint of the model file
+
+        Returns:
+            PredictionTable (with interval bounds for forest models)
+        """
+        from .intervals import DEFAULT_COVERAGE, predict_interval
+
+        predicted = predict_interval(model, features, DEFAULT_COVERAGE)
+        if predicted.lower is None:
+            return cls(predicted.kwh.reshape(TABLE_SHAPE), fingerprint)
+        return cls(predicted.kwh.reshape(TABLE_SHAPE), fingerprint,
+                   predicted.lower.reshape(TABLE_SHAPE), predicted.upper.reshape(TABLE_SHAPE),
+                   DEFAULT_COVERAGE)
+
+    @classmethod
+    def load(cls, path: str, fingerprint: str):
+        """
+        Load a saved table, refusing stale artifacts
+
+        Returns:
+            PredictionTable or None if missing, unreadable or stale
+        """
+        if not os.path.exists(path):
+            return None
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if str(data['fingerprint']) != fingerprint:
+                    return None
+                if 'lower' in data.files:
+                    return cls(data['kwh'], fingerprint, data['lower'], data['upper'],
+                               float(data['coverage']))
+                return cls(data['kwh'], fingerprint)
+        except (OSError, KeyError, ValueError):
+            return None
+
+    def save(self, path: str) -> None:
+        """Save the table as a build artifact (written atomically)"""
+        tmp_path = f"{path}.tmp.npz"
+        arrays = {'kwh': self.kwh, 'fingerprint': np.array(self.fingerprint)}
+        if self.has_intervals:
+            arrays.update(lower=self.lower, upper=self.upper, coverage=np.array(self.coverage))
+        np.savez(tmp_path, **arrays)
+        os.replace(tmp_path, path)
+
+    def lookup(self, household_size: int, has_ac: int, month: int) -> float:
+        """O(1) lookup of the predicted monthly kWh for one validated input"""
+        return float(self.kwh[household_size - 1, has_ac, month - 1])
+
+    def lookup_interval(self, household_size: int, has_ac: int, month: int):
+        """(lower, upper) kWh for one validated input, or None without intervals"""
+        if not self.has_intervals:
+            return None
+        cell = (household_size - 1, has_ac, month - 1)
+        return float(self.lower[cell]), float(self.upper[cell])
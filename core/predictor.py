@@ -0,0 +1,588 @@
+"""
+Roo-Lot Core - Headless Electricity Predictor
+
+Pure-Python prediction core: no Streamlit, plotly or matplotlib.
+Validation problems are raised as structured errors (see core.errors) and
+soft warnings are returned in the result, so batch jobs, tests and CLIs can
+use it without a Streamlit context. Heavy libraries (pandas, joblib/sklearn)
+are imported lazily so importing the core stays cheap.
+"""
+import os
+import copy
+import time
+import itertools
+from typing import Optional
+
+import numpy as np
+
+from .errors import PredictionError, ModelNotLoadedError, InputValidationError
+from .prediction_table import PredictionTable, fingerprint_file, table_path_for, input_grid
+from .compiled_model import CompiledModel, compiled_path_for, export_compiled_model, COMPILED_FINGERPRINT_SALT
+from .result_cache import ResultCache, get_result_cache
+from .calendar_features import calendar_features, season_name, weekend_ratio as calendar_weekend_ratio
+from .tariff import Tariff, default_tariff
+from .intervals import DEFAULT_COVERAGE, as_compiled_forest, predict_interval
+from .model_metrics import load_model_metrics, metrics_path_for
+from .model_registry import registry_for, resolve_model_dir
+
+DEFAULT_MODELS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'models')
+MODEL_FILENAME = 'electricbills_predict.pkl'
+FALLBACK_MODEL_FILENAME = 'model_optimized.pkl'
+
+# Reference year for weekend_ratio (consistent with training data)
+REFERENCE_YEAR = 2025
+
+# Model feature order (MUST match training scripts)
+FEATURE_COLUMNS = ['household_size', 'has_ac', 'season_hot', 'season_rainy', 'weekend_ratio']
+
+# Model was trained on households of up to 6 people
+MAX_TRAINED_HOUSEHOLD_SIZE = 6
+
+def model_signature(models_path: str = None) -> tuple:
+    """
+    Cheap change detector for the model files (stat only, no hashing)
+
+    Used by the app to reload the predictor only when a model is published
+    or a model file is replaced, instead of blindly on a timer.
+
+    Returns:
+        tuple: stat of the registry pointer (models/registry/current.json),
+            then (filename, mtime_ns, size) for every model file, compiled
+            artifact and metrics sidecar present in models_path
+    """
+    models_path = models_path or DEFAULT_MODELS_PATH
+    signature = []
+    pointer = registry_for(models_path).pointer_signature()
+    if pointer is not None:
+        signature.append(('registry',) + pointer)
+    for filename in (MODEL_FILENAME, FALLBACK_MODEL_FILENAME):
+        model_path = os.path.join(models_path, filename)
+        for path in (model_path, compiled_path_for(model_path), metrics_path_for(model_path)):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            signature.append((os.path.basename(path), stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+# Versions for models assigned at runtime (not loaded from a file)
+_runtime_model_versions = itertools.count(1)
+
+THAI_MONTHS = {
+    "มกราคม": 1, "กุมภาพันธ์": 2, "มีนาคม": 3, "เมษายน": 4, "พฤษภาคม": 5, "มิถุนายน": 6,
+    "กรกฎาคม": 7, "สิงหาคม": 8, "กันยายน": 9, "ตุลาคม": 10, "พฤศจิกายน": 11, "ธันวาคม": 12
+}
+
+
+def _number(value) -> float:
+    """Float of a number or numeric string (NaN for anything else)"""
+    if isinstance(value, str):
+        try:
+            return float(value.strip())
+        except ValueError:
+            return np.nan
+    if isinstance(value, (bool, int, float, np.integer, np.floating, np.bool_)):
+        return float(value)
+    return np.nan
+
+
+def parse_household_size(value) -> Optional[int]:
+    """
+    Household size for predict() and predict_batch()
+
+    Accepts numbers and numeric strings, truncated like int() ("3.7" -> 3);
+    the 1-10 range is checked by the caller.
+
+    Returns:
+        int: Truncated size, or None if the value is not numeric
+    """
+    number = _number(value)
+    return int(number) if np.isfinite(number) else None
+
+
+def parse_has_ac(value) -> int:
+    """
+    AC flag for predict() and predict_batch(): "มี" or a number (string) > 0 -> 1, else 0
+    """
+    if isinstance(value, str) and value.strip() == "มี":
+        return 1
+    return 1 if _number(value) > 0 else 0
+
+
+def parse_month(value) -> Optional[int]:
+    """
+    Month number for predict() and predict_batch()
+
+    Accepts whole numbers 1-12 (int, float or digit string) and strings
+    containing a Thai month name.
+
+    Returns:
+        int: Month 1-12, or None if the value is not a valid month
+    """
+    if isinstance(value, str):
+        text = value.strip()
+        if not text.isdigit():
+            return next((val for name, val in THAI_MONTHS.items() if name in text), None)
+        value = int(text)
+    if isinstance(value, bool) or not isinstance(value, (int, float, np.integer, np.floating)):
+        return None
+    if not (np.isfinite(value) and value == int(value) and 1 <= value <= 12):
+        return None
+    return int(value)
+
+
+class PredictionCore:
+    """Loads the trained pipeline and turns household inputs into bill predictions"""
+
+    def __init__(self, models_path: str = None, use_prediction_table: bool = True,
+                 save_prediction_table: bool = False, use_compiled_model: bool = True,
+                 result_cache: ResultCache = None, tariff: Tariff = None,
+                 save_compiled_model: bool = False):
+        self.models_root = models_path or DEFAULT_MODELS_PATH
+        # Current registry version if one is published, else the files in models_root
+        self.models_path, self.registry_version = resolve_model_dir(self.models_root)
+        # kWh -> THB (progressive blocks, Ft, service charge, VAT)
+        self.tariff = tariff if tariff is not None else default_tariff()
+        self.use_compiled_model = use_compiled_model
+        self.save_compiled_model = save_compiled_model
+        # Process-wide by default; pass ResultCache(...) to isolate
+        self.result_cache = result_cache if result_cache is not None else get_result_cache()
+        self.model_path = None
+        self.using_fallback = False
+        self.load_error = None
+        self.model = self._load_model()
+        if self.model is not None and self.model_path:
+            # Same model file -> same version, so reloaded predictors share entries
+            try:
+                self.model_version = fingerprint_file(self.model_path, salt='model-version')[:16]
+            except OSError:
+                pass
+            # Test metrics written next to the model by the training scripts
+            self.metrics = load_model_metrics(self.model_path)
+            if self.metrics is None:
+                print(f"⚠️ No metrics sidecar for {os.path.basename(self.model_path)}; "
+                      "run the evaluation script (metrics hidden in the UI)")
+        # Scale is part of the electricbills_predict.pkl pipeline now!
+        # But we keep scaler.pkl loading as fallback or for manual inspection if needed.
+        self.scaler = None
+
+        # Precompute the whole 240-cell input space once (O(1) serving)
+        if use_prediction_table:
+            self.table = self._load_prediction_table(save=save_prediction_table)
+
+    @property
+    def model(self):
+        return self._model
+
+    @model.setter
+    def model(self, value):
+        # A table (or cached result) from another model must never be served
+        self._model = value
+        self.table = None
+        self._forest = None  # compiled lazily for per-tree intervals
+        # Sidecar metrics describe the loaded model file, not a model assigned at runtime
+        self.metrics = None
+        self.model_version = f"runtime-{next(_runtime_model_versions)}"
+
+    def _load_model(self):
+        """
+        Load the best model pipeline, falling back to the old optimized model
+
+        A compiled NumPy artifact exported by the training scripts is preferred
+        when its fingerprint matches the .pkl (no joblib/sklearn needed). Only
+        that artifact is shared between worker processes (its arrays are mapped
+        from the page cache); unpickling sklearn trees copies their node arrays
+        even with mmap_mode='r'. With save_compiled_model a missing or stale
+        artifact is exported from the .pkl and mapped instead.
+
+        Returns:
+            Fitted model or None (reason kept in self.load_error)
+        """
+        try:
+            # Load best model (pipeline)
+            if os.path.exists(os.path.join(self.models_path, MODEL_FILENAME)):
+                self.model_path = os.path.join(self.models_path, MODEL_FILENAME)
+
+                if self.use_compiled_model:
+                    compiled = CompiledModel.load(
+                        compiled_path_for(self.model_path),
+                        fingerprint_file(self.model_path, salt=COMPILED_FINGERPRINT_SALT)
+                    )
+                    if compiled is not None:
+                        return compiled
+
+                import joblib
+                # Maps the pickle's large arrays (no copy while unpickling); sklearn
+                # trees still copy their nodes, so workers share only the compiled artifact
+                model = joblib.load(self.model_path, mmap_mode='r')
+                if self.use_compiled_model and self.save_compiled_model:
+                    compiled = self._export_compiled(model)
+                    if compiled is not None:
+                        return compiled
+                return model
+
+            # Fallback
+            if os.path.exists(os.path.join(self.models_path, FALLBACK_MODEL_FILENAME)):
+                import joblib
+                self.using_fallback = True
+                return joblib.load(os.path.join(self.models_path, FALLBACK_MODEL_FILENAME))
+
+            return None
+        except Exception as e:
+            self.load_error = str(e)
+            return None
+
+    def _export_compiled(self, pipeline):
+        """Export, verify and map the compiled artifact for the loaded .pkl (None if unsupported)"""
+        try:
+            path = export_compiled_model(pipeline, self.model_path, self._feature_grid())
+            return CompiledModel.load(path, fingerprint_file(self.model_path, salt=COMPILED_FINGERPRINT_SALT))
+        except Exception as e:
+            print(f"⚠️ Compiled model unavailable, serving the pickle: {e}")
+            return None
+
+    def _load_prediction_table(self, save: bool = False):
+        """
+        Load the prediction table artifact or build it with one batched predict
+
+        Args:
+            save: Write a freshly built table next to the model file
+
+        Returns:
+            PredictionTable or None (falls back to per-call model.predict)
+        """
+        if self.model is None or self.model_path is None:
+            return None
+
+        try:
+            fingerprint = fingerprint_file(self.model_path)
+            artifact_path = table_path_for(self.model_path)
+
+            table = PredictionTable.load(artifact_path, fingerprint)
+            if table is None:
+                table = PredictionTable.build(self.model, self._feature_grid(), fingerprint)
+                if save:
+                    table.save(artifact_path)
+            return table
+        except Exception as e:
+            print(f"⚠️ Prediction table unavailable, using model directly: {e}")
+            return None
+
+    def _interval_forest(self):
+        """The model as a compiled forest for intervals (flattened once per model; False if not a forest)"""
+        if self._forest is None:
+            forest = as_compiled_forest(self.model) if self.model is not None else None
+            self._forest = forest if forest is not None else False
+        return self._forest or None
+
+    def _feature_grid(self):
+        """Model features for every (household_size, has_ac, month) cell"""
+        household_size, has_ac, month = input_grid()
+        return self._batch_features(household_size, has_ac, month)
+
+    def predict(self, inputs: dict) -> dict:
+        """
+        Generate prediction from user inputs
+
+        Args:
+            inputs (dict): Dictionary with keys 'household_size', 'has_ac', 'month'
+
+        Returns:
+            dict: Prediction results including 'amount', 'kwh', 'range' (typical
+                error in THB: ± the test MAE priced at this bill, None without
+                metrics), 'interval' (per-tree band for forests, else ± MAE),
+                'details', 'bill' (tariff breakdown of the amount), 'model_metrics' (test
+                R²/MAE/RMSE from the model's sidecar, None if unavailable)
+                and 'warnings' (soft issues such as extrapolation)
+
+        Raises:
+            ModelNotLoadedError: No model available
+            InputValidationError: Input outside the supported range
+            PredictionError: Model failed to produce a prediction
+
+        Features expected by model: ['household_size', 'has_ac', 'season_hot', 'season_rainy', 'weekend_ratio']
+        """
+        if not self.model:
+            raise ModelNotLoadedError()
+
+        warnings = []
+
+        # 1. Parse Inputs with Validation
+        household_input = inputs.get('household_size', 1)
+        household_size = parse_household_size(household_input)
+        if household_size is None:
+            raise PredictionError(f"Invalid household_size: {household_input!r}")
+
+        # Validate household size
+        if not 1 <= household_size <= 10:
+            raise InputValidationError(
+                'household_size', household_size, "⚠️ จำนวนสมาชิกต้องอยู่ระหว่าง 1-10 คน"
+            )
+
+        # Extrapolation warning
+        if household_size > MAX_TRAINED_HOUSEHOLD_SIZE:
+            warnings.append(
+                f"⚠️ Model เทรนด้วยข้อมูลบ้านไม่เกิน {MAX_TRAINED_HOUSEHOLD_SIZE} คน "
+                f"(คุณกรอก {household_size} คน) ค่าทำนายอาจคลาดเคลื่อนสูง"
+            )
+
+        # Parse has_ac - new format ("มี"/"ไม่มี") and old format (ac_hours or 0/1)
+        has_ac = parse_has_ac(inputs.get('has_ac', 0))
+
+        # Month parsing (same rule as predict_batch)
+        month_input = inputs.get('month', 1)
+        month = self._parse_month(month_input)
+
+        if month is None:
+            raise InputValidationError('month', month_input, "⚠️ เดือนไม่ถูกต้อง")
+
+        # Repeated questions skip feature derivation and the model entirely.
+        # Results embed the sidecar metrics (and their MAE interval), so the
+        # metrics are part of the key: a rewritten sidecar is never served stale.
+        cache_key = (household_size, has_ac, month, self.model_version, self.tariff.fingerprint, self.metrics)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return copy.deepcopy(cached)
+
+        # 2. Derive Features (Logic from data_pipeline.py)
+        season = self._get_season(month)
+        season_hot = 1 if season == 'hot' else 0
+        season_rainy = 1 if season == 'rainy' else 0
+
+        # Weekend Ratio (Use 2025 as reference year for consistency with training data)
+        weekend_ratio = self._calculate_weekend_ratio(REFERENCE_YEAR, month)
+
+        features = {
+            'household_size': household_size,
+            'has_ac': has_ac,
+            'season_hot': season_hot,
+            'season_rainy': season_rainy,
+            'weekend_ratio': weekend_ratio
+        }
+
+        # 3. Predict
+        if self.table is not None:
+            # O(1) lookup - no DataFrame, no sklearn
+            predicted_kwh = self.table.lookup(household_size, has_ac, month)
+            interval_kwh = self.table.lookup_interval(household_size, has_ac, month)
+        else:
+            import pandas as pd
+
+            # Model is a Pipeline, handles scaling; forests also give their per-tree interval
+            try:
+                input_data = pd.DataFrame([features])
+                start_time = time.time()
+                predicted = predict_interval(self.model, input_data, DEFAULT_COVERAGE,
+                                             forest=self._interval_forest())
+                predicted_kwh = float(predicted.kwh[0])
+                interval_kwh = (None if predicted.lower is None
+                                else (float(predicted.lower[0]), float(predicted.upper[0])))
+                elapsed_time = time.time() - start_time
+            except Exception as e:
+                raise PredictionError(f"Prediction error: {e}") from e
+            print(f"⏱️ Prediction time: {elapsed_time:.4f}s")
+
+        # IMPORTANT: Model outputs MONTHLY kWh already (not daily)!
+        # Training data used monthly consumption values (100-800 kWh/month range)
+        monthly_kwh = predicted_kwh  # NO *30 multiplication!
+
+        # 4. Convert to Baht (tiered tariff + Ft + service charge + VAT)
+        bill = self.tariff.describe(monthly_kwh)
+        prediction_baht = bill['total']
+        interval = self._price_interval(monthly_kwh, interval_kwh)
+
+        # 5. Result Structure - NO FABRICATED BREAKDOWN!
+        # Report says model outputs total only, not AC vs Appliances
+        result = {
+            'amount': round(prediction_baht, 2),
+            'kwh': round(monthly_kwh, 2),
+            'range': self._typical_error(monthly_kwh),
+            'interval': interval,
+            'details': features,
+            'bill': bill,
+            # Removed fabricated breakdown - model doesn't output this!
+            'model_metrics': self.metrics.as_result() if self.metrics is not None else None,
+            'warnings': warnings
+        }
+        self.result_cache.put(cache_key, copy.deepcopy(result))
+        return result
+
+    def _typical_error(self, kwh: float):
+        """
+        Typical error in THB: half the bill spread of ± the test MAE (None without metrics)
+
+        This, not the per-tree band, is the measured error: the trees usually
+        agree far more closely than the model matches held-out bills.
+        """
+        if self.metrics is None:
+            return None
+        mae = self.metrics.mae_kwh
+        bills = self.tariff.bill(np.array([max(kwh - mae, 0.0), kwh, kwh + mae]))
+        return round(float(bills.max() - bills.min()) / 2, 2)
+
+    def _price_interval(self, kwh: float, interval_kwh):
+        """
+        Interval in kWh and baht for one prediction
+
+        Forest models use their per-tree interval for this input - a
+        model-agreement band, narrower than the typical error (see
+        core/intervals.py and _typical_error); other models fall back to
+        ± the test MAE from the metrics sidecar (None without it).
+        """
+        if interval_kwh is not None:
+            low, high = interval_kwh
+            source, coverage = 'forest', DEFAULT_COVERAGE
+        elif self.metrics is not None:
+            mae = self.metrics.mae_kwh
+            low, high = max(kwh - mae, 0.0), kwh + mae
+            source, coverage = 'test_mae', None
+        else:
+            return None
+        # Bills are not monotone at schedule caps (type 1.1 -> 1.2), so bound by all three
+        bills = self.tariff.bill(np.array([low, kwh, high]))
+        return {
+            'kwh_low': round(low, 2),
+            'kwh_high': round(high, 2),
+            'amount_low': round(float(bills.min()), 2),
+            'amount_high': round(float(bills.max()), 2),
+            'coverage': coverage,
+            'source': source
+        }
+
+    def predict_batch(self, inputs, chunk_size: int = 50_000) -> dict:
+        """
+        Vectorized prediction for many households at once
+
+        Args:
+            inputs: Columnar inputs with 'household_size', 'has_ac', 'month' as
+                a DataFrame, dict of arrays, list of dicts, or (n, 3) NumPy array
+            chunk_size: Rows per model.predict call (bounds peak memory)
+
+        Returns:
+            dict: 'kwh' and 'amount' float arrays (NaN for invalid rows),
+                'kwh_low'/'kwh_high' and 'amount_low'/'amount_high' per-row
+                intervals (NaN when the model has no trees),
+                'valid' bool mask, 'extrapolated' bool mask (household_size > 6)
+        """
+        household_size, has_ac, month, valid = self._parse_batch(inputs)
+        features = self._batch_features(household_size, has_ac, month)
+
+        kwh = np.full(len(valid), np.nan)
+        low = np.full(len(valid), np.nan)
+        high = np.full(len(valid), np.nan)
+        if self.model is not None and valid.any():
+            rows = np.flatnonzero(valid)
+            if self.table is not None:
+                # Fancy-indexed table lookup covers every valid row in one go
+                cells = (household_size[rows] - 1, has_ac[rows], month[rows] - 1)
+                kwh[rows] = self.table.kwh[cells]
+                if self.table.has_intervals:
+                    low[rows] = self.table.lower[cells]
+                    high[rows] = self.table.upper[cells]
+            else:
+                forest = self._interval_forest()
+                for start in range(0, len(rows), chunk_size):
+                    chunk = rows[start:start + chunk_size]
+                    predicted = predict_interval(self.model, features.iloc[chunk], DEFAULT_COVERAGE, forest=forest)
+                    kwh[chunk] = predicted.kwh
+                    if predicted.lower is not None:
+                        low[chunk] = predicted.lower
+                        high[chunk] = predicted.upper
+
+        amount = self.tariff.bill(kwh)
+        # Bills are not monotone at schedule caps, so bound by low/point/high bills
+        bills = np.stack([self.tariff.bill(low), amount, self.tariff.bill(high)])
+        with_interval = ~np.isnan(low)
+        return {
+            'kwh': kwh,
+            'amount': amount,
+            'kwh_low': low,
+            'kwh_high': high,
+            'amount_low': np.where(with_interval, bills.min(axis=0), np.nan),
+            'amount_high': np.where(with_interval, bills.max(axis=0), np.nan),
+            'valid': valid & ~np.isnan(kwh),
+            'extrapolated': valid & (household_size > MAX_TRAINED_HOUSEHOLD_SIZE)
+        }
+
+    def _parse_batch(self, inputs):
+        """
+        Parse columnar inputs with the same rules as predict(), vectorized
+
+        Each value is parsed by parse_household_size / parse_has_ac /
+        parse_month, like predict(). A missing column makes its rows invalid
+        (predict() defaults a missing has_ac to 0 and a missing month to January).
+
+        Returns:
+            tuple: (household_size, has_ac, month) int arrays and a validity mask
+        """
+        import pandas as pd
+
+        if isinstance(inputs, pd.DataFrame):
+            columns = inputs
+        elif isinstance(inputs, np.ndarray):
+            columns = pd.DataFrame(np.atleast_2d(inputs), columns=['household_size', 'has_ac', 'month'])
+        else:
+            # dict of arrays or list of dicts
+            columns = pd.DataFrame(inputs)
+
+        missing = pd.Series(np.nan, index=columns.index)
+
+        # Numeric columns take the vectorized form of the shared parsers below;
+        # anything else (strings, mixed objects) goes through the parsers themselves
+
+        # household_size: numeric, truncated like int(), range 1-10 (parse_household_size)
+        size_raw = columns.get('household_size', missing)
+        if pd.api.types.is_numeric_dtype(size_raw):
+            size_values = np.trunc(size_raw.to_numpy(dtype=float))
+        else:
+            size_values = size_raw.map(parse_household_size).to_numpy(dtype=float, na_value=np.nan)
+        size_valid = np.isfinite(size_values) & (size_values >= 1) & (size_values <= 10)
+        household_size = np.where(size_valid, size_values, 1).astype(np.int64)
+
+        # has_ac: "มี" -> 1, number (string) > 0 -> 1, anything else -> 0 (parse_has_ac)
+        ac_raw = columns.get('has_ac', missing)
+        if pd.api.types.is_numeric_dtype(ac_raw):
+            has_ac = (ac_raw.to_numpy(dtype=float) > 0).astype(np.int64)
+        else:
+            has_ac = ac_raw.map(parse_has_ac).to_numpy(dtype=np.int64)
+
+        # month: whole numbers 1-12, digit strings or Thai month names (parse_month)
+        month_raw = columns.get('month', missing)
+        if pd.api.types.is_numeric_dtype(month_raw) and not pd.api.types.is_bool_dtype(month_raw):
+            # Vectorized form of parse_month's numeric rule
+            month_values = month_raw.to_numpy(dtype=float)
+        else:
+            month_values = month_raw.map(parse_month).to_numpy(dtype=float, na_value=np.nan)
+        month_valid = np.isfinite(month_values) & (month_values == np.trunc(month_values)) & (month_values >= 1) & (month_values <= 12)
+        month = np.where(month_valid, month_values, 1).astype(np.int64)
+
+        return household_size, has_ac, month, size_valid & month_valid
+
+    def _batch_features(self, household_size, has_ac, month):
+        """Derive model features (DataFrame) for parsed batch columns with array lookups"""
+        import pandas as pd
+
+        calendar = calendar_features(REFERENCE_YEAR, month)
+
+        return pd.DataFrame({
+            'household_size': household_size,
+            'has_ac': has_ac,
+            'season_hot': calendar['season_hot'].astype(np.int64),
+            'season_rainy': calendar['season_rainy'].astype(np.int64),
+            'weekend_ratio': calendar['weekend_ratio']
+        }, columns=FEATURE_COLUMNS)
+
+    def _parse_month(self, month_input):
+        return parse_month(month_input)
+
+    def _get_season(self, month):
+        # Shared with training scripts via core.calendar_features
+        return season_name(month)
+
+    def _calculate_weekend_ratio(self, year, month):
+        # Precomputed (year, month) lookup shared with training
+        try:
+            return float(calendar_weekend_ratio(year, month))
+        except ValueError:
+            return 0.28 # Fallback average from training data
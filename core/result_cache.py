@@ -0,0 +1,83 @@
+"""
+Roo-Lot Core - Prediction Result Cache
+
+Process-wide LRU cache in front of PredictionCore.predict. Keys are the
+canonicalized inputs plus the model version, so "3 people, AC, April" typed
+as 3/"มี"/"เมษายน" or 3.0/1/4 shares one entry, and a reloaded model never
+serves results from the previous one. Hit/miss/eviction counters show how
+much model work the cache saves.
+"""
+import threading
+from collections import OrderedDict
+
+# 10 household sizes x 2 AC values x 12 months x a few model versions
+DEFAULT_MAX_ENTRIES = 1024
+
+
+class ResultCache:
+    """Thread-safe bounded LRU with hit/miss/eviction counters"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """Return the cached value or None (counts a hit or a miss)"""
+        with self._lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value) -> None:
+        """Store a value, evicting the least recently used entries"""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """
+        Counters snapshot
+
+        Returns:
+            dict: 'hits', 'misses', 'evictions', 'size', 'max_entries', 'hit_rate'
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+
+_default_cache = ResultCache()
+
+
+def get_result_cache() -> ResultCache:
+    """Process-wide cache shared by every PredictionCore"""
+    return _default_cache
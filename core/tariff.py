@@ -0,0 +1,198 @@
+"""
+Roo-Lot Core - Tiered Tariff Engine
+
+Turns monthly kWh into a Thai residential bill:
+
+    energy  = progressive block charge (rate rises with consumption)
+    ft      = Ft adjustment per kWh
+    service = fixed monthly service charge
+    total   = (energy + ft + service) * (1 + VAT)
+
+A tariff is data (core/tariffs/*.json), not code. Each schedule is
+compiled once into cumulative block arrays - block start edges, rates and
+the charge accumulated up to each edge - so the energy charge of any kWh is
+
+    cumulative[i] + (kwh - edges[i]) * rates[i],  i = searchsorted(edges, kwh) - 1
+
+and a whole array of households is priced with a few vectorized NumPy
+calls. Schedules with a consumption cap (type 1.1: up to 150 kWh) are
+picked per value with one more searchsorted over the caps.
+"""
+import hashlib
+import json
+import os
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+TARIFFS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tariffs')
+DEFAULT_TARIFF_FILE = 'thai_residential.json'
+
+
+class TariffSchedule:
+    """
+    One progressive block schedule, compiled to cumulative arrays
+
+    Args:
+        name: Schedule label
+        blocks: (upper_kwh, rate) pairs in order; upper_kwh None for the open last block
+        service_charge: Fixed monthly charge (before VAT)
+        max_kwh: Largest monthly kWh this schedule applies to (None = no cap)
+    """
+
+    def __init__(self, name: str, blocks: Sequence[Tuple[Optional[float], float]],
+                 service_charge: float = 0.0, max_kwh: Optional[float] = None):
+        if not blocks:
+            raise ValueError(f"Tariff schedule {name!r} has no blocks")
+        uppers = [np.inf if upper is None else float(upper) for upper, _ in blocks]
+        if uppers[-1] != np.inf:
+            raise ValueError(f"Last block of {name!r} must be open-ended (upper_kwh null)")
+        if any(b <= a for a, b in zip([0.0] + uppers[:-1], uppers)):
+            raise ValueError(f"Block limits of {name!r} must be increasing and positive")
+
+        self.name = name
+        self.service_charge = float(service_charge)
+        self.max_kwh = np.inf if max_kwh is None else float(max_kwh)
+        self.rates = np.array([rate for _, rate in blocks], dtype=np.float64)
+        # Start of each block and the charge for all kWh below it
+        self.edges = np.array([0.0] + uppers[:-1])
+        widths = np.diff(self.edges)
+        self.cumulative = np.concatenate([[0.0], np.cumsum(widths * self.rates[:-1])])
+
+    def energy_charge(self, kwh) -> np.ndarray:
+        """Block charge for an array of kWh (negative values priced as 0)"""
+        kwh = np.maximum(np.asarray(kwh, dtype=np.float64), 0.0)
+        block = np.searchsorted(self.edges, kwh, side='right') - 1
+        block = np.clip(block, 0, len(self.edges) - 1)  # NaN sorts last
+        return self.cumulative[block] + (kwh - self.edges[block]) * self.rates[block]
+
+
+class Tariff:
+    """
+    Complete tariff: schedules, Ft and VAT
+
+    Args:
+        name: Tariff label
+        schedules: Schedules ordered by max_kwh (the last one uncapped)
+        ft_per_kwh: Ft adjustment (THB/kWh, may be negative)
+        vat_rate: VAT as a fraction (0.07)
+        effective_from: Date the rates apply from (informational)
+    """
+
+    def __init__(self, name: str, schedules: List[TariffSchedule], ft_per_kwh: float = 0.0,
+                 vat_rate: float = 0.0, effective_from: Optional[str] = None):
+        caps = [s.max_kwh for s in schedules]
+        if not schedules or caps[-1] != np.inf or caps != sorted(caps):
+            raise ValueError("Schedules must be ordered by max_kwh with an uncapped last schedule")
+        self.name = name
+        self.schedules = schedules
+        self.ft_per_kwh = float(ft_per_kwh)
+        self.vat_rate = float(vat_rate)
+        self.effective_from = effective_from
+        self._caps = np.array(caps)
+        self._service = np.array([s.service_charge for s in schedules])
+        self.fingerprint = self._fingerprint()
+
+    def _fingerprint(self) -> str:
+        """Hash of everything that shows up in a bill (result cache key part)"""
+        content = {
+            'name': self.name,
+            'ft_per_kwh': self.ft_per_kwh,
+            'vat_rate': self.vat_rate,
+            'schedules': [
+                {
+                    'name': s.name,
+                    'edges': s.edges.tolist(),
+                    'rates': s.rates.tolist(),
+                    'service_charge': s.service_charge,
+                    'max_kwh': s.max_kwh
+                }
+                for s in self.schedules
+            ]
+        }
+        # Infinity (uncapped schedule, open last block) is valid for json.dumps
+        return hashlib.sha256(json.dumps(content, sort_keys=True).encode()).hexdigest()[:16]
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Tariff':
+        schedules = [
+            TariffSchedule(s['name'], s['blocks'], s.get('service_charge', 0.0), s.get('max_kwh'))
+            for s in data['schedules']
+        ]
+        return cls(data['name'], schedules, data.get('ft_per_kwh', 0.0), data.get('vat_rate', 0.0),
+                   data.get('effective_from'))
+
+    @classmethod
+    def load(cls, path: str) -> 'Tariff':
+        """Tariff from a JSON file (see core/tariffs/thai_residential.json)"""
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+    def schedule_index(self, kwh) -> np.ndarray:
+        """Index of the schedule applying to each kWh value"""
+        kwh = np.asarray(kwh, dtype=np.float64)
+        return np.minimum(np.searchsorted(self._caps, kwh, side='left'), len(self._caps) - 1)
+
+    def breakdown(self, kwh) -> Dict[str, np.ndarray]:
+        """
+        Bill components for an array of monthly kWh
+
+        Returns:
+            dict: 'energy', 'ft', 'service', 'vat', 'total' (THB) and 'schedule'
+                (index into self.schedules), each shaped like kwh
+        """
+        kwh = np.asarray(kwh, dtype=np.float64)
+        schedule = self.schedule_index(kwh)
+        energy = np.empty(kwh.shape)
+        if len(self.schedules) == 1:
+            energy[...] = self.schedules[0].energy_charge(kwh)
+        else:
+            for i, compiled in enumerate(self.schedules):
+                rows = schedule == i
+                if rows.any():
+                    energy[rows] = compiled.energy_charge(kwh[rows])
+
+        ft = np.maximum(kwh, 0.0) * self.ft_per_kwh
+        service = self._service[schedule]
+        subtotal = energy + ft + service
+        vat = subtotal * self.vat_rate
+        return {
+            'energy': energy,
+            'ft': ft,
+            'service': service,
+            'vat': vat,
+            'total': subtotal + vat,
+            'schedule': schedule
+        }
+
+    def bill(self, kwh):
+        """Total bill in THB (float for a scalar, array for an array; NaN stays NaN)"""
+        total = self.breakdown(kwh)['total']
+        return float(total) if total.ndim == 0 else total
+
+    def describe(self, kwh: float) -> Dict:
+        """JSON-ready breakdown of one bill, rounded to satang"""
+        parts = self.breakdown(kwh)
+        total = float(parts['total'])
+        return {
+            'tariff': self.name,
+            'schedule': self.schedules[int(parts['schedule'])].name,
+            'energy': round(float(parts['energy']), 2),
+            'ft': round(float(parts['ft']), 2),
+            'service': round(float(parts['service']), 2),
+            'vat': round(float(parts['vat']), 2),
+            'total': round(total, 2),
+            'average_rate': round(total / kwh, 4) if kwh > 0 else None
+        }
+
+
+@lru_cache(maxsize=None)
+def load_tariff(name: str = DEFAULT_TARIFF_FILE) -> Tariff:
+    """Compiled tariff shipped in core/tariffs (loaded and compiled once per process)"""
+    path = name if os.path.isabs(name) else os.path.join(TARIFFS_PATH, name)
+    return Tariff.load(path)
+
+
+def default_tariff() -> Tariff:
+    return load_tariff(DEFAULT_TARIFF_FILE)
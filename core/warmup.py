@@ -0,0 +1,223 @@
+"""
+Roo-Lot Core - Startup Warm-Up and Readiness
+
+The first visitor after a deploy used to pay for the model unpickle (or
+artifact mmap), the first pandas/sklearn call and every cold cache inside
+their request. Warmup runs that work once per process on a background
+thread instead:
+
+1. load   - build the serving object (predictor / HotSwapPredictor)
+2. steps  - warm_predictor(): one dummy batch over the whole 240-cell
+            input grid (faults in the mapped model/table pages, imports and
+            first-call paths, the compiled forest used for intervals) and
+            the calendar feature lookup; callers add their own steps (CSS)
+3. ready  - only now does health() / the /health endpoint report ready
+
+A failed warm-up (no model yet, broken files) is retried with exponential
+backoff: retry() starts it again once the delay has passed, and both the app
+(via process_warmup) and every /health probe call it, so publishing a model
+later brings the process up without a restart.
+
+Readiness is served by a tiny stdlib HTTP server (serve_health) because the
+Streamlit health endpoint cannot be gated on application state.
+
+process_warmup() keeps one warm-up per process, so a launcher can start it
+before the server accepts connections and the app script adopts the same
+object on its first run (scripts/serve_app.py).
+"""
+import json
+import threading
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .calendar_features import calendar_features
+from .prediction_table import input_grid
+
+# Environment variable naming the readiness port (no server when unset)
+HEALTH_PORT_ENV = 'ROO_LOT_HEALTH_PORT'
+
+PENDING, WARMING, READY, FAILED = 'pending', 'warming', 'ready', 'failed'
+
+# Delay before retrying a failed warm-up: doubles per consecutive failure, capped
+RETRY_BACKOFF_S = 5.0
+MAX_RETRY_BACKOFF_S = 300.0
+
+_process_warmup = None
+_process_lock = threading.Lock()
+
+
+class WarmupStep(NamedTuple):
+    """Duration of one finished warm-up step"""
+    name: str
+    ms: float
+
+
+def warm_predictor(predictor) -> int:
+    """
+    Exercise a loaded predictor once: calendar lookup and a full-grid dummy batch
+
+    Nothing is written to the result cache, so hit/miss stats stay real.
+
+    Returns:
+        int: Rows predicted
+    """
+    from .predictor import REFERENCE_YEAR
+
+    calendar_features(REFERENCE_YEAR, np.arange(1, 13))
+    household_size, has_ac, month = input_grid()
+    result = predictor.predict_batch({'household_size': household_size, 'has_ac': has_ac, 'month': month})
+    if not result['valid'].any():
+        raise RuntimeError(predictor.load_error or "Model produced no predictions during warm-up")
+    return int(result['valid'].sum())
+
+
+class Warmup:
+    """
+    One-shot warm-up on a background thread with a readiness flag
+
+    Args:
+        load: Builds the serving object; available as `value` once ready
+        steps: (name, callable(value)) run in order after the load
+        backoff: First retry delay after a failure in seconds (doubles up to max_backoff)
+        max_backoff: Longest retry delay in seconds
+    """
+
+    def __init__(self, load: Callable, steps: Sequence[Tuple[str, Callable]] = (),
+                 backoff: float = RETRY_BACKOFF_S, max_backoff: float = MAX_RETRY_BACKOFF_S):
+        self._load = load
+        self._steps = list(steps)
+        self._backoff = backoff
+        self._max_backoff = max_backoff
+        self._done = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._retry_at = 0.0
+        self.value = None
+        self.status = PENDING
+        self.timings: List[WarmupStep] = []
+        self.error: Optional[str] = None
+        self.failures = 0
+
+    def start(self) -> 'Warmup':
+        """Run the warm-up on a daemon thread (idempotent)"""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self.run, name='warmup', daemon=True)
+                self._thread.start()
+        return self
+
+    def retry(self) -> bool:
+        """
+        Start a failed warm-up again once its backoff has passed (no-op otherwise)
+
+        Returns:
+            bool: True if a new attempt was started by this call
+        """
+        with self._lock:
+            if self.status != FAILED or time.monotonic() < self._retry_at:
+                return False
+            self.status = PENDING
+            self._done.clear()
+            self._thread = threading.Thread(target=self.run, name='warmup', daemon=True)
+            self._thread.start()
+        return True
+
+    def run(self) -> bool:
+        """Run the warm-up on the calling thread; True when ready"""
+        self.status = WARMING
+        self.timings = []
+        try:
+            value = self._timed('load', self._load)
+            for name, step in self._steps:
+                self._timed(name, step, value)
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            self.failures += 1
+            delay = min(self._backoff * 2 ** (self.failures - 1), self._max_backoff)
+            self._retry_at = time.monotonic() + delay
+            self.status = FAILED
+        else:
+            # Publish the value before flipping the status readers check
+            self.value = value
+            self.error = None
+            self.failures = 0
+            self.status = READY
+        self._done.set()
+        return self.status == READY
+
+    def _timed(self, name: str, func: Callable, *args):
+        start = time.perf_counter()
+        result = func(*args)
+        self.timings.append(WarmupStep(name, (time.perf_counter() - start) * 1000))
+        return result
+
+    @property
+    def ready(self) -> bool:
+        return self.status == READY
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until the warm-up finished (or timeout); True when ready"""
+        self._done.wait(timeout)
+        return self.ready
+
+    def health(self) -> Dict:
+        """JSON-ready readiness report"""
+        return {
+            'status': self.status,
+            'ready': self.ready,
+            'steps_ms': {step.name: round(step.ms, 1) for step in self.timings},
+            'error': self.error,
+            'failures': self.failures
+        }
+
+
+def serve_health(warmup: Warmup, port: int, host: str = '0.0.0.0'):
+    """
+    Serve warmup.health() on a daemon thread: 200 when ready, 503 before
+
+    Each probe also retries a failed warm-up whose backoff has passed.
+
+    Returns:
+        ThreadingHTTPServer: The running server (call shutdown() to stop it)
+    """
+    # Imported here: only processes with a health port pay for http.server
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class HealthHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            warmup.retry()
+            body = json.dumps(warmup.health()).encode()
+            self.send_response(200 if warmup.ready else 503)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # probes every few seconds would flood the log
+
+    server = ThreadingHTTPServer((host, port), HealthHandler)
+    threading.Thread(target=server.serve_forever, name='health', daemon=True).start()
+    return server
+
+
+def process_warmup(build: Callable[[], Warmup]) -> Warmup:
+    """
+    The process-wide warm-up, built and started by the first caller
+
+    Later calls retry it if it failed and its backoff has passed.
+
+    Args:
+        build: Returns a new (not yet started) Warmup; ignored once one exists
+
+    Returns:
+        Warmup: Started warm-up shared by every caller in this process
+    """
+    global _process_warmup
+    with _process_lock:
+        if _process_warmup is None:
+            _process_warmup = build().start()
+    _process_warmup.retry()
+    return _process_warmup
@@ -40,10 +40,10 @@ pipeline.fit(X, y)
 train_score = pipeline.score(X, y)
 print(f"✓ Model R² score: {train_score:.4f}")
 
-# Save model with compatibility settings
+# Save model with compatibility settings (uncompressed: the predictor memory-maps it)
 print("\nSaving model...")
 model_path = 'models/electricbills_predict.pkl'
-joblib.dump(pipeline, model_path, compress=3, protocol=4)
+joblib.dump(pipeline, model_path, protocol=4)
 print(f"✓ Saved to: {model_path}")
 
 # Update metadata
@@ -3,9 +3,15 @@
 """
 import pandas as pd
 import numpy as np
+import os
+import sys
 
-# Load data
-df = pd.read_csv('data/processed/train.csv')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from training.dataset_store import load_dataset
+
+# Load data (Parquet when available, CSV fallback)
+df = load_dataset('train')
 
 print("=" * 80)
 print("📊 DATASET STATISTICS FOR REPORT")
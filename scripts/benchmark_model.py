@@ -0,0 +1,62 @@
+"""
+Benchmark the serving model and append a run record
+Tracks size/latency of models/electricbills_predict.pkl between retrains:
+python scripts/benchmark_model.py [--update-metadata]
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.predictor import PredictionCore
+from training.model_selection import profile_model, write_model_metadata
+from training.run_log import RunRecorder, RUN_LOG_PATH
+
+METADATA_PATH = 'models/model_metadata.json'
+
+
+def benchmark_model(update_metadata=False):
+    print("=" * 70)
+    print("BENCHMARKING SERVING MODEL")
+    print("=" * 70)
+
+    # The sklearn pipeline itself, not the table/compiled artifacts
+    core = PredictionCore(use_prediction_table=False, use_compiled_model=False)
+    if core.model is None or core.using_fallback:
+        print("Error: models/electricbills_predict.pkl not found!")
+        return
+
+    # Every (household/AC/month) serving cell, tiled to 10k rows for the batch timing
+    X = core._feature_grid()
+    model_path = os.path.relpath(core.model_path, ROOT)
+    recorder = RunRecorder('benchmark_model.py', X, log_path=os.path.join(ROOT, RUN_LOG_PATH))
+    profile = profile_model(core.model, X)
+    record = recorder.finish(core.model, X, model_path=core.model_path, profile=profile,
+                             extra={'kind': 'benchmark'})
+
+    if update_metadata:
+        final = core.model.steps[-1][1] if hasattr(core.model, 'steps') else core.model
+        write_model_metadata(os.path.join(ROOT, METADATA_PATH), {
+            'described_at': datetime.now().isoformat(),
+            'model_path': model_path,
+            'model_sha256': record['model']['sha256'],
+            'model_type': type(final).__name__,
+            'n_features': X.shape[1],
+            'feature_names': list(X.columns),
+            'params': {k: v for k, v in final.get_params().items()
+                       if isinstance(v, (int, float, str, bool)) or v is None},
+            'model_bytes': record['model']['bytes'],
+            'latency': record['latency']
+        })
+        print(f"Saved metadata to {METADATA_PATH}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the serving model")
+    parser.add_argument('--update-metadata', action='store_true',
+                        help=f"Rewrite {METADATA_PATH} from the artifact itself")
+    args = parser.parse_args()
+    benchmark_model(args.update_metadata)
@@ -0,0 +1,34 @@
+"""
+Build the precomputed prediction table next to models/electricbills_predict.pkl
+Run after every retrain: python scripts/build_prediction_table.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.model_predictor import ElectricityPredictor
+from core.prediction_table import table_path_for
+
+
+def build_prediction_table():
+    print("=" * 70)
+    print("BUILDING PREDICTION TABLE (240 cells)")
+    print("=" * 70)
+
+    predictor = ElectricityPredictor(save_prediction_table=True)
+    if predictor.table is None:
+        print("Error: Model not found or table could not be built!")
+        return
+
+    print(f"Model:       {predictor.model_path}")
+    print(f"Fingerprint: {predictor.table.fingerprint[:16]}...")
+    print(f"kWh range:   {predictor.table.kwh.min():.2f} - {predictor.table.kwh.max():.2f}")
+    if predictor.table.has_intervals:
+        width = predictor.table.upper - predictor.table.lower
+        print(f"Intervals:   {predictor.table.coverage:.0%} of trees, width {width.min():.2f} - {width.max():.2f} kWh")
+    print(f"Saved table: {table_path_for(predictor.model_path)}")
+
+
+if __name__ == "__main__":
+    build_prediction_table()
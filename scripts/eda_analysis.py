@@ -2,14 +2,22 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from training.dataset_store import load_dataset, dataset_exists
 
 def exploratory_analysis(input_path, output_dir):
     """Comprehensive EDA"""
-    if not os.path.exists(input_path):
+    # Load through the dataset store (prefers the .parquet next to the .csv)
+    data_dir = os.path.dirname(input_path)
+    name = os.path.splitext(os.path.basename(input_path))[0]
+    if not dataset_exists(name, data_dir):
         print(f"Error: Processed data not found at {input_path}")
         return
 
-    df = pd.read_csv(input_path)
+    df = load_dataset(name, data_dir=data_dir)
     os.makedirs(output_dir, exist_ok=True)
     
     # 1. Basic Statistics
@@ -0,0 +1,31 @@
+"""
+Compile models/electricbills_predict.pkl to a NumPy-only inference artifact
+Run for a model trained before the export step existed:
+python scripts/export_compiled_model.py
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.predictor import PredictionCore
+from core.compiled_model import export_compiled_model
+
+
+def export_existing_model():
+    print("=" * 70)
+    print("EXPORTING COMPILED MODEL")
+    print("=" * 70)
+
+    # Load the sklearn pipeline itself, not a previously compiled artifact
+    core = PredictionCore(use_prediction_table=False, use_compiled_model=False)
+    if core.model is None or core.using_fallback:
+        print("Error: models/electricbills_predict.pkl not found!")
+        return
+
+    # Verify on the full serving grid (every household/AC/month cell)
+    export_compiled_model(core.model, core.model_path, core._feature_grid())
+
+
+if __name__ == "__main__":
+    export_existing_model()
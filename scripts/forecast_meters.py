@@ -0,0 +1,96 @@
+"""
+Next-month bill forecast for every meter of a long-format table
+python scripts/forecast_meters.py --data meters.csv [--output outputs/meter_forecasts.csv]
+Benchmark on synthetic meters built from the household sheet:
+python scripts/forecast_meters.py --synthetic 20000
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from training.meter_series import (
+    METER_COLUMN, BatchForecaster, add_meter_features, fit_pooled, forecast_summary,
+    sort_meters, training_examples
+)
+from training.next_month import RAW_COLUMNS
+
+SHEET_PATH = os.path.join(ROOT, "data", "real_v2", "electric_price - Sheet1.csv")
+OUTPUT_PATH = os.path.join(ROOT, "outputs", "meter_forecasts.csv")
+
+
+def synthetic_meters(n_meters, seed=42):
+    """n_meters copies of the household sheet, each with its own scale and noise"""
+    sheet = pd.read_csv(SHEET_PATH)
+    rng = np.random.default_rng(seed)
+    n_months = len(sheet)
+
+    scale = np.repeat(rng.uniform(0.5, 2.0, n_meters), n_months)
+    noise = rng.normal(1.0, 0.1, n_meters * n_months)
+    units = np.round(np.tile(sheet['amount(unit)'].to_numpy(), n_meters) * scale * noise)
+    rate = sheet['electric_price'].sum() / sheet['amount(unit)'].sum()
+
+    return pd.DataFrame({
+        METER_COLUMN: np.repeat(np.arange(n_meters), n_months),
+        'date': np.tile(sheet['date'].to_numpy(), n_meters),
+        'amount(unit)': units,
+        'electric_price': np.round(units * rate),
+        'people': np.tile(sheet['people'].to_numpy(), n_meters),
+        'note': np.tile(sheet['note'].to_numpy(), n_meters)
+    })
+
+
+def forecast_meters(long_df, output_path=OUTPUT_PATH):
+    print("=" * 70)
+    print("NEXT-MONTH FORECAST FOR ALL METERS")
+    print("=" * 70)
+    missing = set(RAW_COLUMNS + [METER_COLUMN]) - set(long_df.columns)
+    if missing:
+        print(f"Error: missing columns {sorted(missing)}")
+        return
+    print(f"Rows: {len(long_df):,}  Meters: {long_df[METER_COLUMN].nunique():,}")
+
+    start = time.perf_counter()
+    features_df = add_meter_features(sort_meters(long_df))
+    feature_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    state = fit_pooled(features_df)
+    fit_seconds = time.perf_counter() - start
+    print(f"Pooled Ridge on {state.n:,} examples "
+          f"({len(training_examples(features_df)):,} complete rows)")
+
+    start = time.perf_counter()
+    forecaster = BatchForecaster(state.to_model())
+    forecasts = forecaster.forecast(None, features_df=features_df)
+    forecast_seconds = time.perf_counter() - start
+
+    summary = forecast_summary(forecasts)
+    print(f"\nFeatures: {feature_seconds * 1000:8.1f} ms")
+    print(f"Fit:      {fit_seconds * 1000:8.1f} ms")
+    print(f"Forecast: {forecast_seconds * 1000:8.1f} ms  ({summary['scored']:,} meters scored, "
+          f"{summary['insufficient_history']:,} with too little history)")
+
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    forecasts.to_csv(output_path, index=False)
+    print(f"Saved forecasts to {output_path}")
+    return forecasts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Next-month bill forecast for every meter")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--data', help=f"Long-format CSV ({METER_COLUMN}, {', '.join(RAW_COLUMNS)})")
+    source.add_argument('--synthetic', type=int, metavar='N_METERS',
+                        help="Benchmark on N synthetic meters built from the household sheet")
+    parser.add_argument('--output', default=OUTPUT_PATH, help="Forecast CSV")
+    args = parser.parse_args()
+
+    data = pd.read_csv(args.data) if args.data else synthetic_meters(args.synthetic)
+    forecast_meters(data, args.output)
@@ -8,25 +8,24 @@ import matplotlib.pyplot as plt
 import joblib
 from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
 import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.calendar_features import features_from_dates
+from core.model_metrics import write_model_metrics, metrics_path_for
+from core.model_registry import registry_for, resolve_model_dir
+from core.tariff import default_tariff
 
 def create_seasonal_features(df):
-    """Add season features matching model_predictor.py logic"""
+    """Add season features via core.calendar_features (same lookup as serving)"""
     df['date'] = pd.to_datetime(df['date'])
-    df['month'] = df['date'].dt.month
-    
-    # Season features
-    df['season_hot'] = df['month'].isin([3, 4, 5, 6]).astype(int)
-    df['season_rainy'] = df['month'].isin([7, 8, 9, 10]).astype(int)
     
-    # Weekend ratio calculation
-    def calc_weekend_ratio(date):
-        year, month = date.year, date.month
-        days_in_month = pd.Period(f"{year}-{month}").days_in_month
-        month_dates = pd.date_range(f"{year}-{month}-01", periods=days_in_month, freq='D')
-        weekend_days = month_dates.dayofweek.isin([5, 6]).sum()
-        return weekend_days / days_in_month
-    
-    df['weekend_ratio'] = df['date'].apply(calc_weekend_ratio)
+    calendar = features_from_dates(df['date'])
+    df['month'] = calendar['month']
+    df['season_hot'] = calendar['season_hot'].astype(int)
+    df['season_rainy'] = calendar['season_rainy'].astype(int)
+    df['weekend_ratio'] = calendar['weekend_ratio']
     
     return df
 
@@ -70,8 +69,9 @@ def generate_plots():
     print("🎨 GENERATING CORRECT VISUALIZATION PLOTS")
     print("=" * 70)
     
-    # Load the current model
-    model_path = 'models/electricbills_predict.pkl'
+    # Load the current model (registry version if published, else models/)
+    model_dir, version = resolve_model_dir('models')
+    model_path = os.path.join(model_dir, 'electricbills_predict.pkl')
     print(f"\n📦 Loading model: {model_path}")
     model = joblib.load(model_path)
     
@@ -99,6 +99,13 @@ def generate_plots():
     print(f"MAE:       {mae:.2f} kWh")
     print(f"RMSE:      {rmse:.2f} kWh")
     print("=" * 70)
+
+    # Metrics sidecar bound to the evaluated model file (what the app displays)
+    write_model_metrics(model_path, r2, mae, rmse, source='generate_correct_plots.py', n_samples=len(X))
+    print(f"💾 Metrics saved: {metrics_path_for(model_path)}")
+    if version is not None:
+        # Rewrite the pointer so running apps reload with the new metrics
+        registry_for('models').activate(version)
     
     # Create output directory
     os.makedirs('outputs/model_viz', exist_ok=True)
@@ -200,8 +207,10 @@ def generate_plots():
     print("✅ ALL PLOTS GENERATED SUCCESSFULLY!")
     print("=" * 70)
     print(f"\nExpected metrics for documentation:")
-    print(f"  R² Score: {r2:.4f} (98.88% accuracy)")
-    print(f"  MAE: {mae:.2f} kWh (≈ {mae * 4.2:.0f} THB)")
+    print(f"  R² Score: {r2:.4f} ({r2 * 100:.2f}% accuracy)")
+    tariff = default_tariff()
+    mae_thb = np.mean(np.abs(tariff.bill(y_actual) - tariff.bill(y_pred)))
+    print(f"  MAE: {mae:.2f} kWh (≈ {mae_thb:.0f} THB on the tiered bill)")
     print(f"  RMSE: {rmse:.2f} kWh")
     print("=" * 70)
 
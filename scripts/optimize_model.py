@@ -8,8 +8,21 @@ from sklearn.linear_model import LinearRegression, Ridge, Lasso, ElasticNet
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
 import joblib
+import argparse
+import os
+import sys
+import time
 
-def optimize_model():
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.model_metrics import write_model_metrics
+from training.halving_search import halving_search, format_halving_report
+from training.model_selection import (
+    Candidate, profile_model, select_model, format_selection_table, SELECTION_CRITERIA
+)
+from training.run_log import RunRecorder
+
+def optimize_model(search='grid', r2_tolerance=0.0, prefer='size'):
     print("=" * 70)
     print("HYPERPARAMETER TUNING AND MODEL SELECTION")
     print("=" * 70)
@@ -54,41 +67,58 @@ def optimize_model():
     }
     
     results = []
-    best_overall_model = None
-    best_overall_score = -np.inf
-    best_model_name = ""
+    candidates = []
+    recorder = RunRecorder('optimize_model.py', X_train, y_train)
     
     print("\nStarting Grid Search...")
     print("-" * 70)
     
     for name, config in models.items():
         print(f"Tuning {name}...")
-        grid = GridSearchCV(config['model'], config['params'], cv=5, scoring='r2', n_jobs=-1)
-        grid.fit(X_train_scaled, y_train)
-        
-        best_model = grid.best_estimator_
+        start = time.perf_counter()
+        if search == 'halving' and name == 'RandomForest':
+            # Budgeted: candidates on growing subsamples, weak ones dropped early
+            result = halving_search(X_train_scaled, y_train, name, config['model'], config['params'],
+                                    n_jobs=None)
+            print(f"  {format_halving_report(result)}")
+            best_params = result.best.params
+            best_model = config['model'].set_params(**best_params).fit(X_train_scaled, y_train)
+        else:
+            grid = GridSearchCV(config['model'], config['params'], cv=5, scoring='r2', n_jobs=-1)
+            grid.fit(X_train_scaled, y_train)
+            best_params = grid.best_params_
+            best_model = grid.best_estimator_
+        search_seconds = time.perf_counter() - start
+        recorder.add_search_time(name, search_seconds)
+
         y_pred = best_model.predict(X_test_scaled)
         
         r2 = r2_score(y_test, y_pred)
         mae = mean_absolute_error(y_test, y_pred)
         rmse = np.sqrt(mean_squared_error(y_test, y_pred))
         
-        print(f"  Best Params: {grid.best_params_}")
-        print(f"  Test R2: {r2:.4f}")
+        print(f"  Best Params: {best_params}")
+        print(f"  Test R2: {r2:.4f} (search {search_seconds:.1f}s)")
         
+        candidate = Candidate(name, best_model, r2, profile_model(best_model, X_test_scaled))
+        candidates.append(candidate)
         results.append({
             'Model': name,
-            'Best_Params': str(grid.best_params_),
+            'Best_Params': str(best_params),
+            'Search_Seconds': search_seconds,
             'Test_R2': r2,
             'Test_MAE': mae,
-            'Test_RMSE': rmse
+            'Test_RMSE': rmse,
+            'Size_KB': candidate.profile.size_bytes / 1024,
+            'Predict_1_Row_ms': candidate.profile.single_p50_ms
         })
-        
-        if r2 > best_overall_score:
-            best_overall_score = r2
-            best_overall_model = best_model
-            best_model_name = name
-            
+
+    # Cheapest model within the R² tolerance (tolerance 0 = best test R²)
+    selected = select_model(candidates, r2_tolerance, prefer)
+    best_overall_model = selected.model
+    best_overall_score = selected.r2
+    best_model_name = selected.name
+
     # Save Results
     results_df = pd.DataFrame(results).sort_values('Test_R2', ascending=False)
     results_df.to_csv('outputs/model_comparison.csv', index=False)
@@ -97,12 +127,25 @@ def optimize_model():
     print("MODEL COMPARISON RESULTS")
     print("=" * 70)
     print(results_df.to_string(index=False))
+    print(f"\nServing cost (R2 tolerance {r2_tolerance}, prefer {prefer}):")
+    print(format_selection_table(candidates, selected))
     
     print(f"\nBest Model: {best_model_name} (R2={best_overall_score:.4f})")
     
     # Save Best Model
     joblib.dump(best_overall_model, 'models/model_optimized.pkl')
     print("Saved optimized model to models/model_optimized.pkl")
+
+    # Test metrics bound to this model file
+    best = results_df[results_df['Model'] == best_model_name].iloc[0]
+    write_model_metrics('models/model_optimized.pkl', best['Test_R2'], best['Test_MAE'], best['Test_RMSE'],
+                        source='optimize_model.py', n_samples=len(X_test_scaled))
+
+    # Append-only run record (dataset hash, search times, memory, size, latency)
+    recorder.finish(best_overall_model, X_test_scaled, model_path='models/model_optimized.pkl',
+                    metrics={'test_r2': best['Test_R2'], 'test_mae': best['Test_MAE'],
+                             'test_rmse': best['Test_RMSE']},
+                    profile=selected.profile, extra={'search': search, 'selected': best_model_name})
     
     # Visualize Comparison
     plt.figure(figsize=(10, 6))
@@ -120,4 +163,12 @@ def optimize_model():
     print("Saved comparison chart to outputs/model_comparison.png")
 
 if __name__ == "__main__":
-    optimize_model()
+    parser = argparse.ArgumentParser(description="Hyperparameter tuning and model selection")
+    parser.add_argument('--search', choices=['grid', 'halving'], default='grid',
+                        help="halving: successive halving for RandomForest instead of the full grid")
+    parser.add_argument('--r2-tolerance', type=float, default=0.0,
+                        help="Pick the cheapest model within this R2 of the best (0 = best R2)")
+    parser.add_argument('--prefer', choices=list(SELECTION_CRITERIA), default='size',
+                        help="Cost minimized within the R2 tolerance")
+    args = parser.parse_args()
+    optimize_model(args.search, args.r2_tolerance, args.prefer)
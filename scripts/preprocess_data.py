@@ -1,14 +1,33 @@
+import argparse
 import pandas as pd
 import numpy as np
 import os
+import sys
 from sklearn.impute import SimpleImputer
 from sklearn.preprocessing import StandardScaler
-from scipy import stats
 
-def preprocess_data():
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from training.outliers import (
+    ColumnQuantileSketch, filter_outliers, format_outlier_report, merge_reports, outlier_mask
+)
+
+DATA_PATH = 'data/electricity_data.csv'
+OUTPUT_PATH = 'data/electricity_data_processed.csv'
+REPORT_PATH = 'data/preprocessing_report.txt'
+
+OUTLIER_COLUMNS = ['ac_hours_per_day', 'num_appliances', 'room_area',
+                   'ac_temperature', 'electricity_bill']
+FEATURE_COLUMNS = ['ac_hours_per_day', 'num_appliances', 'room_area',
+                   'ac_temperature', 'num_people']
+TARGET_COLUMN = 'electricity_bill'
+MISSING_THRESHOLD = 0.5
+DEFAULT_CHUNK_SIZE = 250_000
+
+def preprocess_data(data_path=DATA_PATH):
     """Clean and preprocess electricity data"""
     # Load data
-    df = pd.read_csv('data/electricity_data.csv')
+    df = pd.read_csv(data_path)
     print("=" * 50)
     print("DATA DATA PREPROCESSING")
     print("=" * 50)
@@ -22,37 +41,14 @@ def preprocess_data():
     df[numeric_cols] = imputer.fit_transform(df[numeric_cols])
     
     # Strategy 2: Drop rows with too many missing values
-    threshold = 0.5
+    threshold = MISSING_THRESHOLD
     df = df.dropna(thresh=int(threshold * len(df.columns)))
     
-    # Outlier Removal (IQR)
+    # Outlier Removal (IQR): all quartiles at once, one combined mask
     print("\nOUTLIER REMOVAL (IQR Method)")
     print("-" * 30)
-    df_clean = df.copy()
-    outliers_removed = 0
-    
-    target_cols = ['ac_hours_per_day', 'num_appliances', 'room_area', 
-                   'ac_temperature', 'electricity_bill']
-    
-    for col in target_cols:
-        Q1 = df_clean[col].quantile(0.25)
-        Q3 = df_clean[col].quantile(0.75)
-        IQR = Q3 - Q1
-        
-        lower_bound = Q1 - 1.5 * IQR
-        upper_bound = Q3 + 1.5 * IQR
-        
-        before = len(df_clean)
-        df_clean = df_clean[(df_clean[col] >= lower_bound) & 
-                           (df_clean[col] <= upper_bound)]
-        after = len(df_clean)
-        removed = before - after
-        
-        if removed > 0:
-            print(f"  {col}: Removed {removed} outliers")
-            outliers_removed += removed
-            
-    print(f"\nTotal outliers removed: {outliers_removed}")
+    df_clean, outliers = filter_outliers(df, OUTLIER_COLUMNS)
+    print(format_outlier_report(outliers))
     print(f"Dataset size: {len(df)} -> {len(df_clean)}")
     
     # Feature Scaling
@@ -60,9 +56,8 @@ def preprocess_data():
     print("-" * 30)
     
     # Separate features and target
-    X = df_clean[['ac_hours_per_day', 'num_appliances', 'room_area', 
-                  'ac_temperature', 'num_people']]
-    y = df_clean['electricity_bill']
+    X = df_clean[FEATURE_COLUMNS]
+    y = df_clean[TARGET_COLUMN]
     
     scaler = StandardScaler()
     X_scaled = scaler.fit_transform(X)
@@ -76,35 +71,118 @@ def preprocess_data():
     # Save processed data
     # Combine scaled features with target
     df_processed = X_scaled_df.copy()
-    df_processed['electricity_bill'] = y.values
+    df_processed[TARGET_COLUMN] = y.values
     
-    df_processed.to_csv('data/electricity_data_processed.csv', index=False)
+    df_processed.to_csv(OUTPUT_PATH, index=False)
     
-    # Generate report
+    write_report(len(df), len(df.columns) - 1, len(df_processed), outliers)
+
+def write_report(n_original, n_features, n_processed, outliers, quantiles='exact'):
+    """Preprocessing report with the per-column outlier counts"""
+    removed = n_original - n_processed
     report = f"""DATA PREPROCESSING REPORT
 Generated: {pd.Timestamp.now()}
 
 ORIGINAL DATA:
-- Total samples: {len(df)}
-- Features: {len(df.columns) - 1}
+- Total samples: {n_original}
+- Features: {n_features}
 
 CLEANING STEPS:
 1. Missing values filled with median
-2. Outliers removed using IQR method (threshold=1.5)
+2. Outliers removed using IQR method (threshold=1.5, {quantiles} quartiles)
 3. Features scaled using StandardScaler
 
+OUTLIERS REMOVED (first failing column):
+"""
+    for column, count in outliers.removed.items():
+        report += f"- {column}: {count} (outside bounds: {outliers.flagged[column]})\n"
+    report += f"""
 PROCESSED DATA:
-- Total samples: {len(df_processed)}
-- Samples removed: {len(df) - len(df_processed)} ({(len(df) - len(df_processed))/len(df)*100:.2f}%)
+- Total samples: {n_processed}
+- Samples removed: {removed} ({removed / n_original * 100 if n_original else 0:.2f}%)
 
 FILES CREATED:
-- data/electricity_data_processed.csv
+- {OUTPUT_PATH}
 """
-    with open('data/preprocessing_report.txt', 'w') as f:
+    with open(REPORT_PATH, 'w') as f:
         f.write(report)
         
     print("\nPREPROCESSING COMPLETE")
-    print("Report saved to data/preprocessing_report.txt")
+    print(f"Report saved to {REPORT_PATH}")
+
+def preprocess_data_streaming(data_path=DATA_PATH, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Same steps for inputs too large to load or sort, in three passes over the CSV:
+    1. quantile sketches -> medians (imputation) and IQR bounds
+    2. impute + filter each chunk -> scaler statistics (partial_fit)
+    3. impute + filter + scale each chunk -> append to the output
+    """
+    print("=" * 50)
+    print(f"DATA PREPROCESSING (streaming, {chunk_size:,} rows per chunk)")
+    print("=" * 50)
+
+    def chunks():
+        return pd.read_csv(data_path, chunksize=chunk_size)
+
+    # Pass 1: every numeric column sketched once (median + quartiles)
+    sketch = None
+    n_original = 0
+    for chunk in chunks():
+        if sketch is None:
+            numeric_cols = list(chunk.select_dtypes(include=[np.number]).columns)
+            n_columns = len(chunk.columns)
+            sketch = ColumnQuantileSketch(numeric_cols)
+        sketch.update(chunk)
+        n_original += len(chunk)
+    if sketch is None:
+        print(f"Error: {data_path} is empty")
+        return
+    medians = sketch.quantiles([0.5]).iloc[0]
+    bounds = sketch.iqr_bounds(OUTLIER_COLUMNS)
+
+    def clean(chunk):
+        chunk = chunk.fillna(medians)
+        chunk = chunk.dropna(thresh=int(MISSING_THRESHOLD * n_columns))
+        keep, report = outlier_mask(chunk, bounds)
+        return chunk[keep], report
+
+    # Pass 2: scaler statistics on the kept rows
+    scaler = StandardScaler()
+    reports = []
+    for chunk in chunks():
+        kept, report = clean(chunk)
+        reports.append(report)
+        if len(kept):
+            scaler.partial_fit(kept[FEATURE_COLUMNS])
+    outliers = merge_reports(reports)
+
+    print("\nOUTLIER REMOVAL (IQR Method, approximate quartiles)")
+    print("-" * 30)
+    print(format_outlier_report(outliers))
+    print(f"Dataset size: {outliers.rows_in} -> {outliers.rows_out}")
+
+    # Pass 3: scale and write
+    tmp_path = f'{OUTPUT_PATH}.tmp'
+    header = True
+    for chunk in chunks():
+        kept, _ = clean(chunk)
+        processed = pd.DataFrame(scaler.transform(kept[FEATURE_COLUMNS]), columns=FEATURE_COLUMNS)
+        processed[TARGET_COLUMN] = kept[TARGET_COLUMN].to_numpy()
+        processed.to_csv(tmp_path, mode='w' if header else 'a', header=header, index=False)
+        header = False
+    os.replace(tmp_path, OUTPUT_PATH)
+
+    write_report(n_original, n_columns - 1, outliers.rows_out, outliers, quantiles='approximate (sketch)')
 
 if __name__ == "__main__":
-    preprocess_data()
+    parser = argparse.ArgumentParser(description="Clean and preprocess electricity data")
+    parser.add_argument('--data', default=DATA_PATH, help="Input CSV")
+    parser.add_argument('--approx', action='store_true',
+                        help="Stream the input in chunks with sketch-based quartiles (no full sort)")
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE,
+                        help="Rows per chunk with --approx")
+    args = parser.parse_args()
+    if args.approx:
+        preprocess_data_streaming(args.data, args.chunk_size)
+    else:
+        preprocess_data(args.data)
@@ -1,22 +1,31 @@
-
+"""
+Next-month bill model on the real household sheet
+Full retrain with report:      python scripts/retrain_v2.py [--data sheet.csv]
+Monthly append (incremental):  python scripts/retrain_v2.py --append new_rows.csv
+"""
+import argparse
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
 from sklearn.linear_model import Ridge, ElasticNet
 from sklearn.metrics import mean_absolute_error, mean_squared_error
-import joblib
 import os
 import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
 
-# Ensure output directories exist
-os.makedirs("models", exist_ok=True)
-os.makedirs("outputs", exist_ok=True)
-os.makedirs("data/real_v2", exist_ok=True)
+from training.next_month import (
+    IncrementalRidge, RAW_COLUMNS, add_features, clean_rows, complete_examples,
+    load_published, publish
+)
 
-# File paths
-DATA_PATH = r"C:\Users\com\Documents\AIE322\RooLord\roo-lot\data\electric_price - Sheet1.csv"
-MODEL_PATH = "models/model_v2_next_month.pkl"
-REPORT_PATH = "outputs/real_data_v2_report.md"
+# File paths (relative to the repo root)
+DATA_PATH = os.path.join(ROOT, "data", "real_v2", "electric_price - Sheet1.csv")
+MODEL_PATH = os.path.join(ROOT, "models", "model_v2_next_month.pkl")
+REPORT_PATH = os.path.join(ROOT, "outputs", "real_data_v2_report.md")
+PLOT_PATH = os.path.join(ROOT, "outputs", "prediction_plot.png")
+RIDGE_ALPHA = 1.0
 
 def load_data(filepath):
     print(f"Loading data from {filepath}...")
@@ -29,20 +38,9 @@ def clean_data(df):
     # Fill missing people values based on note
     # If note contains "ปิดเทอม" -> fill with 0
     # If note is empty but people is NaN -> fill with 2
-    
-    # Create mask for "ปิดเทอม" in note
-    # Handle NaN in note first
-    df['note'] = df['note'].fillna('')
-    
-    mask_break = df['note'].str.contains("ปิดเทอม", na=False)
-    
-    # Apply logic
-    df.loc[mask_break & df['people'].isna(), 'people'] = 0
-    df['people'] = df['people'].fillna(2)
-    
-    # Convert date to datetime
-    # The format in CSV preview was 11/1/2023 (M/D/Y likely)
-    df['date'] = pd.to_datetime(df['date'], format='%m/%d/%Y', errors='coerce')
+    # Dates are M/D/Y (11/1/2023)
+    # (shared with the incremental path in training/next_month.py)
+    df = clean_rows(df)
     
     # Check for any failures in date conversion
     if df['date'].isna().any():
@@ -54,29 +52,12 @@ def clean_data(df):
 def feature_engineering(df):
     print("Feature Engineering...")
     
-    # Create Target: Next Month Bill (shift -1)
-    df['target_next_bill'] = df['electric_price'].shift(-1)
-    
-    # Current Bill & Units
-    df['current_bill'] = df['electric_price']
-    df['current_unit'] = df['amount(unit)']
-    
-    # Lag Features
-    df['lag1_unit'] = df['amount(unit)'].shift(1)
-    df['lag2_unit'] = df['amount(unit)'].shift(2)
-    
-    # Is Break
-    df['is_break'] = df['note'].str.contains("ปิดเทอม", na=False).astype(int)
-    
-    # Month
-    df['month'] = df['date'].dt.month
-    
-    # Ensure people is numeric
-    df['people'] = pd.to_numeric(df['people'])
+    # Target (next month bill), current bill/units, lag1/lag2 units, break flag, month
+    df = add_features(df)
     
     # Drop rows with NaN (due to lags and target shift)
     # Target shift creates NaN at the end. Lag shift creates NaN at the start.
-    df_clean = df.dropna().reset_index(drop=True)
+    df_clean = complete_examples(df)
     
     return df_clean
 
@@ -136,7 +117,7 @@ def train_model(df, features):
     print(f"Train size: {len(X_train)}, Test size: {len(X_test)}")
     
     # Model: Ridge Regression
-    model = Ridge(alpha=1.0)
+    model = Ridge(alpha=RIDGE_ALPHA)
     model.fit(X_train, y_train)
     
     # Preds
@@ -191,16 +172,20 @@ def generate_report(model, features, mae, rmse, df_test, y_pred):
     
     return report_content
 
-def main():
+def main(data_path=DATA_PATH):
+    os.makedirs(os.path.dirname(MODEL_PATH), exist_ok=True)
+    os.makedirs(os.path.dirname(REPORT_PATH), exist_ok=True)
+
     # 1. Load
     try:
-        df = load_data(DATA_PATH)
+        df = load_data(data_path)
     except FileNotFoundError:
-        print(f"Error: File not found at {DATA_PATH}")
+        print(f"Error: File not found at {data_path}")
         return
 
     # 2. Clean
     df = clean_data(df)
+    cleaned = df.copy()
     
     # 3. Feature Engineering
     df = feature_engineering(df)
@@ -214,13 +199,14 @@ def main():
     model, X_test, y_test, y_pred_test, mae, rmse = train_model(df, features)
     
     # 6. Save Model
-    joblib.dump(model, MODEL_PATH)
-    print(f"Model saved to {MODEL_PATH}")
+    # Evaluated on the 80/20 split above; the published model is refit on every
+    # month so that --append can continue from its sufficient statistics
+    state = IncrementalRidge.from_history(cleaned, features, alpha=RIDGE_ALPHA, examples=df)
+    pointer = publish(state, MODEL_PATH, info={'test_mae': float(mae), 'test_rmse': float(rmse)})
+    print(f"Model saved to {MODEL_PATH} (version {pointer['version']}, {state.n} months)")
     
     # 7. Generate Report
-    # Join X_test with original date if possible, or just use indices
-    # We want to see dates in the report.
-    # X_test preserves the index from df.
+    # X_test preserves the index from df, so the dates line up
     test_dates = df.loc[X_test.index, 'date']
     
     report = f"""# Real Data V2 Retraining Report
@@ -251,6 +237,8 @@ def main():
     print(f"Report saved to {REPORT_PATH}")
     
     # Plotting
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(10, 6))
     plt.plot(test_dates, y_test, label='Actual Next Month Bill', marker='o')
     plt.plot(test_dates, y_pred_test, label='Predicted Next Month Bill', marker='x', linestyle='--')
@@ -259,8 +247,48 @@ def main():
     plt.ylabel('Bill Amount')
     plt.legend()
     plt.grid(True)
-    plt.savefig('outputs/prediction_plot.png')
-    print("Plot saved to outputs/prediction_plot.png")
+    plt.savefig(PLOT_PATH)
+    print(f"Plot saved to {PLOT_PATH}")
+
+def append_months(new_rows_path, data_path=DATA_PATH):
+    """Append new months to the sheet and update the published model from its tail"""
+    start = time.perf_counter()
+    state = load_published(MODEL_PATH)
+    if state is None:
+        print(f"Error: No published model at {MODEL_PATH} - run a full retrain first")
+        return
+
+    new_rows = pd.read_csv(new_rows_path)
+    missing = set(RAW_COLUMNS) - set(new_rows.columns)
+    if missing:
+        print(f"Error: {new_rows_path} is missing columns {sorted(missing)}")
+        return
+
+    try:
+        result = state.append(new_rows)
+    except ValueError as e:
+        print(f"Error: {e}")
+        return
+
+    # Sheet first: a failed publish leaves the old model with a longer sheet,
+    # which a full retrain reconciles; the reverse would lose the months
+    new_rows[RAW_COLUMNS].to_csv(data_path, mode='a', header=False, index=False)
+    pointer = publish(state, MODEL_PATH)
+
+    print(f"Appended {result['rows_added']} month(s) to {data_path}")
+    for error in result['errors']:
+        print(f"  One-step-ahead error of the previous model: {error:.2f}")
+    print(f"Model updated on {result['examples_added']} new example(s) -> version {pointer['version']} "
+          f"({state.n} months) in {(time.perf_counter() - start) * 1000:.1f} ms "
+          f"(update {result['seconds'] * 1000:.1f} ms)")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Next-month bill model on the real household sheet")
+    parser.add_argument('--data', default=DATA_PATH, help="Monthly bill sheet (CSV)")
+    parser.add_argument('--append', metavar='NEW_ROWS_CSV',
+                        help="Append these months and update the published model incrementally")
+    args = parser.parse_args()
+    if args.append:
+        append_months(args.append, args.data)
+    else:
+        main(args.data)
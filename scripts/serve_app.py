@@ -0,0 +1,47 @@
+"""
+Start the Streamlit app with the model already warming
+
+Streamlit only runs app_chatbot.py when the first browser connects, so a
+warm-up started by the script would make that visitor wait and leave the
+readiness port closed until then. This launcher starts the warm-up (and the
+readiness endpoint, see ROO_LOT_HEALTH_PORT) in the server process first;
+the app adopts it on its first run.
+
+    python scripts/serve_app.py [streamlit options, e.g. --server.port 8501]
+    python scripts/serve_app.py --check     # warm up once, print the report, exit 0/1
+
+Both build the compiled model artifact (and --check the prediction table)
+when missing, so a plain deploy still shares one mapped copy of the model
+between workers.
+"""
+import json
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.app_warmup import build_app_warmup, start_app_warmup
+
+
+def check() -> int:
+    """Warm up on this thread (writing the compiled model and prediction table artifacts) and report"""
+    warmup = build_app_warmup(save_prediction_table=True)
+    warmup.run()
+    print(json.dumps(warmup.health()))
+    return 0 if warmup.ready else 1
+
+
+def serve(streamlit_args) -> int:
+    from streamlit.web import cli as stcli
+
+    os.chdir(ROOT)
+    start_app_warmup()
+    sys.argv = ['streamlit', 'run', 'app_chatbot.py'] + list(streamlit_args)
+    return stcli.main()
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ['--check']:
+        sys.exit(check())
+    sys.exit(serve(sys.argv[1:]))
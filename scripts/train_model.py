@@ -6,10 +6,17 @@ from sklearn.linear_model import Ridge, Lasso, LinearRegression
 from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
 import joblib
 import os
+import sys
 import matplotlib.pyplot as plt
 import seaborn as sns
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.model_metrics import write_model_metrics
+from core.model_registry import registry_for
+from training.run_log import RunRecorder
+
 # Configure randomness
 np.random.seed(42)
 
@@ -120,6 +127,7 @@ def train_model():
     # 3. Train/Test Split
     X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
     print(f"Train size: {len(X_train)}, Test size: {len(X_test)}")
+    recorder = RunRecorder('train_model.py', X_train, y_train)
 
     # 4. Model Selection & Hyperparameter Tuning
     print("\nStarting GridSearchCV (36 combinations for RF)...")
@@ -148,7 +156,8 @@ def train_model():
             n_jobs=-1,
             verbose=1
         )
-        grid.fit(X_train, y_train)
+        with recorder.time_fit(name):
+            grid.fit(X_train, y_train)
         
         print(f"\n{name} Results:")
         print(f"  Best Params: {grid.best_params_}")
@@ -176,8 +185,23 @@ def train_model():
     
     # Save Model with explicit protocol for Streamlit Cloud compatibility
     # Protocol 4 is compatible with Python 3.4+ including Python 3.11
-    joblib.dump(best_model, 'models/electricbills_predict.pkl', compress=3, protocol=4)
-    print("\nModel saved to models/electricbills_predict.pkl (protocol=4, Python 3.11 compatible)")
+    # Uncompressed, so the predictor can memory-map the tree arrays (mmap_mode='r')
+    registry = registry_for('models')
+    staging = registry.stage()
+    model_path = os.path.join(staging, 'electricbills_predict.pkl')
+    joblib.dump(best_model, model_path, protocol=4)
+
+    # Test metrics bound to this model file (loaded by the predictor, shown in the UI)
+    write_model_metrics(model_path, r2, mae, rmse, source='train_model.py', n_samples=len(X_test))
+
+    # One registry version, current pointer swapped atomically (legacy copy in models/)
+    version = registry.publish(staging, source='train_model.py', mirror_to='models')
+    model_path = os.path.join(registry.version_path(version), 'electricbills_predict.pkl')
+    print(f"\nModel published: version {version} (protocol=4, Python 3.11 compatible)")
+
+    # Append-only run record (dataset hash, fit times, memory, size, latency)
+    recorder.finish(best_model, X_test, model_path=model_path,
+                    metrics={'test_r2': r2, 'test_mae': mae, 'test_rmse': rmse})
     
     # Save Metadata
     metadata = {
@@ -9,31 +9,42 @@ import numpy as np
 from sklearn.model_selection import train_test_split, GridSearchCV
 from sklearn.preprocessing import StandardScaler
 from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression, Ridge
 from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
 from sklearn.pipeline import Pipeline
 import joblib
+import argparse
 import os
+import sys
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.calendar_features import features_from_dates
+from core.compiled_model import export_compiled_model
+from core.model_metrics import write_model_metrics
+from core.model_registry import registry_for
+from core.tariff import default_tariff
+from training.model_selection import (
+    Candidate, profile_model, select_model, selection_metadata, format_selection_table,
+    write_model_metadata, SELECTION_CRITERIA
+)
+from training.run_log import RunRecorder
+
+MODELS_PATH = 'models'
+MODEL_FILENAME = 'electricbills_predict.pkl'
+METADATA_PATH = 'models/model_metadata.json'
+
 def create_seasonal_features(df):
-    """Add season features matching model_predictor.py logic"""
+    """Add season features via core.calendar_features (same lookup as serving)"""
     df['date'] = pd.to_datetime(df['date'])
-    df['month'] = df['date'].dt.month
     
-    # Season features (match _get_season() in model_predictor.py)
     # hot: Mar-Jun (3,4,5,6), rainy: Jul-Oct (7,8,9,10), cool: Nov-Feb (11,12,1,2)
-    df['season_hot'] = df['month'].isin([3, 4, 5, 6]).astype(int)
-    df['season_rainy'] = df['month'].isin([7, 8, 9, 10]).astype(int)
-    
-    # Weekend ratio calculation
-    def calc_weekend_ratio(date):
-        year, month = date.year, date.month
-        days_in_month = pd.Period(f"{year}-{month}").days_in_month
-        month_dates = pd.date_range(f"{year}-{month}-01", periods=days_in_month, freq='D')
-        weekend_days = month_dates.dayofweek.isin([5, 6]).sum()
-        return weekend_days / days_in_month
-    
-    df['weekend_ratio'] = df['date'].apply(calc_weekend_ratio)
+    calendar = features_from_dates(df['date'])
+    df['month'] = calendar['month']
+    df['season_hot'] = calendar['season_hot'].astype(int)
+    df['season_rainy'] = calendar['season_rainy'].astype(int)
+    df['weekend_ratio'] = calendar['weekend_ratio']
     
     return df
 
@@ -73,7 +84,7 @@ def generate_synthetic_data(n_samples=1000):
     
     return df
 
-def train_model():
+def train_model(r2_tolerance=0.0, prefer='size'):
     print("=" * 70)
     print("ROO-LOT: MODEL TRAINING (KAGGLE-ALIGNED FEATURES)")
     print("=" * 70)
@@ -114,6 +125,7 @@ def train_model():
         X, y, test_size=0.2, random_state=42
     )
     print(f"\n🔀 Split: {len(X_train):,} train / {len(X_test):,} test")
+    recorder = RunRecorder('train_model_kaggle.py', X_train, y_train)
     
     # Build Pipeline (Scaling + Model)
     pipeline = Pipeline([
@@ -132,10 +144,27 @@ def train_model():
     grid_search = GridSearchCV(
         pipeline, param_grid, cv=5, scoring='r2', n_jobs=-1, verbose=1
     )
-    grid_search.fit(X_train, y_train)
+    with recorder.time_fit('Random Forest'):
+        grid_search.fit(X_train, y_train)
     
-    best_model = grid_search.best_estimator_
     print(f"\n✅ Best Params: {grid_search.best_params_}")
+
+    # Linear baselines: the synthetic target is linear in the features
+    fitted = {'Random Forest': grid_search.best_estimator_}
+    for name, regressor in [('Linear Regression', LinearRegression()), ('Ridge', Ridge())]:
+        with recorder.time_fit(name):
+            fitted[name] = Pipeline([('scaler', StandardScaler()), ('model', regressor)]).fit(X_train, y_train)
+
+    # Serving cost of each candidate; pick the cheapest within the R² tolerance
+    candidates = [
+        Candidate(name, model, r2_score(y_test, model.predict(X_test)), profile_model(model, X_test))
+        for name, model in fitted.items()
+    ]
+    selected = select_model(candidates, r2_tolerance, prefer)
+    print(f"\n⚖️ Serving cost (R² tolerance {r2_tolerance}, prefer {prefer}):")
+    print(format_selection_table(candidates, selected))
+    best_model = selected.model
+    print(f"\n🏆 Selected: {selected.name}")
     
     # Evaluate
     y_train_pred = best_model.predict(X_train)
@@ -154,22 +183,62 @@ def train_model():
     print(f"Test MAE:  {test_mae:.2f} kWh")
     print(f"Test RMSE: {test_rmse:.2f} kWh")
     
-    # Feature Importance
-    rf_model = best_model.named_steps['model']
+    # Feature Importance (coefficients for linear models)
+    final_model = best_model.named_steps['model']
+    importance = getattr(final_model, 'feature_importances_', None)
     feature_importance = pd.DataFrame({
         'feature': feature_cols,
-        'importance': rf_model.feature_importances_
+        'importance': importance if importance is not None else final_model.coef_
     }).sort_values('importance', ascending=False)
     
     print("\n🔬 Feature Importance:")
     print(feature_importance.to_string(index=False))
     
-    # Save model
-    os.makedirs('models', exist_ok=True)
-    model_path = 'models/electricbills_predict.pkl'
+    # Save model: stage every artifact, then publish them as one registry version
+    # (atomic pointer swap; running apps hot-swap to it)
+    registry = registry_for(MODELS_PATH)
+    staging = registry.stage()
+    model_path = os.path.join(staging, MODEL_FILENAME)
     joblib.dump(best_model, model_path)
-    
-    print(f"\n💾 Model saved: {model_path}")
+
+    # NumPy-only artifact for serving (verified against the pipeline)
+    export_compiled_model(best_model, model_path, X_test)
+
+    # Test metrics bound to this model file (loaded by the predictor, shown in the UI)
+    write_model_metrics(model_path, test_r2, test_mae, test_rmse,
+                        source='train_model_kaggle.py', n_samples=len(X_test))
+
+    version = registry.publish(staging, source='train_model_kaggle.py',
+                               info={'model_name': selected.name, 'test_r2': float(test_r2)},
+                               mirror_to=MODELS_PATH)
+    model_path = os.path.join(registry.version_path(version), MODEL_FILENAME)
+    print(f"\n💾 Model published: version {version} ({model_path})")
+
+    write_model_metadata(METADATA_PATH, {
+        'training_date': datetime.now().isoformat(),
+        'script': 'train_model_kaggle.py',
+        'model_type': type(final_model).__name__,
+        'model_name': selected.name,
+        'n_features': len(feature_cols),
+        'feature_names': feature_cols,
+        'n_train_samples': len(X_train),
+        'n_test_samples': len(X_test),
+        'params': {k: v for k, v in final_model.get_params().items() if np.isscalar(v) or v is None},
+        'metrics': {
+            'train_r2': train_r2,
+            'test_r2': test_r2,
+            'test_mae': test_mae,
+            'test_rmse': test_rmse
+        },
+        'selection': selection_metadata(candidates, selected, r2_tolerance, prefer)
+    })
+    print(f"💾 Metadata saved: {METADATA_PATH}")
+
+    # Append-only run record (dataset hash, fit times, memory, size, latency)
+    recorder.finish(best_model, X_test, model_path=model_path,
+                    metrics={'train_r2': train_r2, 'test_r2': test_r2,
+                             'test_mae': test_mae, 'test_rmse': test_rmse},
+                    profile=selected.profile, extra={'selected': selected.name})
     
     # Sanity check
     print("\n" + "=" * 70)
@@ -186,7 +255,7 @@ def train_model():
     all_valid = True
     for i, case in enumerate(test_cases, 1):
         pred_kwh = best_model.predict(pd.DataFrame([case]))[0]
-        pred_thb = pred_kwh * 4.2
+        pred_thb = default_tariff().bill(pred_kwh)
         
         print(f"\nCase {i}:")
         print(f"  Input: {case}")
@@ -209,4 +278,10 @@ def train_model():
     return best_model
 
 if __name__ == "__main__":
-    train_model()
+    parser = argparse.ArgumentParser(description="Train the Kaggle-aligned model")
+    parser.add_argument('--r2-tolerance', type=float, default=0.0,
+                        help="Pick the cheapest model within this R² of the best (0 = best R²)")
+    parser.add_argument('--prefer', choices=list(SELECTION_CRITERIA), default='size',
+                        help="Cost minimized within the R² tolerance")
+    args = parser.parse_args()
+    train_model(args.r2_tolerance, args.prefer)
@@ -2,31 +2,54 @@ import pandas as pd
 import numpy as np
 import joblib
 import os
+import sys
 import matplotlib.pyplot as plt
 import seaborn as sns
 
-from sklearn.model_selection import train_test_split, cross_val_score, GridSearchCV
+import argparse
+from datetime import datetime
+
+from sklearn.base import clone
 from sklearn.preprocessing import StandardScaler
 from sklearn.pipeline import Pipeline
-from sklearn.linear_model import LinearRegression, Ridge, Lasso
-from sklearn.ensemble import RandomForestRegressor
 from sklearn.metrics import r2_score, mean_absolute_error, mean_squared_error
 
-def train_and_compare_models():
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.compiled_model import export_compiled_model
+from core.model_metrics import write_model_metrics
+from core.model_registry import registry_for
+from training.dataset_store import load_dataset, dataset_exists
+from training.model_search import run_search, best_per_family, default_families
+from training.halving_search import halving_search, format_halving_report
+from training.model_selection import (
+    Candidate, profile_model, select_model, selection_metadata, format_selection_table,
+    write_model_metadata, SELECTION_CRITERIA
+)
+from training.run_log import RunRecorder
+
+# Finished CV fits; a rerun on the same data resumes from here
+CHECKPOINT_PATH = 'models/search_checkpoint.jsonl'
+METADATA_PATH = 'models/model_metadata.json'
+MODELS_PATH = 'models'
+MODEL_FILENAME = 'electricbills_predict.pkl'
+
+# Families searched by successive halving with --search halving
+HALVING_FAMILIES = ['Random Forest']
+
+def train_and_compare_models(n_jobs=None, checkpoint_path=CHECKPOINT_PATH, search='grid',
+                             r2_tolerance=0.0, prefer='size'):
     print("=" * 70)
     print("PHASE 2: MODEL TRAINING & SELECTION")
     print("=" * 70)
 
-    # 1. Load Data
-    train_path = 'data/processed/train.csv'
-    test_path = 'data/processed/test.csv'
-    
-    if not os.path.exists(train_path):
+    # 1. Load Data (Parquet when available, CSV fallback)
+    if not dataset_exists('train'):
         print("Error: Train data not found!")
         return
 
-    train_df = pd.read_csv(train_path)
-    test_df = pd.read_csv(test_path)
+    train_df = load_dataset('train')
+    test_df = load_dataset('test')
     
     X_train = train_df.drop('energy_consumption_kwh', axis=1)
     y_train = train_df['energy_consumption_kwh']
@@ -37,89 +60,67 @@ def train_and_compare_models():
     print(f"Train size: {X_train.shape}, Test size: {X_test.shape}")
     print(f"Features: {X_train.columns.tolist()}")
 
-    # 2. Define Models and Params
-    models = {
-        'Linear Regression': {
-            'model': LinearRegression(),
-            'params': {}
-        },
-        'Ridge': {
-            'model': Ridge(),
-            'params': {'reg__alpha': [0.01, 0.1, 1.0, 10.0, 100.0]}
-        },
-        'Lasso': {
-            'model': Lasso(),
-            'params': {'reg__alpha': [0.001, 0.01, 0.1, 1.0, 10.0]}
-        },
-        'Random Forest': {
-            'model': RandomForestRegressor(random_state=42),
-            'params': {
-                'reg__n_estimators': [50, 100], 
-                'reg__max_depth': [10, 20, None],
-                'reg__min_samples_split': [2, 5]
-            }
-        }
-    }
+    recorder = RunRecorder('train_model_v2.py', X_train, y_train)
+    families = default_families()
+
+    # 2. Search every family on shared CV folds with one process pool
+    halving = HALVING_FAMILIES if search == 'halving' else []
+    grid_families = {name: config for name, config in families.items() if name not in halving}
+    print(f"\nSearching {', '.join(grid_families)} ({n_jobs or os.cpu_count()} workers, checkpoint: {checkpoint_path})")
+    scores = run_search(
+        X_train, y_train, grid_families,
+        n_splits=5, n_jobs=n_jobs, checkpoint_path=checkpoint_path, verbose=True
+    )
+    for candidate in scores:
+        recorder.add_search_time(candidate.family, candidate.fit_seconds)
+
+    # Budgeted search: growing subsamples, weak configurations dropped early
+    for name in halving:
+        print(f"\nSuccessive halving for {name}...")
+        result = halving_search(
+            X_train, y_train, name, families[name]['model'], families[name]['params'],
+            n_splits=5, n_jobs=n_jobs, verbose=True
+        )
+        print(format_halving_report(result, name))
+        scores.append(result.best)
+        recorder.add_search_time(name, result.seconds)
 
     results = []
-    best_model_obj = None
-    best_score = -np.inf
-    best_model_name = ""
-    
-    # 3. Training Loop
-    validation_df = pd.DataFrame(columns=['Model', 'Best Params', 'CV R2', 'Test R2', 'MAE', 'RMSE'])
 
-    for name, config in models.items():
-        print(f"\nTraining {name}...")
-        
-        # Create Pipeline
+    # 3. Refit each family's best params on the full training set
+    for name, candidate in best_per_family(scores).items():
+        print(f"\nRefitting {name}...")
+
         pipeline = Pipeline([
             ('scaler', StandardScaler()),
-            ('reg', config['model'])
+            ('reg', clone(families[name]['model']).set_params(**candidate.params))
         ])
-        
-        # Grid Search
-        # Note: 'reg__' prefix is needed because model is inside pipeline step 'reg'
-        grid = GridSearchCV(
-            pipeline, 
-            config['params'], 
-            cv=5, 
-            scoring='r2', 
-            n_jobs=-1,
-            verbose=1
-        )
-        
-        grid.fit(X_train, y_train)
-        
+        with recorder.time_fit(name):
+            pipeline.fit(X_train, y_train)
+
         # Evaluation
-        best_estimator = grid.best_estimator_
+        best_estimator = pipeline
         y_pred = best_estimator.predict(X_test)
         
         test_r2 = r2_score(y_test, y_pred)
         mae = mean_absolute_error(y_test, y_pred)
         rmse = np.sqrt(mean_squared_error(y_test, y_pred))
         
-        print(f"  Best Params: {grid.best_params_}")
-        print(f"  CV R2: {grid.best_score_:.4f}")
+        print(f"  Best Params: {candidate.params}")
+        print(f"  CV R2: {candidate.mean_score:.4f}")
         print(f"  Test R2: {test_r2:.4f}")
         print(f"  MAE: {mae:.4f}")
         
         # Store results
         results.append({
             'Model': name,
-            'Best Params': str(grid.best_params_),
-            'CV R2': grid.best_score_,
+            'Best Params': str(candidate.params),
+            'CV R2': candidate.mean_score,
             'Test R2': test_r2,
             'MAE': mae,
             'RMSE': rmse,
             'Object': best_estimator
         })
-        
-        # Track best model (based on Test R2)
-        if test_r2 > best_score:
-            best_score = test_r2
-            best_model_obj = best_estimator
-            best_model_name = name
 
     # 4. Comparison Table
     results_df = pd.DataFrame(results).drop('Object', axis=1)
@@ -130,20 +131,73 @@ def train_and_compare_models():
     print("=" * 70)
     print(results_df)
 
-    print(f"\n🏆 Winner: {best_model_name} (R2: {best_score:.4f})")
+    # Serving cost of each candidate; pick the cheapest within the R² tolerance
+    candidates = [
+        Candidate(r['Model'], r['Object'], r['Test R2'], profile_model(r['Object'], X_test))
+        for r in results
+    ]
+    selected = select_model(candidates, r2_tolerance, prefer)
+    print(f"\nServing cost (R2 tolerance {r2_tolerance}, prefer {prefer}):")
+    print(format_selection_table(candidates, selected))
 
-    # 5. Save Best Model
-    os.makedirs('models', exist_ok=True)
+    best = next(r for r in results if r['Model'] == selected.name)
+    best_model_obj = selected.model
+    best_model_name = selected.name
+    best_score = selected.r2
+    print(f"\n🏆 Winner: {best_model_name} (R2: {best_score:.4f}, {selected.profile.size_bytes / 1024:.1f} KB)")
+
+    # 5. Save Best Model: staged, then published as one registry version
+    registry = registry_for(MODELS_PATH)
+    staging = registry.stage()
+    model_path = os.path.join(staging, MODEL_FILENAME)
     
     # Save the full pipeline (includes scaler!)
-    joblib.dump(best_model_obj, 'models/electricbills_predict.pkl')
+    joblib.dump(best_model_obj, model_path)
     
     # Save scaler separately just in case (though it's in the pipeline)
     # Access scaler from pipeline
     scaler = best_model_obj.named_steps['scaler']
-    joblib.dump(scaler, 'models/scaler.pkl')
-    
-    print(f"Saved model to models/electricbills_predict.pkl")
+    joblib.dump(scaler, os.path.join(staging, 'scaler.pkl'))
+
+    # NumPy-only artifact for serving (verified against the pipeline)
+    export_compiled_model(best_model_obj, model_path, X_test)
+
+    # Test metrics bound to this model file (loaded by the predictor, shown in the UI)
+    write_model_metrics(model_path, best['Test R2'], best['MAE'], best['RMSE'],
+                        source='train_model_v2.py', n_samples=len(X_test))
+
+    # Atomic pointer swap; running apps hot-swap to the new version
+    version = registry.publish(staging, source='train_model_v2.py',
+                               info={'model_name': best_model_name, 'test_r2': float(best['Test R2'])},
+                               mirror_to=MODELS_PATH)
+    model_path = os.path.join(registry.version_path(version), MODEL_FILENAME)
+    print(f"Published model version {version} ({model_path})")
+
+    write_model_metadata(METADATA_PATH, {
+        'training_date': datetime.now().isoformat(),
+        'script': 'train_model_v2.py',
+        'model_type': type(best_model_obj.named_steps['reg']).__name__,
+        'model_name': best_model_name,
+        'n_features': X_train.shape[1],
+        'feature_names': X_train.columns.tolist(),
+        'n_train_samples': len(X_train),
+        'n_test_samples': len(X_test),
+        'params': best['Best Params'],
+        'metrics': {
+            'cv_r2': best['CV R2'],
+            'test_r2': best['Test R2'],
+            'test_mae': best['MAE'],
+            'test_rmse': best['RMSE']
+        },
+        'selection': selection_metadata(candidates, selected, r2_tolerance, prefer)
+    })
+    print(f"Saved metadata to {METADATA_PATH}")
+
+    # Append-only run record (dataset hash, fit times, memory, size, latency)
+    recorder.finish(best_model_obj, X_test, model_path=model_path,
+                    metrics={'cv_r2': best['CV R2'], 'test_r2': best['Test R2'],
+                             'test_mae': best['MAE'], 'test_rmse': best['RMSE']},
+                    profile=selected.profile, extra={'search': search, 'selected': best_model_name})
 
     # 6. Feature Importance (if applicable)
     if best_model_name in ['Linear Regression', 'Ridge', 'Lasso']:
@@ -164,4 +218,16 @@ def train_and_compare_models():
         print(imps)
 
 if __name__ == "__main__":
-    train_and_compare_models()
+    parser = argparse.ArgumentParser(description="Train and compare model families")
+    parser.add_argument('--n-jobs', type=int, help="Worker processes (default: all cores)")
+    parser.add_argument('--checkpoint', default=CHECKPOINT_PATH, help="Search checkpoint (JSONL)")
+    parser.add_argument('--search', choices=['grid', 'halving'], default='grid',
+                        help="halving: successive halving for Random Forest instead of the full grid")
+    parser.add_argument('--r2-tolerance', type=float, default=0.0,
+                        help="Pick the cheapest model within this R2 of the best (0 = best R2)")
+    parser.add_argument('--prefer', choices=list(SELECTION_CRITERIA), default='size',
+                        help="Cost minimized within the R2 tolerance")
+    args = parser.parse_args()
+
+    os.makedirs(os.path.dirname(args.checkpoint) or '.', exist_ok=True)
+    train_and_compare_models(args.n_jobs, args.checkpoint, args.search, args.r2_tolerance, args.prefer)
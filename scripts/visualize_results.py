@@ -3,16 +3,21 @@ import pandas as pd
 import numpy as np
 import joblib
 import os
+import sys
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.metrics import r2_score, mean_absolute_error
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from training.dataset_store import load_dataset
+
 def visualize_model_performance():
     print("Generating Model Performance Visualizations...")
     
     # Load Data & Model
     try:
-        test_df = pd.read_csv('data/processed/test.csv')
+        test_df = load_dataset('test')
         model = joblib.load('models/electricbills_predict.pkl')
     except Exception as e:
         print(f"Error loading files: {e}")
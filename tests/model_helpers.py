@@ -0,0 +1,22 @@
+# tests/model_helpers.py
+"""
+Shared helpers for tests that publish and serve small real models
+"""
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import Ridge
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from core.predictor import FEATURE_COLUMNS
+
+
+def make_pipeline(slope: float):
+    """Tiny Ridge pipeline whose predictions scale with household_size"""
+    X = pd.DataFrame(np.column_stack([np.arange(1, 11), np.zeros((10, 4))]), columns=FEATURE_COLUMNS)
+    return Pipeline([('scaler', StandardScaler()), ('reg', Ridge(alpha=1e-6))]).fit(X, slope * X['household_size'])
+
+
+def predicted_kwh(core) -> float:
+    """kWh predicted for a fixed 4-person, no-AC, January household"""
+    return core.predict({'household_size': 4, 'has_ac': 0, 'month': 1})['kwh']
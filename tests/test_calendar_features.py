@@ -0,0 +1,57 @@
+# tests/test_calendar_features.py
+"""
+Tests for the shared (year, month) calendar feature table
+"""
+import pytest
+import numpy as np
+import pandas as pd
+from core.calendar_features import (
+    calendar_features, features_from_dates, season_flags, season_name,
+    weekend_ratio, YEAR_MIN, YEAR_MAX
+)
+
+
+def reference_weekend_ratio(year, month):
+    """Original per-call pd.date_range implementation"""
+    days_in_month = pd.Period(f"{year}-{month}").days_in_month
+    dates = pd.date_range(f"{year}-{month}-01", periods=days_in_month, freq='D')
+    return dates.dayofweek.isin([5, 6]).sum() / days_in_month
+
+
+class TestCalendarFeatures:
+    """Test calendar lookups against the original pandas logic"""
+
+    @pytest.mark.parametrize("year", [YEAR_MIN, 1999, 2000, 2024, 2025, 2100, YEAR_MAX])
+    def test_weekend_ratio_matches_date_range(self, year):
+        """Test: Precomputed ratio equals the pd.date_range computation"""
+        for month in range(1, 13):
+            assert weekend_ratio(year, month) == pytest.approx(reference_weekend_ratio(year, month))
+
+    def test_season_flags(self):
+        """Test: hot = Mar-Jun, rainy = Jul-Oct, cool otherwise"""
+        hot, rainy = season_flags(np.arange(1, 13))
+        assert list(np.flatnonzero(hot) + 1) == [3, 4, 5, 6]
+        assert list(np.flatnonzero(rainy) + 1) == [7, 8, 9, 10]
+        assert [season_name(m) for m in (1, 4, 8, 11)] == ['cool', 'hot', 'rainy', 'cool']
+
+    def test_vectorized_lookup(self):
+        """Test: Arrays of (year, month) are resolved in one call"""
+        features = calendar_features(np.array([2025, 2025, 2024]), np.array([1, 6, 2]))
+        assert list(features['season_hot']) == [0, 1, 0]
+        assert list(features['season_rainy']) == [0, 0, 0]
+        assert features['weekend_ratio'][2] == pytest.approx(reference_weekend_ratio(2024, 2))
+
+    def test_features_from_dates(self):
+        """Test: Dates are mapped to their month features"""
+        dates = pd.Series(pd.to_datetime(['2025-04-15', '2025-10-01', '2024-12-31']))
+        features = features_from_dates(dates)
+        assert list(features['month']) == [4, 10, 12]
+        assert list(features['season_hot']) == [1, 0, 0]
+        assert list(features['season_rainy']) == [0, 1, 0]
+
+    def test_out_of_range_rejected(self):
+        """Test: Years/months outside the table raise ValueError"""
+        with pytest.raises(ValueError):
+            weekend_ratio(YEAR_MAX + 1, 1)
+        with pytest.raises(ValueError):
+            calendar_features(2025, 13)
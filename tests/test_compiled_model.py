@@ -0,0 +1,166 @@
+# tests/test_compiled_model.py
+"""
+Tests for the NumPy-only compiled model artifact
+"""
+import pytest
+import numpy as np
+import pandas as pd
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+from sklearn.linear_model import Ridge
+from sklearn.ensemble import RandomForestRegressor
+
+from core.compiled_model import CompiledModel, compiled_path_for, export_compiled_model, mmap_npz
+from core.predictor import PredictionCore, FEATURE_COLUMNS, MODEL_FILENAME
+
+
+def make_data(n=300, seed=0):
+    """Synthetic data with the serving feature columns"""
+    rng = np.random.default_rng(seed)
+    month = rng.integers(1, 13, n)
+    X = pd.DataFrame({
+        'household_size': rng.integers(1, 7, n),
+        'has_ac': rng.integers(0, 2, n),
+        'month': month,
+        'season_hot': np.isin(month, [3, 4, 5, 6]).astype(int),
+        'season_rainy': np.isin(month, [7, 8, 9, 10]).astype(int),
+        'weekend_ratio': rng.uniform(0.25, 0.33, n)
+    })[FEATURE_COLUMNS]
+    y = 80 * X['household_size'] + 150 * X['has_ac'] + 40 * X['season_hot'] + rng.normal(0, 5, n)
+    return X, y
+
+
+@pytest.fixture(scope="module")
+def data():
+    return make_data()
+
+
+@pytest.fixture(scope="module")
+def forest_pipeline(data):
+    X, y = data
+    return Pipeline([
+        ('scaler', StandardScaler()),
+        ('reg', RandomForestRegressor(n_estimators=15, max_depth=8, random_state=0))
+    ]).fit(X, y)
+
+
+class TestCompiledModel:
+    """Test compiling, verifying and reloading pipelines"""
+
+    def test_linear_pipeline_matches(self, data):
+        """Test: Scaler + Ridge compiles to an equivalent dot product"""
+        X, y = data
+        pipeline = Pipeline([('scaler', StandardScaler()), ('reg', Ridge())]).fit(X, y)
+        compiled = CompiledModel.from_pipeline(pipeline)
+
+        assert compiled.kind == 'linear'
+        assert compiled.verify(pipeline, X) < 1e-9
+
+    def test_forest_pipeline_matches(self, forest_pipeline, data):
+        """Test: Every tree of the forest is reproduced exactly"""
+        X, _ = data
+        compiled = CompiledModel.from_pipeline(forest_pipeline)
+
+        assert compiled.kind == 'forest'
+        assert compiled.verify(forest_pipeline, X) < 1e-9
+
+    def test_reorders_dataframe_columns(self, forest_pipeline, data):
+        """Test: Columns are aligned to the training order by name"""
+        X, _ = data
+        compiled = CompiledModel.from_pipeline(forest_pipeline)
+        shuffled = X[list(reversed(FEATURE_COLUMNS))]
+
+        assert np.allclose(compiled.predict(shuffled), forest_pipeline.predict(X))
+
+    def test_verify_rejects_mismatch(self, forest_pipeline, data):
+        """Test: A model that does not reproduce the reference is rejected"""
+        X, _ = data
+        compiled = CompiledModel.from_pipeline(forest_pipeline)
+        compiled.arrays['value'] = compiled.arrays['value'] + 1.0
+
+        with pytest.raises(ValueError):
+            compiled.verify(forest_pipeline, X)
+
+    def test_save_load_with_fingerprint(self, forest_pipeline, data, tmp_path):
+        """Test: Artifact loads back only with a matching fingerprint"""
+        X, _ = data
+        path = str(tmp_path / 'model.compiled.npz')
+        CompiledModel.from_pipeline(forest_pipeline).save(path, 'v1')
+
+        loaded = CompiledModel.load(path, 'v1')
+        assert loaded is not None
+        assert np.allclose(loaded.predict(X), forest_pipeline.predict(X))
+        assert CompiledModel.load(path, 'v2') is None
+        assert CompiledModel.load(str(tmp_path / 'missing.npz')) is None
+
+
+    def test_load_memory_maps_arrays(self, forest_pipeline, data, tmp_path):
+        """Test: Arrays are mapped read-only from the file, not copied"""
+        X, _ = data
+        path = str(tmp_path / 'model.compiled.npz')
+        CompiledModel.from_pipeline(forest_pipeline).save(path, 'v1')
+
+        loaded = CompiledModel.load(path, 'v1')
+        assert isinstance(loaded.arrays['threshold'], np.memmap)
+        assert not loaded.arrays['threshold'].flags.writeable
+        assert np.allclose(loaded.predict(X), forest_pipeline.predict(X))
+
+        eager = CompiledModel.load(path, 'v1', mmap=False)
+        assert not isinstance(eager.arrays['threshold'], np.memmap)
+
+    def test_mmap_npz_reads_compressed_members(self, tmp_path):
+        """Test: Compressed archives still load (into memory)"""
+        path = str(tmp_path / 'arrays.npz')
+        np.savez_compressed(path, a=np.arange(5), s=np.array('x'))
+
+        arrays = mmap_npz(path)
+        assert np.array_equal(arrays['a'], np.arange(5))
+        assert str(arrays['s']) == 'x'
+
+
+class TestCompiledServing:
+    """Test PredictionCore serving from the compiled artifact"""
+
+    def test_core_prefers_compiled_artifact(self, forest_pipeline, data, tmp_path):
+        """Test: Exported artifact is served and matches the pipeline"""
+        import joblib
+        X, _ = data
+        model_path = str(tmp_path / MODEL_FILENAME)
+        joblib.dump(forest_pipeline, model_path)
+        export_compiled_model(forest_pipeline, model_path, X)
+
+        core = PredictionCore(models_path=str(tmp_path))
+        assert isinstance(core.model, CompiledModel)
+
+        reference = PredictionCore(models_path=str(tmp_path), use_compiled_model=False)
+        assert not isinstance(reference.model, CompiledModel)
+
+        inputs = {'household_size': 3, 'has_ac': True, 'month': '4'}
+        assert core.predict(inputs)['kwh'] == reference.predict(inputs)['kwh']
+
+    def test_stale_artifact_falls_back_to_pipeline(self, forest_pipeline, data, tmp_path):
+        """Test: Retrained .pkl invalidates the old compiled artifact"""
+        import joblib
+        X, _ = data
+        model_path = str(tmp_path / MODEL_FILENAME)
+        joblib.dump(forest_pipeline, model_path)
+        export_compiled_model(forest_pipeline, model_path, X)
+
+        # Retrain without re-exporting
+        joblib.dump(Pipeline([('scaler', StandardScaler()), ('reg', Ridge())]).fit(*data), model_path)
+
+        core = PredictionCore(models_path=str(tmp_path))
+        assert isinstance(core.model, Pipeline)
+        assert compiled_path_for(model_path).endswith('.compiled.npz')
+
+    def test_missing_artifact_exported_on_load(self, forest_pipeline, tmp_path):
+        """Test: save_compiled_model exports and maps the artifact for a plain .pkl deploy"""
+        import joblib
+        model_path = str(tmp_path / MODEL_FILENAME)
+        joblib.dump(forest_pipeline, model_path)
+
+        assert isinstance(PredictionCore(models_path=str(tmp_path)).model, Pipeline)
+        core = PredictionCore(models_path=str(tmp_path), save_compiled_model=True)
+        assert isinstance(core.model, CompiledModel)
+        assert isinstance(core.model.arrays['threshold'], np.memmap)
+        assert isinstance(PredictionCore(models_path=str(tmp_path)).model, CompiledModel)
@@ -53,8 +53,8 @@ class TestConversationManager:
         """Test: Conversation starts and moves to stage 1"""
         manager.start_conversation()
         assert st.session_state.conversation_stage == 1
-        assert len(st.session_state.messages) > 0
-        assert st.session_state.messages[0]['role'] == 'assistant'
+        assert len(manager.messages) > 0
+        assert manager.messages[0]['role'] == 'assistant'
     
     def test_process_valid_input(self, manager):
         """Test: Valid input is processed correctly"""
@@ -69,7 +69,7 @@ class TestConversationManager:
             # Check if input was saved
             assert len(st.session_state.user_inputs) > 0
             # Check if conversation progressed (bot asks next question)
-            assert len(st.session_state.messages) >= 2 
+            assert len(manager.messages) >= 2 
     
     def test_invalid_input_handling(self, manager):
         """Test: Invalid inputs are rejected with proper error messages"""
@@ -82,12 +82,12 @@ class TestConversationManager:
         ]
         
         for invalid_input in invalid_inputs:
-            initial_count = len(st.session_state.messages)
+            initial_count = len(manager.messages)
             manager.process_user_input(invalid_input)
             
             # Should add error message from bot
-            assert len(st.session_state.messages) > initial_count
-            last_message = st.session_state.messages[-1]
+            assert len(manager.messages) > initial_count
+            last_message = manager.messages[-1]
             assert last_message['role'] == 'assistant'
             # Validator error messages usually contain "กรุณา"
             assert 'กรุณา' in last_message.get('content', '')
@@ -132,7 +132,7 @@ class TestConversationManager:
         # Check manager.reset_conversation implementation: it sets stage to 1 and starts fresh
         assert st.session_state.conversation_stage == 1 
         assert len(st.session_state.user_inputs) == 0
-        assert len(st.session_state.messages) > 0 # First question asked again
+        assert len(manager.messages) > 0 # First question asked again
 
     def test_get_collected_inputs(self, manager):
         """Test: Collected inputs format is correct"""
@@ -0,0 +1,90 @@
+# tests/test_core_predictor.py
+"""
+Tests for the headless prediction core (no Streamlit context needed)
+"""
+import subprocess
+import sys
+import pytest
+import numpy as np
+from core import PredictionCore, model_signature, PredictionError, ModelNotLoadedError, InputValidationError
+
+
+class TestPredictionCore:
+    """Test structured errors and warnings from the core"""
+
+    @pytest.fixture
+    def core(self, mocker):
+        """Core with a mock model (no table)"""
+        core = PredictionCore(use_prediction_table=False)
+        mock_model = mocker.Mock()
+        mock_model.predict.return_value = np.array([300.0])
+        core.model = mock_model
+        return core
+
+    def test_invalid_household_raises(self, core):
+        """Test: Out-of-range household size raises InputValidationError"""
+        with pytest.raises(InputValidationError) as exc_info:
+            core.predict({'household_size': 11, 'has_ac': 1, 'month': 6})
+
+        assert exc_info.value.field == 'household_size'
+        assert exc_info.value.to_dict()['value'] == 11
+
+    def test_invalid_month_raises(self, core):
+        """Test: Out-of-range month raises InputValidationError"""
+        with pytest.raises(InputValidationError) as exc_info:
+            core.predict({'household_size': 3, 'has_ac': 1, 'month': 13})
+        assert exc_info.value.field == 'month'
+
+    def test_missing_model_raises(self, core):
+        """Test: Predicting without a model raises ModelNotLoadedError"""
+        core.model = None
+        with pytest.raises(ModelNotLoadedError):
+            core.predict({'household_size': 3, 'has_ac': 1, 'month': 6})
+
+    def test_model_failure_wrapped(self, core):
+        """Test: Model exceptions surface as PredictionError"""
+        core.model.predict.side_effect = RuntimeError("boom")
+        with pytest.raises(PredictionError, match="boom"):
+            core.predict({'household_size': 3, 'has_ac': 1, 'month': 6})
+
+    def test_extrapolation_warning_returned(self, core):
+        """Test: Soft warnings are returned, not rendered"""
+        result = core.predict({'household_size': 8, 'has_ac': 1, 'month': 6})
+
+        assert result['kwh'] == 300.0
+        assert any('8 คน' in w for w in result['warnings'])
+
+    def test_no_warnings_for_trained_range(self, core):
+        """Test: No warnings inside the training range"""
+        result = core.predict({'household_size': 3, 'has_ac': 0, 'month': 1})
+        assert result['warnings'] == []
+
+
+class TestModelSignature:
+    """Test model-file change detection used for cache busting"""
+
+    def test_signature_changes_when_model_replaced(self, tmp_path):
+        """Test: Rewriting the model file changes the signature"""
+        model_file = tmp_path / 'electricbills_predict.pkl'
+        assert model_signature(str(tmp_path)) == ()
+
+        model_file.write_bytes(b'v1')
+        first = model_signature(str(tmp_path))
+        assert model_signature(str(tmp_path)) == first
+
+        model_file.write_bytes(b'version2')
+        assert model_signature(str(tmp_path)) != first
+
+
+class TestCoreImport:
+    """Test the core stays free of UI and heavy dependencies"""
+
+    def test_import_does_not_load_ui_libraries(self):
+        """Test: Importing core does not import streamlit/plotly/matplotlib/pandas/http.server"""
+        code = (
+            "import sys, core; "
+            "heavy = [m for m in ('streamlit', 'plotly', 'matplotlib', 'pandas', 'sklearn', 'http.server') if m in sys.modules]; "
+            "print(','.join(heavy))"
+        )
+        output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+        assert output.stdout.strip() == ''
@@ -0,0 +1,109 @@
+# tests/test_dataset_store.py
+"""
+Tests for columnar processed-dataset storage (training/dataset_store.py)
+"""
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import training.dataset_store as dataset_store
+from training.dataset_store import (
+    write_dataset, load_dataset, dataset_exists, read_manifest, MANIFEST_FILENAME
+)
+from training.feature_pipeline import OUTPUT_COLUMNS
+from training.streaming import ParquetShardWriter, iter_shards
+
+
+@pytest.fixture
+def processed_df():
+    """Processed frame with the pipeline's output columns (int64/float64)"""
+    rng = np.random.default_rng(0)
+    n = 500
+    return pd.DataFrame({
+        'household_size': rng.integers(1, 7, n),
+        'has_ac': rng.integers(0, 2, n),
+        'season_hot': rng.integers(0, 2, n),
+        'season_rainy': rng.integers(0, 2, n),
+        'weekend_ratio': rng.choice([8 / 31, 8 / 30, 10 / 31], n),
+        'energy_consumption_kwh': rng.uniform(0.5, 20, n).round(2)
+    })[OUTPUT_COLUMNS]
+
+
+class TestWriteAndLoad:
+    """Test the Parquet round trip and manifest"""
+
+    def test_roundtrip_compact_dtypes(self, tmp_path, processed_df):
+        """Test: Values survive the round trip with int8/float32 features"""
+        write_dataset(processed_df, 'train', data_dir=str(tmp_path))
+        assert os.path.exists(tmp_path / 'train.parquet')
+        assert os.path.exists(tmp_path / 'train.csv')
+
+        loaded = load_dataset('train', data_dir=str(tmp_path))
+        assert list(loaded.columns) == OUTPUT_COLUMNS
+        assert loaded['household_size'].dtype == np.int8
+        assert loaded['weekend_ratio'].dtype == np.float32
+        # Target is kept at full precision
+        np.testing.assert_array_equal(loaded['energy_consumption_kwh'], processed_df['energy_consumption_kwh'])
+        np.testing.assert_array_equal(loaded['has_ac'], processed_df['has_ac'])
+        np.testing.assert_allclose(loaded['weekend_ratio'], processed_df['weekend_ratio'], rtol=1e-6)
+
+    def test_manifest_records_schema(self, tmp_path, processed_df):
+        """Test: schema.json lists format, rows and dtypes per dataset"""
+        write_dataset(processed_df, 'train', data_dir=str(tmp_path))
+        write_dataset(processed_df.head(100), 'test', data_dir=str(tmp_path))
+
+        assert os.path.exists(tmp_path / MANIFEST_FILENAME)
+        datasets = read_manifest(str(tmp_path))['datasets']
+        assert set(datasets) == {'train', 'test'}
+        assert datasets['test']['rows'] == 100
+        assert datasets['train']['format'] == 'parquet'
+        assert datasets['train']['columns']['has_ac'] == 'int8'
+
+    def test_column_selection(self, tmp_path, processed_df):
+        """Test: Only the requested columns are loaded, in the requested order"""
+        write_dataset(processed_df, 'train', data_dir=str(tmp_path))
+
+        loaded = load_dataset('train', columns=['weekend_ratio', 'has_ac'], data_dir=str(tmp_path))
+        assert list(loaded.columns) == ['weekend_ratio', 'has_ac']
+        assert len(loaded) == len(processed_df)
+
+
+class TestFallback:
+    """Test CSV fallback and missing data"""
+
+    def test_csv_fallback_without_pyarrow(self, tmp_path, processed_df, monkeypatch):
+        """Test: Without a Parquet engine the CSV is written and read with the same dtypes"""
+        monkeypatch.setattr(dataset_store, 'columnar_available', lambda: False)
+
+        entry = write_dataset(processed_df, 'train', data_dir=str(tmp_path))
+        assert entry['format'] == 'csv'
+        assert not os.path.exists(tmp_path / 'train.parquet')
+
+        loaded = load_dataset('train', columns=['household_size', 'energy_consumption_kwh'],
+                              data_dir=str(tmp_path))
+        assert loaded['household_size'].dtype == np.int8
+        np.testing.assert_array_equal(loaded['energy_consumption_kwh'], processed_df['energy_consumption_kwh'])
+
+    def test_missing_dataset(self, tmp_path):
+        """Test: Loading a dataset that was never written raises FileNotFoundError"""
+        assert not dataset_exists('train', str(tmp_path))
+        with pytest.raises(FileNotFoundError):
+            load_dataset('train', data_dir=str(tmp_path))
+
+
+class TestParquetShards:
+    """Test Parquet shards in streaming mode"""
+
+    def test_parquet_shards_roundtrip(self, tmp_path, processed_df):
+        """Test: ParquetShardWriter output reads back through iter_shards"""
+        writer = ParquetShardWriter(str(tmp_path))
+        writer.write('train', processed_df.iloc[:300])
+        writer.write('train', processed_df.iloc[300:])
+
+        shards = list(iter_shards(str(tmp_path), 'train', suffix='.parquet'))
+        assert len(shards) == 2
+        combined = pd.concat(shards, ignore_index=True)
+        assert combined['household_size'].dtype == np.int8
+        np.testing.assert_array_equal(combined['energy_consumption_kwh'], processed_df['energy_consumption_kwh'])
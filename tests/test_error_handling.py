@@ -40,7 +40,8 @@ class TestErrorHandling:
         
         # Verify keys are restored
         assert 'conversation_stage' in mock_state
-        assert 'messages' in mock_state
+        assert 'session_id' in mock_state
+        assert manager.messages == []
     
     def test_invalid_prediction_input(self, mocker):
         """Test: Predictor handles bad input types"""
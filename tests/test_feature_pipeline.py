@@ -0,0 +1,76 @@
+# tests/test_feature_pipeline.py
+"""
+Tests for the columnar feature pipeline (training/feature_pipeline.py)
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.calendar_features import weekend_ratio
+from training.feature_pipeline import (
+    default_stages, run_stages, format_stage_report, encode_has_ac, synthetic_dates,
+    Stage, OUTPUT_COLUMNS
+)
+
+
+def raw_export(n=1000, seed=0):
+    """Frame shaped like the Kaggle household export"""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        'Household_ID': [f'H{i:05d}' for i in range(n)],
+        'Date': '2024-06-01',
+        'Energy_Consumption_kWh': rng.uniform(1, 30, n),
+        'Household_Size': rng.integers(0, 23, n),
+        'Has_AC': rng.choice(['Yes', 'No', 'no ', 'unknown'], n)
+    })
+
+
+class TestFeatureStages:
+    """Test the stage graph output"""
+
+    def test_output_columns_and_filters(self):
+        """Test: Invalid rows dropped, features match the calendar table"""
+        out = run_stages(raw_export(), default_stages(np.random.default_rng(1)))
+
+        assert list(out.columns) == OUTPUT_COLUMNS
+        assert out['household_size'].between(1, 20).all()
+        assert set(out['has_ac'].unique()) <= {0, 1}
+
+    def test_features_consistent_with_dates(self):
+        """Test: Season and weekend ratio derive from the assigned date"""
+        stages = default_stages(np.random.default_rng(2))[:-1]  # keep date/month
+        out = run_stages(raw_export(200), stages)
+
+        month = out['date'].dt.month
+        assert (out['season_hot'] == month.isin([3, 4, 5, 6]).astype(int)).all()
+        assert (out['season_rainy'] == month.isin([7, 8, 9, 10]).astype(int)).all()
+        assert np.allclose(out['weekend_ratio'], weekend_ratio(out['date'].dt.year, month))
+
+    def test_encode_has_ac_labels(self):
+        """Test: Labels normalized case/whitespace-insensitively, others -> -1"""
+        values = pd.Series(['Yes', ' no', 'YES', 'maybe', None])
+        assert encode_has_ac(values).tolist() == [1, 0, 1, -1, -1]
+        assert encode_has_ac(pd.Series([0, 1, 2])).tolist() == [0, 1, -1]
+
+    def test_synthetic_dates_within_year(self):
+        """Test: Dates cover only the synthetic year"""
+        dates = synthetic_dates(10_000, np.random.default_rng(0), year=2024)
+        assert dates.min() >= np.datetime64('2024-01-01')
+        assert dates.max() <= np.datetime64('2024-12-31')
+
+
+class TestStageTiming:
+    """Test per-stage timing report"""
+
+    def test_timings_recorded_per_stage(self):
+        """Test: One timing per stage with row counts and rows/s"""
+        timings = []
+        stages = [Stage('keep_even', lambda df: df.iloc[::2]), Stage('noop', lambda df: df)]
+        run_stages(pd.DataFrame({'x': range(10)}), stages, timings)
+
+        assert [t.name for t in timings] == ['keep_even', 'noop']
+        assert (timings[0].rows_in, timings[0].rows_out) == (10, 5)
+        assert timings[0].rows_per_second > 0
+
+        report = format_stage_report(timings)
+        assert 'keep_even' in report and 'TOTAL' in report
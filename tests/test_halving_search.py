@@ -0,0 +1,66 @@
+# tests/test_halving_search.py
+"""
+Tests for the successive-halving search (training/halving_search.py)
+"""
+import numpy as np
+import pytest
+from sklearn.tree import DecisionTreeRegressor
+
+from training.halving_search import halving_schedule, halving_search, format_halving_report
+from training.model_search import run_search
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.uniform(-2, 2, size=(3000, 2))
+    y = np.sin(X[:, 0] * 2) + X[:, 1] ** 2 + rng.normal(scale=0.05, size=3000)
+    return X, y
+
+
+GRID = {'max_depth': [1, 2, 3, 4, 6, 8, 10, 12, 14]}
+
+
+class TestSchedule:
+    """Test rows per round"""
+
+    def test_grows_by_factor_to_full_data(self):
+        """Test: 12 candidates, factor 3 -> 4 rounds ending at all rows"""
+        assert halving_schedule(12, 57_600, factor=3) == [2133, 6400, 19200, 57600]
+
+    def test_capped_by_min_samples(self):
+        """Test: Small folds get fewer rounds instead of tiny subsamples"""
+        schedule = halving_schedule(12, 2000, factor=3, min_samples=500)
+        assert schedule == [666, 2000]
+        assert halving_schedule(12, 64, min_samples=500) == [64]
+
+    def test_rejects_factor_below_two(self):
+        """Test: factor must shrink the candidate set"""
+        with pytest.raises(ValueError):
+            halving_schedule(12, 1000, factor=1)
+
+
+class TestHalvingSearch:
+    """Test the budgeted search result"""
+
+    def test_drops_candidates_each_round(self, data):
+        """Test: 9 candidates, factor 3 -> 9, 3, 1 candidates on growing rows"""
+        X, y = data
+        result = halving_search(X, y, 'Tree', DecisionTreeRegressor(random_state=0), GRID,
+                                factor=3, min_samples=100, n_splits=3, n_jobs=1)
+        assert [r.n_candidates for r in result.rounds] == [9, 3, 1]
+        sizes = [r.n_samples for r in result.rounds]
+        assert sizes == sorted(sizes) and sizes[-1] == 2000
+        assert result.seconds > 0
+
+    def test_reaches_full_grid_quality(self, data):
+        """Test: Winner's full-data CV score is close to the full grid's best"""
+        X, y = data
+        families = {'Tree': {'model': DecisionTreeRegressor(random_state=0), 'params': GRID}}
+        grid_best = run_search(X, y, families, n_splits=3, n_jobs=1)[0]
+
+        result = halving_search(X, y, 'Tree', DecisionTreeRegressor(random_state=0), GRID,
+                                factor=3, min_samples=100, n_splits=3, n_jobs=1)
+        assert result.best.family == 'Tree'
+        assert result.best.mean_score >= grid_best.mean_score - 0.02
+        assert 'R2=' in format_halving_report(result) and 's over 3 rounds' in format_halving_report(result)
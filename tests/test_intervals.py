@@ -0,0 +1,132 @@
+# tests/test_intervals.py
+"""
+Tests for per-prediction intervals from forest trees (core/intervals.py)
+"""
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import Ridge
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import StandardScaler
+
+from core.compiled_model import CompiledModel
+from core.intervals import predict_interval
+from core.model_metrics import ModelMetrics
+from core.prediction_table import TABLE_SHAPE, PredictionTable
+from core.predictor import FEATURE_COLUMNS, PredictionCore
+from core.result_cache import ResultCache
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    n = 400
+    X = pd.DataFrame({
+        'household_size': rng.integers(1, 7, n),
+        'has_ac': rng.integers(0, 2, n),
+        'season_hot': rng.integers(0, 2, n),
+        'season_rainy': rng.integers(0, 2, n),
+        'weekend_ratio': rng.uniform(0.25, 0.33, n)
+    })[FEATURE_COLUMNS]
+    # Noise grows with household size
+    y = 80 * X['household_size'] + 150 * X['has_ac'] + rng.normal(0, 5 * X['household_size'] ** 2)
+    return X, y
+
+
+@pytest.fixture(scope="module")
+def forest(data):
+    X, y = data
+    return Pipeline([
+        ('scaler', StandardScaler()),
+        ('model', RandomForestRegressor(n_estimators=30, min_samples_leaf=5, random_state=0))
+    ]).fit(X, y)
+
+
+class TestPredictInterval:
+    """Test the one-pass point estimate and tree quantiles"""
+
+    def test_point_matches_predict(self, forest, data):
+        """Test: Point estimate equals the pipeline's predict; bounds match per-tree quantiles"""
+        X, _ = data
+        result = predict_interval(forest, X.iloc[:50], coverage=0.8)
+
+        np.testing.assert_allclose(result.kwh, forest.predict(X.iloc[:50]), atol=1e-6)
+        X_scaled = forest.named_steps['scaler'].transform(X.iloc[:50])
+        trees = np.stack([t.predict(X_scaled) for t in forest.named_steps['model'].estimators_], axis=1)
+        np.testing.assert_allclose(result.lower, np.quantile(trees, 0.1, axis=1), atol=1e-6)
+        np.testing.assert_allclose(result.upper, np.quantile(trees, 0.9, axis=1), atol=1e-6)
+
+    def test_wider_where_noisier(self, forest, data):
+        """Test: Intervals are per input - wider for the noisier large households"""
+        X, _ = data
+        result = predict_interval(forest, X)
+        width = result.upper - result.lower
+        small = X['household_size'].to_numpy() == 1
+        large = X['household_size'].to_numpy() == 6
+        assert width[large].mean() > width[small].mean()
+
+    def test_linear_model_has_no_interval(self, data):
+        """Test: Models without trees give bounds of None"""
+        X, y = data
+        result = predict_interval(Ridge().fit(X, y), X.iloc[:5])
+        assert result.lower is None and result.upper is None
+        assert len(result.kwh) == 5
+
+    def test_compiled_forest_spread(self, forest, data):
+        """Test: CompiledModel.predict_spread mean is predict()"""
+        X, _ = data
+        compiled = CompiledModel.from_pipeline(forest)
+        mean, (low, high) = compiled.predict_spread(X, (0.1, 0.9))
+        np.testing.assert_allclose(mean, compiled.predict(X))
+        assert np.all(low <= mean + 1e-9) and np.all(mean <= high + 1e-9)
+
+
+class TestServingIntervals:
+    """Test intervals in the table and the predictor"""
+
+    def test_table_stores_intervals(self, forest, tmp_path):
+        """Test: Table build keeps bounds, and they survive save/load"""
+        core = PredictionCore(models_path=str(tmp_path), use_prediction_table=False,
+                              result_cache=ResultCache())
+        table = PredictionTable.build(forest, core._feature_grid(), 'abc')
+        assert table.has_intervals and table.lower.shape == TABLE_SHAPE
+        assert np.all(table.lower <= table.upper)
+
+        path = str(tmp_path / 'model.table.npz')
+        table.save(path)
+        loaded = PredictionTable.load(path, 'abc')
+        np.testing.assert_array_equal(loaded.upper, table.upper)
+        assert loaded.coverage == table.coverage
+
+    def test_predict_reports_interval(self, forest, tmp_path):
+        """Test: Table lookup and direct model give the same interval; range is the MAE-based typical error"""
+        core = PredictionCore(models_path=str(tmp_path), use_prediction_table=False,
+                              result_cache=ResultCache())
+        core.model = forest
+        direct = core.predict({'household_size': 5, 'has_ac': 1, 'month': 4})
+
+        core.table = PredictionTable.build(forest, core._feature_grid(), 'abc')
+        served = core.predict({'household_size': 5, 'has_ac': 1, 'month': 4})
+
+        assert served['interval'] == direct['interval']
+        interval = served['interval']
+        assert interval['source'] == 'forest'
+        assert interval['amount_low'] <= served['amount'] <= interval['amount_high']
+        assert served['range'] is None  # no metrics sidecar: no measured error to report
+
+        core.metrics = ModelMetrics(r2=0.9, mae_kwh=15.0, rmse_kwh=19.0, model_sha256='0' * 64)
+        with_metrics = core.predict({'household_size': 5, 'has_ac': 1, 'month': 4})
+        bills = core.tariff.bill(np.array([with_metrics['kwh'] - 15.0, with_metrics['kwh'] + 15.0]))
+        assert with_metrics['range'] == pytest.approx((bills[1] - bills[0]) / 2, abs=0.01)
+        assert with_metrics['interval'] == interval  # tree band unchanged
+
+    def test_batch_intervals(self, forest, tmp_path):
+        """Test: predict_batch returns per-row bounds, NaN for invalid rows"""
+        core = PredictionCore(models_path=str(tmp_path), use_prediction_table=False,
+                              result_cache=ResultCache())
+        core.model = forest
+        result = core.predict_batch({'household_size': [1, 6, 99], 'has_ac': [0, 1, 1], 'month': [1, 4, 4]})
+
+        assert np.all(result['kwh_low'][:2] <= result['kwh'][:2])
+        assert np.isnan(result['amount_low'][2])
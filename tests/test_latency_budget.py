@@ -0,0 +1,47 @@
+# tests/test_latency_budget.py
+"""
+Tests for the UX latency budget (no artificial sleeps by default)
+"""
+import pytest
+from utils.latency_budget import ux_delay, get_latency_budget, LATENCY_BUDGET_ENV
+from components.typing_indicator import render_typing_indicator
+
+
+class TestLatencyBudget:
+    """Test UX pauses are governed by one budget"""
+
+    def test_default_budget_never_sleeps(self, mocker, monkeypatch):
+        """Test: Without configuration no pause blocks the thread"""
+        monkeypatch.delenv(LATENCY_BUDGET_ENV, raising=False)
+        mock_sleep = mocker.patch('utils.latency_budget.time.sleep')
+
+        assert get_latency_budget() == 0.0
+        assert ux_delay(1.5) == 0.0
+        mock_sleep.assert_not_called()
+
+    def test_budget_caps_requested_delay(self, mocker, monkeypatch):
+        """Test: Pauses are capped at the configured budget"""
+        monkeypatch.setenv(LATENCY_BUDGET_ENV, '0.2')
+        mock_sleep = mocker.patch('utils.latency_budget.time.sleep')
+
+        assert ux_delay(1.5) == pytest.approx(0.2)
+        assert ux_delay(0.1) == pytest.approx(0.1)
+        assert mock_sleep.call_count == 2
+
+    @pytest.mark.parametrize("value", ['abc', '-1'])
+    def test_invalid_budget_falls_back_to_zero(self, monkeypatch, value):
+        """Test: Invalid or negative budgets disable pauses"""
+        monkeypatch.setenv(LATENCY_BUDGET_ENV, value)
+        assert get_latency_budget() == 0.0
+
+    def test_typing_indicator_does_not_block(self, mocker, monkeypatch):
+        """Test: Typing indicator relies on CSS, not a server-side sleep"""
+        monkeypatch.delenv(LATENCY_BUDGET_ENV, raising=False)
+        mock_markdown = mocker.patch('streamlit.markdown')
+        mock_sleep = mocker.patch('utils.latency_budget.time.sleep')
+
+        render_typing_indicator(duration=0.5)
+
+        mock_sleep.assert_not_called()
+        assert 'animation-delay: 0s, 0.5s' in mock_markdown.call_args[0][0]
+        mock_markdown.return_value.empty.assert_not_called()
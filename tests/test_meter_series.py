@@ -0,0 +1,92 @@
+# tests/test_meter_series.py
+"""
+Tests for grouped multi-meter features and batch forecasting (training/meter_series.py)
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from training.meter_series import (
+    BatchForecaster, add_meter_features, fit_pooled, forecast_summary,
+    grouped_rolling_mean, latest_months, sort_meters
+)
+
+
+@pytest.fixture
+def long_table():
+    """Three meters with different history lengths, rows shuffled"""
+    rng = np.random.default_rng(0)
+    frames = []
+    for meter, months in (('A', 12), ('B', 8), ('C', 2)):
+        dates = pd.date_range('2024-01-01', periods=months, freq='MS')
+        units = rng.integers(50, 200, size=months).astype(float)
+        frames.append(pd.DataFrame({
+            'meter_id': meter,
+            'date': [f'{d.month}/{d.day}/{d.year}' for d in dates],
+            'amount(unit)': units,
+            'electric_price': units * 8,
+            'people': [np.nan if m == 4 else 3 for m in dates.month],
+            'note': ['ปิดเทอม' if m == 4 else '' for m in dates.month]
+        }))
+    return pd.concat(frames, ignore_index=True).sample(frac=1, random_state=1)
+
+
+class TestGroupedFeatures:
+    """Test vectorized per-meter features against pandas groupby"""
+
+    def test_matches_groupby(self, long_table):
+        """Test: Lags, target and rolling means equal groupby shift/rolling"""
+        df = add_meter_features(sort_meters(long_table))
+        grouped = df.groupby('meter_id')['amount(unit)']
+
+        pd.testing.assert_series_equal(df['lag2_unit'], grouped.shift(2), check_names=False)
+        pd.testing.assert_series_equal(
+            df['target_next_bill'], df.groupby('meter_id')['electric_price'].shift(-1).astype(float),
+            check_names=False)
+        expected_roll = grouped.rolling(3).mean().reset_index(level=0, drop=True)
+        np.testing.assert_allclose(df['roll3_unit'], expected_roll, equal_nan=True)
+
+    def test_break_flags(self, long_table):
+        """Test: Break months come from note; people filled with 0 there"""
+        df = add_meter_features(sort_meters(long_table))
+        april = df['date'].dt.month == 4
+        assert (df.loc[april, 'is_break'] == 1).all()
+        assert (df.loc[april, 'people'] == 0).all()
+        assert df.loc[df['meter_id'] == 'A', 'breaks_roll6'].max() == 1
+
+    def test_rolling_mean_skips_missing(self):
+        """Test: A missing reading makes every window containing it NaN"""
+        values = np.array([1.0, np.nan, 3.0, 4.0, 5.0])
+        result = grouped_rolling_mean(values, np.arange(5), 2)
+        np.testing.assert_array_equal(np.isnan(result), [True, True, True, False, False])
+        assert result[3] == 3.5
+
+
+class TestBatchForecaster:
+    """Test one-pass scoring of every meter"""
+
+    def test_one_row_per_meter(self, long_table):
+        """Test: Latest month per meter; short histories get NaN"""
+        df = add_meter_features(sort_meters(long_table))
+        forecasts = BatchForecaster(fit_pooled(df).to_model()).forecast(long_table)
+
+        assert list(forecasts['meter_id']) == ['A', 'B', 'C']
+        assert list(forecasts['history_months']) == [12, 8, 2]
+        assert forecasts['forecast_next_bill'].isna().tolist() == [False, False, True]
+        assert forecast_summary(forecasts)['insufficient_history'] == 1
+
+    def test_batch_equals_per_meter(self, long_table):
+        """Test: Scoring all meters together equals scoring each meter alone"""
+        df = add_meter_features(sort_meters(long_table))
+        forecaster = BatchForecaster(fit_pooled(df).to_model())
+        batch = forecaster.forecast(long_table).set_index('meter_id')['forecast_next_bill']
+
+        for meter in ('A', 'B'):
+            alone = forecaster.forecast(long_table[long_table['meter_id'] == meter])
+            assert alone['forecast_next_bill'].iloc[0] == pytest.approx(batch[meter])
+
+    def test_latest_months(self, long_table):
+        """Test: Latest rows are the ones with no known next bill"""
+        df = add_meter_features(sort_meters(long_table))
+        assert latest_months(df)['target_next_bill'].isna().all()
+        assert len(latest_months(df)) == 3
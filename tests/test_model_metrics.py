@@ -0,0 +1,120 @@
+# tests/test_model_metrics.py
+"""
+Tests for the model metrics sidecar (core/model_metrics.py)
+"""
+import json
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from core import PredictionCore, ResultCache, model_signature
+from core.model_metrics import (
+    ModelMetrics, load_model_metrics, metrics_path_for, model_sha256, write_model_metrics
+)
+from core.predictor import FEATURE_COLUMNS, MODEL_FILENAME
+
+
+@pytest.fixture
+def model_file(tmp_path):
+    path = tmp_path / 'model.pkl'
+    path.write_bytes(b'model-bytes')
+    return str(path)
+
+
+class TestMetricsSidecar:
+    """Test writing and loading the sidecar"""
+
+    def test_round_trip(self, model_file):
+        """Test: Written metrics load back, bound to the model's sha256"""
+        written = write_model_metrics(model_file, 0.9, 12.5, 16.0, source='test', n_samples=100)
+        assert metrics_path_for(model_file).endswith('model.metrics.json')
+
+        loaded = load_model_metrics(model_file)
+        assert loaded == written
+        assert loaded.model_sha256 == model_sha256(model_file)
+        assert loaded.as_result()['mae'] == 12.5
+
+    def test_stale_sidecar_ignored(self, model_file):
+        """Test: Metrics of a replaced model file are not served"""
+        write_model_metrics(model_file, 0.9, 12.5, 16.0, source='test')
+        with open(model_file, 'wb') as f:
+            f.write(b'retrained-model')
+        assert load_model_metrics(model_file) is None
+
+    def test_missing_or_unreadable(self, model_file):
+        """Test: No sidecar, bad JSON or another schema give None"""
+        assert load_model_metrics(model_file) is None
+
+        path = metrics_path_for(model_file)
+        with open(path, 'w') as f:
+            f.write('{not json')
+        assert load_model_metrics(model_file) is None
+
+        write_model_metrics(model_file, 0.9, 12.5, 16.0, source='test')
+        with open(path) as f:
+            data = json.load(f)
+        data['schema'] = 99
+        with open(path, 'w') as f:
+            json.dump(data, f)
+        assert load_model_metrics(model_file) is None
+
+
+class TestPredictorMetrics:
+    """Test the predictor serving sidecar metrics"""
+
+    def test_loaded_with_model(self):
+        """Test: The shipped model has matching metrics and they reach the result"""
+        core = PredictionCore(use_prediction_table=False, result_cache=ResultCache())
+        if core.model is None or core.model_path is None:
+            pytest.skip("Model file not available")
+
+        assert core.metrics is not None
+        result = core.predict({'household_size': 3, 'has_ac': 1, 'month': 4})
+        assert result['model_metrics'] == core.metrics.as_result()
+
+    def test_runtime_model_has_no_metrics(self, mocker, tmp_path):
+        """Test: Without metrics, results carry None and non-forest models get no interval"""
+        core = PredictionCore(models_path=str(tmp_path), use_prediction_table=False,
+                              result_cache=ResultCache())
+        mock_model = mocker.Mock()
+        mock_model.predict.return_value = np.array([300.0])
+        core.model = mock_model
+
+        result = core.predict({'household_size': 3, 'has_ac': 1, 'month': 4})
+        assert result['model_metrics'] is None
+        assert result['interval'] is None and result['range'] is None
+
+        core.metrics = ModelMetrics(r2=0.9, mae_kwh=10.0, rmse_kwh=12.0, model_sha256='0' * 64)
+        core.result_cache.clear()
+        interval = core.predict({'household_size': 3, 'has_ac': 1, 'month': 4})['interval']
+        assert interval['source'] == 'test_mae'
+        assert (interval['kwh_low'], interval['kwh_high']) == (290.0, 310.0)
+
+    def test_signature_tracks_sidecar(self, tmp_path):
+        """Test: Writing a sidecar changes the model signature (app reloads the predictor)"""
+        model_path = tmp_path / MODEL_FILENAME
+        model_path.write_bytes(b'model-bytes')
+        before = model_signature(str(tmp_path))
+        write_model_metrics(str(model_path), 0.9, 12.5, 16.0, source='test')
+        assert model_signature(str(tmp_path)) != before
+
+    def test_rewritten_sidecar_not_served_from_cache(self, tmp_path):
+        """Test: New metrics for the same model reach results despite a shared result cache"""
+        X = pd.DataFrame(np.arange(50, dtype=float).reshape(10, 5), columns=FEATURE_COLUMNS)
+        model_path = tmp_path / MODEL_FILENAME
+        joblib.dump(LinearRegression().fit(X, X.sum(axis=1) + 300.0), model_path)
+        cache = ResultCache()
+        inputs = {'household_size': 3, 'has_ac': 1, 'month': 4}
+
+        write_model_metrics(str(model_path), 0.9888, 14.6, 18.6, source='test')
+        first = PredictionCore(models_path=str(tmp_path), use_prediction_table=False, result_cache=cache)
+        assert first.predict(inputs)['model_metrics']['r2_score'] == 0.9888
+
+        write_model_metrics(str(model_path), 0.5, 40.0, 50.0, source='test')
+        reloaded = PredictionCore(models_path=str(tmp_path), use_prediction_table=False, result_cache=cache)
+        result = reloaded.predict(inputs)
+        assert result['model_metrics']['r2_score'] == 0.5
+        assert result['interval']['kwh_high'] - result['interval']['kwh_low'] == pytest.approx(80.0, abs=0.02)
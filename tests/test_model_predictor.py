@@ -7,6 +7,9 @@ import pytest
 import pandas as pd
 import numpy as np
 from utils.model_predictor import ElectricityPredictor
+from core.tariff import default_tariff
+from core import PredictionCore, InputValidationError, PredictionError
+from core.model_metrics import ModelMetrics
 from pathlib import Path
 import os
 import joblib
@@ -51,7 +54,8 @@ class TestElectricityPredictor:
         
         # Check calculations
         assert result['kwh'] == 350.0  # From mock
-        assert result['amount'] == round(350.0 * 4.2, 2)  # 4.2 THB/unit
+        assert result['amount'] == round(default_tariff().bill(350.0), 2)  # Tiered tariff
+        assert result['bill']['total'] == result['amount']
     
     def test_household_size_validation(self, predictor, mocker):
         """Test: Invalid household_size returns None"""
@@ -176,10 +180,11 @@ class TestElectricityPredictor:
         assert 0 < captured_df.iloc[0]['weekend_ratio'] < 1
     
     def test_model_metrics_present(self, predictor, mocker):
-        """Test: Model metrics are included in result"""
+        """Test: Model metrics in the result come from the predictor's loaded sidecar"""
         mock_model = mocker.Mock()
         mock_model.predict.return_value = np.array([250.0])
         predictor.model = mock_model
+        predictor.metrics = ModelMetrics(r2=0.95, mae_kwh=12.0, rmse_kwh=15.0, model_sha256='ab' * 32)
         
         result = predictor.predict({
             'household_size': 2,
@@ -188,9 +193,9 @@ class TestElectricityPredictor:
         })
         
         assert 'model_metrics' in result
-        assert result['model_metrics']['r2_score'] == 0.9888
-        assert result['model_metrics']['mae'] == 14.58
-        assert result['model_metrics']['rmse'] == 18.56
+        assert result['model_metrics']['r2_score'] == 0.95
+        assert result['model_metrics']['mae'] == 12.0
+        assert result['model_metrics']['rmse'] == 15.0
     
     def test_large_household_warning(self, predictor, mocker):
         """Test: Warning for extrapolation beyond training data (>6 people)"""
@@ -250,3 +255,100 @@ class TestElectricityPredictor:
         details = result['details']
         assert 'weekend_ratio' in details
         assert 0 <= details['weekend_ratio'] <= 1
+
+
+class TestPredictBatch:
+    """Test vectorized batch prediction API"""
+    
+    @pytest.fixture
+    def predictor(self, mocker):
+        """Predictor with a deterministic mock model (no table)"""
+        predictor = ElectricityPredictor(use_prediction_table=False)
+        mock_model = mocker.Mock()
+        mock_model.predict.side_effect = lambda df: 100.0 * df['household_size'].to_numpy() + 200.0 * df['has_ac'].to_numpy()
+        predictor.model = mock_model
+        return predictor
+    
+    def test_list_of_dicts(self, predictor):
+        """Test: List of dicts with mixed formats is parsed like predict()"""
+        result = predictor.predict_batch([
+            {'household_size': 3, 'has_ac': 'มี', 'month': 'เมษายน'},
+            {'household_size': 2, 'has_ac': 'ไม่มี', 'month': 10},
+            {'household_size': 4, 'has_ac': 8.5, 'month': '6'},
+        ])
+        
+        assert result['valid'].all()
+        assert list(result['kwh']) == [500.0, 200.0, 600.0]
+        assert np.allclose(result['amount'], default_tariff().bill(result['kwh']))
+    
+    def test_validation_mask_instead_of_errors(self, predictor, mocker):
+        """Test: Bad rows are masked out, no st.error per row"""
+        mock_error = mocker.patch('streamlit.error')
+        
+        result = predictor.predict_batch(pd.DataFrame({
+            'household_size': [0, 4, 11, 5],
+            'has_ac': [1, 1, 1, 0],
+            'month': [6, 13, 6, 'unknown']
+        }))
+        
+        assert not result['valid'].any()
+        assert np.isnan(result['kwh']).all()
+        mock_error.assert_not_called()
+    
+    def test_month_rules_match_predict(self, predictor):
+        """Test: predict() and predict_batch() accept and reject the same months"""
+        months = [4, 4.0, '4', 'เดือนเมษายน', 4.5, '4.5', 0, 'unknown', None]
+        batch = predictor.predict_batch({'household_size': [3] * len(months), 'has_ac': [1] * len(months),
+                                         'month': months})
+        for month, batch_valid in zip(months, batch['valid']):
+            try:
+                result = PredictionCore.predict(predictor, {'household_size': 3, 'has_ac': 1, 'month': month})
+            except InputValidationError:
+                result = None
+            assert (result is not None) == batch_valid, month
+            if result is not None:
+                assert result['details']['weekend_ratio'] == predictor._calculate_weekend_ratio(2025, 4)
+                assert type(result['kwh']) is float
+
+    def test_same_inputs_same_results(self, predictor):
+        """Test: Identical rows get the same sizes, AC flags and validity in predict() and predict_batch()"""
+        rows = [
+            {'household_size': '3', 'has_ac': '1', 'month': 4},
+            {'household_size': '3.7', 'has_ac': 'มี', 'month': 4},
+            {'household_size': 3.7, 'has_ac': 'ไม่มี', 'month': 4},
+            {'household_size': 2, 'has_ac': '0', 'month': 4},
+            {'household_size': 5, 'has_ac': 0.5, 'month': 4},
+            {'household_size': 4, 'has_ac': None, 'month': 4},
+            {'household_size': 'abc', 'has_ac': 1, 'month': 4},
+            {'household_size': '11', 'has_ac': 1, 'month': 4},
+        ]
+        batch = predictor.predict_batch(rows)
+        for row, kwh, batch_valid in zip(rows, batch['kwh'], batch['valid']):
+            try:
+                result = PredictionCore.predict(predictor, row)
+            except (InputValidationError, PredictionError):
+                result = None
+            assert (result is not None) == batch_valid, row
+            if result is not None:
+                assert result['kwh'] == kwh, row
+
+    def test_numpy_input_and_chunking(self, predictor):
+        """Test: NumPy input is scored with one predict call per chunk"""
+        inputs = np.array([[1, 0, 1], [2, 1, 4], [3, 0, 7], [8, 1, 12], [5, 1, 2]])
+        result = predictor.predict_batch(inputs, chunk_size=2)
+        
+        assert predictor.model.predict.call_count == 3
+        assert list(result['kwh']) == [100.0, 400.0, 300.0, 1000.0, 700.0]
+        assert list(result['extrapolated']) == [False, False, False, True, False]
+    
+    def test_vectorized_features(self, predictor):
+        """Test: Season flags and weekend ratio match the single-row logic"""
+        household, ac, month = np.ones(12, dtype=int), np.zeros(12, dtype=int), np.arange(1, 13)
+        features = predictor._batch_features(household, ac, month)
+        
+        for m in range(1, 13):
+            row = features.iloc[m - 1]
+            season = predictor._get_season(m)
+            assert row['season_hot'] == (season == 'hot')
+            assert row['season_rainy'] == (season == 'rainy')
+            assert row['weekend_ratio'] == pytest.approx(predictor._calculate_weekend_ratio(2025, m))
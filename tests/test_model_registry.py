@@ -0,0 +1,143 @@
+# tests/test_model_registry.py
+"""
+Tests for the file-based model registry and the hot-swappable predictor
+"""
+import os
+import threading
+
+import joblib
+import pytest
+
+from core import HotSwapPredictor, PredictionCore, ResultCache, model_signature
+from core.model_registry import ModelRegistry, registry_for, resolve_model_dir
+from core.predictor import MODEL_FILENAME
+from tests.model_helpers import make_pipeline, predicted_kwh
+
+
+def publish(registry: ModelRegistry, slope: float, **kwargs) -> str:
+    staging = registry.stage()
+    joblib.dump(make_pipeline(slope), os.path.join(staging, MODEL_FILENAME))
+    return registry.publish(staging, source='test', **kwargs)
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return registry_for(str(tmp_path))
+
+
+class TestModelRegistry:
+    """Test versions, the current pointer and the legacy mirror"""
+
+    def test_publish_and_activate(self, registry, tmp_path):
+        """Test: Versions are named by model hash; the pointer moves and can roll back"""
+        assert registry.current() is None
+        first = publish(registry, 100.0)
+        second = publish(registry, 200.0)
+
+        assert first != second and len(first) == 16
+        assert registry.current() == second
+        assert registry.verify(first) and registry.verify(second)
+        assert registry.manifest(second)['model_sha256'].startswith(second)
+        assert not os.listdir(os.path.join(registry.root, '.staging'))
+
+        assert registry.rollback() == first
+        assert registry.current() == first
+        with pytest.raises(ValueError):
+            registry.activate('0' * 16)
+
+    def test_same_model_is_one_version(self, registry):
+        """Test: Republishing identical bytes reuses the version and refreshes its sidecars"""
+        staging = registry.stage()
+        joblib.dump(make_pipeline(100.0), os.path.join(staging, MODEL_FILENAME))
+        with open(os.path.join(staging, MODEL_FILENAME), 'rb') as f:
+            model_bytes = f.read()
+        first = registry.publish(staging)
+
+        staging = registry.stage()
+        with open(os.path.join(staging, MODEL_FILENAME), 'wb') as f:
+            f.write(model_bytes)
+        with open(os.path.join(staging, 'note.txt'), 'w') as f:
+            f.write('sidecar')
+        assert registry.publish(staging) == first
+        assert os.path.exists(os.path.join(registry.version_path(first), 'note.txt'))
+        assert len(registry.versions()) == 1
+
+    def test_mirror_and_prune(self, registry, tmp_path):
+        """Test: mirror_to keeps the legacy file current; prune spares current and previous"""
+        versions = [publish(registry, slope, mirror_to=str(tmp_path)) for slope in (1.0, 2.0, 3.0, 4.0)]
+        legacy = tmp_path / MODEL_FILENAME
+        assert legacy.read_bytes() == open(os.path.join(registry.version_path(versions[-1]), MODEL_FILENAME), 'rb').read()
+
+        removed = registry.prune(keep=1)
+        remaining = {m['version'] for m in registry.versions()}
+        assert versions[-1] in remaining and versions[-2] in remaining
+        assert set(removed) | remaining == set(versions)
+
+
+class TestRegistryServing:
+    """Test loading the current version and hot swapping"""
+
+    def test_predictor_loads_current_version(self, registry, tmp_path):
+        """Test: The core loads the pointer's version, falling back to models/ without one"""
+        joblib.dump(make_pipeline(10.0), tmp_path / MODEL_FILENAME)
+        assert resolve_model_dir(str(tmp_path)) == (str(tmp_path), None)
+
+        version = publish(registry, 100.0)
+        core = PredictionCore(models_path=str(tmp_path), use_prediction_table=False,
+                              use_compiled_model=False, result_cache=ResultCache())
+        assert core.registry_version == version
+        assert predicted_kwh(core) == pytest.approx(400.0, abs=0.5)
+
+    def test_pointer_change_changes_signature(self, registry, tmp_path):
+        """Test: Publishing moves the stat-only model signature"""
+        before = model_signature(str(tmp_path))
+        publish(registry, 100.0)
+        assert model_signature(str(tmp_path)) != before
+
+    def test_hot_swap_never_blocks(self, registry, tmp_path):
+        """Test: refresh() returns while the new model loads; the old one serves until the swap"""
+        publish(registry, 100.0)
+        release = threading.Event()
+        slow_load = {'on': False}
+
+        def factory():
+            if slow_load['on']:
+                assert release.wait(10)
+            return PredictionCore(models_path=str(tmp_path), use_prediction_table=False,
+                                  use_compiled_model=False, result_cache=ResultCache())
+
+        handle = HotSwapPredictor(factory, lambda: model_signature(str(tmp_path)))
+        assert handle.refresh() is False  # nothing changed
+
+        slow_load['on'] = True
+        publish(registry, 200.0)
+        assert handle.refresh() is True
+        assert handle.loading and handle.refresh() is False  # one load at a time
+        assert predicted_kwh(handle.current) == pytest.approx(400.0, abs=0.5)
+
+        release.set()
+        handle.wait(10)
+        assert handle.swaps == 1 and handle.last_error is None
+        assert predicted_kwh(handle.current) == pytest.approx(800.0, abs=0.5)
+
+    def test_failed_load_keeps_old_model(self, registry, tmp_path):
+        """Test: A broken new version is reported and the old predictor keeps serving"""
+        publish(registry, 100.0)
+
+        def factory():
+            return PredictionCore(models_path=str(tmp_path), use_prediction_table=False,
+                                  use_compiled_model=False, result_cache=ResultCache())
+
+        handle = HotSwapPredictor(factory, lambda: model_signature(str(tmp_path)))
+        old = handle.current
+
+        staging = registry.stage()
+        with open(os.path.join(staging, MODEL_FILENAME), 'wb') as f:
+            f.write(b'not a pickle')
+        registry.publish(staging)
+        handle.refresh()
+        handle.wait(10)
+
+        assert handle.current is old and handle.swaps == 0
+        assert handle.last_error
+        assert handle.refresh() is False  # not retried until the files change again
@@ -0,0 +1,108 @@
+# tests/test_model_search.py
+"""
+Tests for the parallel model-family search (training/model_search.py)
+"""
+import json
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LinearRegression, Ridge
+from sklearn.tree import DecisionTreeRegressor
+
+import training.model_search as model_search
+from training.model_search import run_search, best_per_family, build_folds, expand_tasks
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(300, 3))
+    y = X @ np.array([2.0, -1.0, 0.5]) + rng.normal(scale=0.1, size=300)
+    return X, y
+
+
+@pytest.fixture
+def families():
+    return {
+        'Linear': {'model': LinearRegression(), 'params': {}},
+        'Ridge': {'model': Ridge(), 'params': {'alpha': [0.1, 10.0]}},
+        'Tree': {'model': DecisionTreeRegressor(random_state=0), 'params': {'max_depth': [2, 6]}}
+    }
+
+
+class TestSearch:
+    """Test scores and task scheduling"""
+
+    def test_one_task_per_family_params_fold(self, families):
+        """Test: Tasks cover every (family, params, fold)"""
+        assert len(expand_tasks(families, n_splits=3)) == (1 + 2 + 2) * 3
+
+    def test_folds_scaled_on_training_part(self, data):
+        """Test: Each fold's training matrix is standardized"""
+        X, y = data
+        folds = build_folds(X, y, n_splits=3)
+        assert len(folds) == 3
+        for fold in folds:
+            np.testing.assert_allclose(fold['X_train'].mean(axis=0), 0, atol=1e-12)
+            assert len(fold['X_train']) + len(fold['X_val']) == len(X)
+
+    def test_best_per_family(self, data, families):
+        """Test: Linear target -> linear families score near 1, best depth wins for the tree"""
+        X, y = data
+        scores = run_search(X, y, families, n_splits=3, n_jobs=1)
+        assert len(scores) == 5
+        assert scores == sorted(scores, key=lambda s: s.mean_score, reverse=True)
+
+        best = best_per_family(scores)
+        assert set(best) == {'Linear', 'Ridge', 'Tree'}
+        assert best['Linear'].mean_score > 0.99
+        assert best['Tree'].params == {'max_depth': 6}
+
+    def test_process_pool_matches_in_process(self, data, families):
+        """Test: Pool scheduling gives the same scores as running in-process"""
+        X, y = data
+        serial = run_search(X, y, families, n_splits=3, n_jobs=1)
+        parallel = run_search(X, y, families, n_splits=3, n_jobs=2)
+        assert [(s.family, s.params, round(s.mean_score, 10)) for s in serial] == \
+            [(s.family, s.params, round(s.mean_score, 10)) for s in parallel]
+
+
+class TestCheckpoint:
+    """Test resume from the JSONL checkpoint"""
+
+    def test_resume_skips_finished_fits(self, data, families, tmp_path, monkeypatch):
+        """Test: A rerun with the same data fits nothing and returns the same scores"""
+        X, y = data
+        path = str(tmp_path / 'search.jsonl')
+        first = run_search(X, y, families, n_splits=3, n_jobs=1, checkpoint_path=path)
+        with open(path) as f:
+            assert len(f.readlines()) == 15
+
+        def fail(task):
+            raise AssertionError(f"unexpected refit of {task}")
+        monkeypatch.setattr(model_search, '_run_task', fail)
+        assert run_search(X, y, families, n_splits=3, n_jobs=1, checkpoint_path=path) == first
+
+    def test_partial_checkpoint_and_torn_line(self, data, families, tmp_path):
+        """Test: Only missing fits run after an interruption mid-write"""
+        X, y = data
+        path = tmp_path / 'search.jsonl'
+        full = run_search(X, y, families, n_splits=3, n_jobs=1, checkpoint_path=str(path))
+        lines = path.read_text().splitlines()
+        path.write_text('\n'.join(lines[:6]) + '\n{"family": "Tr')
+
+        resumed = run_search(X, y, families, n_splits=3, n_jobs=1, checkpoint_path=str(path))
+        assert [(s.family, s.params) for s in resumed] == [(s.family, s.params) for s in full]
+        # Torn fragment dropped, the 9 missing fits appended as whole lines
+        records = [json.loads(line) for line in path.read_text().splitlines()]
+        assert len(records) == 15
+
+    def test_other_data_ignores_checkpoint(self, data, families, tmp_path):
+        """Test: Records from a different dataset are not reused"""
+        X, y = data
+        path = str(tmp_path / 'search.jsonl')
+        run_search(X, y, families, n_splits=3, n_jobs=1, checkpoint_path=path)
+        scores = run_search(X, -y, families, n_splits=3, n_jobs=1, checkpoint_path=path)
+        with open(path) as f:
+            assert len(f.readlines()) == 30
+        assert best_per_family(scores)['Linear'].mean_score > 0.99
@@ -0,0 +1,90 @@
+# tests/test_model_selection.py
+"""
+Tests for size/latency-aware model selection (training/model_selection.py)
+"""
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+
+from training.model_selection import (
+    ArtifactProfile, Candidate, profile_model, select_model, selection_metadata, write_model_metadata
+)
+
+
+def make_profile(size_bytes, single_ms=1.0):
+    return ArtifactProfile(size_bytes, 1.0, single_ms, single_ms * 2, 10.0, 12.0, 10_000)
+
+
+@pytest.fixture
+def candidates():
+    return [
+        Candidate('Random Forest', None, 0.990, make_profile(2_000_000, single_ms=15.0)),
+        Candidate('Ridge', None, 0.987, make_profile(1_500, single_ms=1.5)),
+        Candidate('Linear Regression', None, 0.9872, make_profile(1_600, single_ms=1.2)),
+        Candidate('Tiny', None, 0.90, make_profile(100, single_ms=0.1))
+    ]
+
+
+class TestProfile:
+    """Test serving cost measurement"""
+
+    def test_profile_linear_vs_forest(self):
+        """Test: A forest is larger and slower than a linear model"""
+        rng = np.random.default_rng(0)
+        X = pd.DataFrame(rng.normal(size=(500, 3)), columns=['a', 'b', 'c'])
+        y = X['a'] * 2 + rng.normal(size=500)
+
+        linear = profile_model(LinearRegression().fit(X, y), X, batch_rows=2000,
+                               single_repeats=20, batch_repeats=3)
+        forest = profile_model(RandomForestRegressor(n_estimators=20, random_state=0).fit(X, y), X,
+                               batch_rows=2000, single_repeats=20, batch_repeats=3)
+
+        assert linear.batch_rows == 2000  # X tiled up to batch_rows
+        assert forest.size_bytes > 10 * linear.size_bytes
+        assert linear.single_p50_ms <= linear.single_p99_ms
+        assert forest.batch_p50_ms > linear.batch_p50_ms
+
+
+class TestSelect:
+    """Test the selection rule"""
+
+    def test_zero_tolerance_is_best_r2(self, candidates):
+        """Test: Default behaviour keeps the best test R²"""
+        assert select_model(candidates).name == 'Random Forest'
+
+    def test_smallest_within_tolerance(self, candidates):
+        """Test: Within 0.005 R² the smallest model wins, outside it never does"""
+        assert select_model(candidates, r2_tolerance=0.005, prefer='size').name == 'Ridge'
+        assert select_model(candidates, r2_tolerance=0.005, prefer='latency').name == 'Linear Regression'
+
+    def test_invalid_arguments(self, candidates):
+        """Test: Unknown criterion, negative tolerance and no candidates are rejected"""
+        with pytest.raises(ValueError):
+            select_model(candidates, 0.01, prefer='colour')
+        with pytest.raises(ValueError):
+            select_model(candidates, -0.1)
+        with pytest.raises(ValueError):
+            select_model([])
+
+
+class TestMetadata:
+    """Test the metadata written next to the model"""
+
+    def test_metadata_lists_every_candidate(self, candidates, tmp_path):
+        """Test: Selection block round-trips through JSON with sizes and latencies"""
+        selected = select_model(candidates, 0.005)
+        path = tmp_path / 'model_metadata.json'
+        write_model_metadata(str(path), {'metrics': {'test_r2': np.float64(0.987)},
+                                         'selection': selection_metadata(candidates, selected, 0.005, 'size')})
+
+        data = json.loads(path.read_text())
+        assert data['metrics']['test_r2'] == pytest.approx(0.987)
+        selection = data['selection']
+        assert selection['selected'] == 'Ridge' and selection['prefer'] == 'size'
+        assert set(selection['candidates']) == {c.name for c in candidates}
+        assert selection['candidates']['Random Forest']['size_bytes'] == 2_000_000
+        assert selection['candidates']['Ridge']['single_p50_ms'] == pytest.approx(1.5)
@@ -0,0 +1,110 @@
+# tests/test_next_month.py
+"""
+Tests for the incremental next-month model (training/next_month.py)
+"""
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import Ridge
+
+from training.next_month import (
+    IncrementalRidge, add_features, clean_rows, complete_examples,
+    load_published, publish, read_pointer
+)
+
+FEATURES = ['current_unit', 'is_break', 'month', 'people', 'lag1_unit']
+
+
+@pytest.fixture
+def sheet():
+    rng = np.random.default_rng(0)
+    dates = pd.date_range('2023-01-01', periods=24, freq='MS')
+    units = rng.integers(60, 160, size=24)
+    return pd.DataFrame({
+        'date': [f'{d.month}/{d.day}/{d.year}' for d in dates],
+        'amount(unit)': units,
+        'electric_price': units * 8,
+        'people': [np.nan if m in (4, 5) else 2 for m in dates.month],
+        'note': ['ปิดเทอม' if m in (4, 5) else np.nan for m in dates.month]
+    })
+
+
+def full_fit(raw):
+    examples = complete_examples(add_features(clean_rows(raw)))
+    return Ridge(alpha=1.0).fit(examples[FEATURES], examples['target_next_bill'])
+
+
+class TestIncrementalRidge:
+    """Test the sufficient-statistics Ridge against sklearn"""
+
+    def test_matches_sklearn(self, sheet):
+        """Test: Solution equals Ridge(alpha=1) fit on the same examples"""
+        state = IncrementalRidge.from_history(clean_rows(sheet), FEATURES)
+        expected = full_fit(sheet)
+
+        model = state.to_model()
+        np.testing.assert_allclose(model.coef_, expected.coef_, rtol=1e-8)
+        assert model.intercept_ == pytest.approx(expected.intercept_)
+        assert list(model.feature_names_in_) == FEATURES
+
+    def test_append_equals_full_refit(self, sheet):
+        """Test: Appending months one by one gives the refit-on-everything model"""
+        state = IncrementalRidge.from_history(clean_rows(sheet.iloc[:18]), FEATURES)
+        for i in range(18, 24):
+            result = state.append(sheet.iloc[[i]])
+            assert result['rows_added'] == 1
+            assert result['examples_added'] == 1  # the previous month gets its target
+            assert len(result['errors']) == 1
+
+        expected = full_fit(sheet)
+        assert state.n == len(complete_examples(add_features(clean_rows(sheet))))
+        np.testing.assert_allclose(state.to_model().coef_, expected.coef_, rtol=1e-8)
+
+    def test_append_keeps_only_tail(self, sheet):
+        """Test: State keeps 3 raw rows; lags of new rows come from them"""
+        state = IncrementalRidge.from_history(clean_rows(sheet.iloc[:10]), FEATURES)
+        state.append(sheet.iloc[10:12])
+
+        assert len(state.tail) == 3
+        assert [row['amount(unit)'] for row in state.tail] == list(sheet['amount(unit)'].iloc[9:12])
+
+    def test_rejects_old_months(self, sheet):
+        """Test: A month at or before the last one seen raises ValueError"""
+        state = IncrementalRidge.from_history(clean_rows(sheet.iloc[:10]), FEATURES)
+        with pytest.raises(ValueError):
+            state.append(sheet.iloc[[9]])
+
+    def test_state_round_trip(self, sheet):
+        """Test: to_state/from_state preserves the solution and the tail"""
+        state = IncrementalRidge.from_history(clean_rows(sheet), FEATURES)
+        restored = IncrementalRidge.from_state(state.to_state())
+
+        np.testing.assert_allclose(restored.solve()[0], state.solve()[0])
+        assert restored.tail == state.tail
+
+
+class TestPublish:
+    """Test versioned publishing"""
+
+    def test_versions_and_pointer(self, sheet, tmp_path):
+        """Test: Each publish adds a version, moves the pointer and refreshes the model path"""
+        base = str(tmp_path / 'model.pkl')
+        state = IncrementalRidge.from_history(clean_rows(sheet.iloc[:20]), FEATURES)
+
+        first = publish(state, base, info={'test_mae': 1.5})
+        state.append(sheet.iloc[20:])
+        second = publish(state, base)
+
+        assert (first['version'], second['version']) == (1, 2)
+        assert read_pointer(base)['version'] == 2
+        assert (tmp_path / 'model.versions' / 'v000001.pkl').exists()
+        assert first['test_mae'] == 1.5
+
+        served = joblib.load(base)
+        np.testing.assert_allclose(served.coef_, state.to_model().coef_)
+        assert load_published(base).n == state.n
+
+    def test_nothing_published(self, tmp_path):
+        """Test: No pointer -> None"""
+        assert load_published(str(tmp_path / 'model.pkl')) is None
@@ -0,0 +1,98 @@
+# tests/test_outliers.py
+"""
+Tests for the vectorized IQR outlier filter (training/outliers.py)
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from training.outliers import (
+    ColumnQuantileSketch, QuantileSketch, filter_outliers, iqr_bounds, merge_reports, outlier_mask
+)
+
+COLUMNS = ['a', 'b']
+
+
+@pytest.fixture
+def frame():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({'a': rng.normal(size=1000), 'b': rng.normal(size=1000), 'c': 1})
+    df.loc[[0, 1], 'a'] = 50.0   # outliers in a
+    df.loc[[1, 2], 'b'] = -50.0  # row 1 fails both columns
+    return df
+
+
+class TestFilterOutliers:
+    """Test the combined-mask filter"""
+
+    def test_bounds_match_per_column_quantiles(self, frame):
+        """Test: One quantile call gives the same bounds as per-column quantile()"""
+        bounds = iqr_bounds(frame, COLUMNS)
+        for i, col in enumerate(COLUMNS):
+            q1, q3 = frame[col].quantile(0.25), frame[col].quantile(0.75)
+            assert bounds.lower[i] == pytest.approx(q1 - 1.5 * (q3 - q1))
+            assert bounds.upper[i] == pytest.approx(q3 + 1.5 * (q3 - q1))
+
+    def test_counts_per_column(self, frame):
+        """Test: Removed counts go to the first failing column and sum to the total"""
+        _, report = filter_outliers(frame, COLUMNS)
+        flagged = report.flagged
+        assert flagged['a'] >= 2 and flagged['b'] >= 2
+        assert sum(report.removed.values()) == report.total_removed
+        assert report.removed['b'] == flagged['b'] - 1  # row 1 counted under a
+
+    def test_matches_explicit_mask(self, frame):
+        """Test: Kept rows are exactly those inside every column's bounds"""
+        clean, _ = filter_outliers(frame, COLUMNS)
+        bounds = iqr_bounds(frame, COLUMNS)
+        expected = frame[frame['a'].between(bounds.lower[0], bounds.upper[0])
+                         & frame['b'].between(bounds.lower[1], bounds.upper[1])]
+        pd.testing.assert_frame_equal(clean, expected)
+
+    def test_missing_value_is_removed(self, frame):
+        """Test: NaN fails the check, as in the old >=/<= filter"""
+        frame.loc[5, 'a'] = np.nan
+        keep, _ = outlier_mask(frame, iqr_bounds(frame, COLUMNS))
+        assert not keep[5]
+
+    def test_chunk_reports_merge(self, frame):
+        """Test: Filtering chunks with shared bounds adds up to the whole-frame report"""
+        bounds = iqr_bounds(frame, COLUMNS)
+        _, whole = filter_outliers(frame, COLUMNS, bounds=bounds)
+        parts = [filter_outliers(frame.iloc[i:i + 300], COLUMNS, bounds=bounds)[1]
+                 for i in range(0, len(frame), 300)]
+        assert merge_reports(parts) == whole
+
+
+class TestQuantileSketch:
+    """Test streaming approximate quantiles"""
+
+    def test_close_to_exact(self):
+        """Test: Quartiles of 200k values within 1% rank error; memory stays bounded"""
+        rng = np.random.default_rng(1)
+        values = rng.lognormal(size=200_000)
+        sketch = QuantileSketch(size=1024)
+        for chunk in np.array_split(values, 37):
+            sketch.update(chunk)
+
+        estimates = sketch.quantiles([0.25, 0.5, 0.75])
+        ranks = np.searchsorted(np.sort(values), estimates) / len(values)
+        np.testing.assert_allclose(ranks, [0.25, 0.5, 0.75], atol=0.01)
+        assert sum(len(level) for level in sketch.levels) < 4 * 1024
+
+    def test_small_input_is_exact(self):
+        """Test: Below the level size nothing is compacted"""
+        sketch = QuantileSketch(size=100)
+        sketch.update(np.arange(1, 11, dtype=float))
+        assert sketch.quantiles([0.5])[0] == 5.0
+        assert np.isnan(QuantileSketch().quantiles([0.5])[0])
+
+    def test_column_bounds(self, frame):
+        """Test: Sketch bounds keep nearly the same rows as exact bounds"""
+        sketch = ColumnQuantileSketch(COLUMNS, size=128)
+        for i in range(0, len(frame), 100):
+            sketch.update(frame.iloc[i:i + 100])
+
+        _, approx = filter_outliers(frame, COLUMNS, bounds=sketch.iqr_bounds())
+        _, exact = filter_outliers(frame, COLUMNS)
+        assert abs(approx.rows_out - exact.rows_out) <= 10
@@ -0,0 +1,109 @@
+# tests/test_prediction_table.py
+"""
+Tests for the precomputed 240-cell prediction table
+"""
+import pytest
+import numpy as np
+from core.prediction_table import (
+    PredictionTable, TABLE_SHAPE, fingerprint_file, input_grid, table_path_for
+)
+from utils.model_predictor import ElectricityPredictor
+
+
+class LinearStub:
+    """Deterministic model: kWh = 100*size + 200*ac + month"""
+    def __init__(self):
+        self.calls = 0
+
+    def predict(self, X):
+        self.calls += 1
+        X = np.asarray(X, dtype=float)
+        return 100 * X[:, 0] + 200 * X[:, 1] + X[:, 2]
+
+
+class TestPredictionTable:
+    """Test table build, lookup and fingerprinting"""
+
+    def test_input_grid_covers_space(self):
+        """Test: Grid enumerates all 240 combinations in table order"""
+        household, ac, month = input_grid()
+        assert len(household) == 240
+        assert len(set(zip(household, ac, month))) == 240
+        assert (household[0], ac[0], month[0]) == (1, 0, 1)
+        assert (household[-1], ac[-1], month[-1]) == (10, 1, 12)
+
+    def test_build_uses_single_batched_call(self):
+        """Test: All cells are evaluated in one predict call"""
+        model = LinearStub()
+        household, ac, month = input_grid()
+        table = PredictionTable.build(model, np.column_stack([household, ac, month]), 'abc')
+
+        assert model.calls == 1
+        assert table.kwh.shape == TABLE_SHAPE
+        assert table.lookup(3, 1, 4) == 100 * 3 + 200 + 4
+        assert table.lookup(10, 0, 12) == 1000 + 12
+
+    def test_rejects_wrong_shape(self):
+        """Test: Table refuses predictions that do not cover the space"""
+        with pytest.raises(ValueError):
+            PredictionTable(np.zeros(10), 'abc')
+
+    def test_save_and_load_roundtrip(self, tmp_path):
+        """Test: Saved table loads back only with a matching fingerprint"""
+        table = PredictionTable(np.arange(240, dtype=float).reshape(TABLE_SHAPE), 'v1')
+        path = str(tmp_path / 'model.table.npz')
+        table.save(path)
+
+        loaded = PredictionTable.load(path, 'v1')
+        assert loaded is not None
+        assert np.array_equal(loaded.kwh, table.kwh)
+
+        # Stale table is never served
+        assert PredictionTable.load(path, 'v2') is None
+
+    def test_fingerprint_changes_with_model_file(self, tmp_path):
+        """Test: Fingerprint follows model file content"""
+        model_file = tmp_path / 'model.pkl'
+        model_file.write_bytes(b'model-a')
+        first = fingerprint_file(str(model_file))
+        model_file.write_bytes(b'model-b')
+        assert fingerprint_file(str(model_file)) != first
+        assert table_path_for(str(model_file)).endswith('model.table.npz')
+
+
+class TestPredictorTableMode:
+    """Test ElectricityPredictor serving from the table"""
+
+    def test_predict_serves_from_table(self, mocker):
+        """Test: With a table, predict never calls the model"""
+        predictor = ElectricityPredictor(use_prediction_table=False)
+        mock_model = mocker.Mock()
+        predictor.model = mock_model
+        predictor.table = PredictionTable(np.full(TABLE_SHAPE, 321.0), 'abc')
+
+        result = predictor.predict({'household_size': 4, 'has_ac': 1, 'month': 6})
+
+        assert result['kwh'] == 321.0
+        mock_model.predict.assert_not_called()
+
+    def test_replacing_model_drops_table(self, mocker):
+        """Test: Swapping the model invalidates the table"""
+        predictor = ElectricityPredictor(use_prediction_table=False)
+        predictor.table = PredictionTable(np.full(TABLE_SHAPE, 321.0), 'abc')
+
+        predictor.model = mocker.Mock()
+        assert predictor.table is None
+
+    def test_table_matches_model(self):
+        """Test: Table built from the real model matches per-call predictions"""
+        predictor = ElectricityPredictor()
+        if predictor.table is None:
+            pytest.skip("Model file not available")
+
+        direct = ElectricityPredictor(use_prediction_table=False)
+        for inputs in [
+            {'household_size': 1, 'has_ac': 0, 'month': 1},
+            {'household_size': 4, 'has_ac': 1, 'month': 6},
+            {'household_size': 10, 'has_ac': 1, 'month': 12},
+        ]:
+            assert predictor.predict(inputs)['kwh'] == direct.predict(inputs)['kwh']
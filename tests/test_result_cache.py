@@ -0,0 +1,85 @@
+# tests/test_result_cache.py
+"""
+Tests for the process-wide prediction result cache
+"""
+import pytest
+import numpy as np
+from core import PredictionCore, ResultCache
+
+
+class TestResultCache:
+    """Test LRU bounds and counters"""
+
+    def test_counts_hits_and_misses(self):
+        """Test: Lookups are counted and hit rate reported"""
+        cache = ResultCache(max_entries=4)
+        assert cache.get('a') is None
+        cache.put('a', {'kwh': 1})
+        assert cache.get('a') == {'kwh': 1}
+
+        stats = cache.stats()
+        assert (stats['hits'], stats['misses'], stats['size']) == (1, 1, 1)
+        assert stats['hit_rate'] == 0.5
+
+    def test_evicts_least_recently_used(self):
+        """Test: Size stays bounded and evictions are counted"""
+        cache = ResultCache(max_entries=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        cache.get('a')
+        cache.put('c', 3)
+
+        assert len(cache) == 2
+        assert cache.get('b') is None
+        assert cache.get('a') == 1
+        assert cache.stats()['evictions'] == 1
+
+    def test_rejects_empty_cache(self):
+        """Test: A cache must hold at least one entry"""
+        with pytest.raises(ValueError):
+            ResultCache(max_entries=0)
+
+
+class TestPredictorCaching:
+    """Test PredictionCore.predict goes through the cache"""
+
+    @pytest.fixture
+    def core(self, mocker):
+        core = PredictionCore(use_prediction_table=False, result_cache=ResultCache())
+        core.model = mocker.Mock()
+        core.model.predict.return_value = np.array([300.0])
+        return core
+
+    def test_equivalent_inputs_share_entry(self, core):
+        """Test: Canonicalized inputs hit the same entry, model called once"""
+        first = core.predict({'household_size': 3, 'has_ac': 'มี', 'month': 'เมษายน'})
+        second = core.predict({'household_size': '3', 'has_ac': 1, 'month': 4})
+
+        assert first == second
+        assert core.model.predict.call_count == 1
+        assert core.result_cache.stats()['hits'] == 1
+
+    def test_cached_result_not_shared_by_reference(self, core):
+        """Test: Mutating a returned result does not corrupt the cache"""
+        inputs = {'household_size': 3, 'has_ac': 1, 'month': 4}
+        core.predict(inputs)['warnings'].append('mutated')
+
+        assert core.predict(inputs)['warnings'] == []
+
+    def test_new_model_invalidates_entries(self, core, mocker):
+        """Test: Swapping the model never serves the old model's results"""
+        inputs = {'household_size': 3, 'has_ac': 1, 'month': 4}
+        before = core.predict(inputs)
+
+        core.model = mocker.Mock()
+        core.model.predict.return_value = np.array([500.0])
+
+        assert core.predict(inputs)['kwh'] != before['kwh']
+
+    def test_validation_errors_not_cached(self, core):
+        """Test: Invalid inputs raise every time"""
+        from core import InputValidationError
+        for _ in range(2):
+            with pytest.raises(InputValidationError):
+                core.predict({'household_size': 0, 'has_ac': 1, 'month': 4})
+        assert len(core.result_cache) == 0
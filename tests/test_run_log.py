@@ -0,0 +1,90 @@
+# tests/test_run_log.py
+"""
+Tests for training run records (training/run_log.py)
+"""
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.linear_model import LinearRegression
+
+from training.run_log import (
+    RunRecorder, dataset_hash, read_run_log, last_record, format_run_record
+)
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    X = pd.DataFrame(rng.normal(size=(200, 2)), columns=['household_size', 'has_ac'])
+    y = pd.Series(X['household_size'] * 3 + rng.normal(size=200), name='energy_consumption_kwh')
+    return X, y
+
+
+class TestDatasetHash:
+    """Test the dataset identity"""
+
+    def test_hash_tracks_content(self, data):
+        """Test: Same data same hash; changed value or column name changes it"""
+        X, y = data
+        assert dataset_hash(X, y) == dataset_hash(X.copy(), y.copy())
+        assert dataset_hash(X, y) == dataset_hash(X.set_index(X.index + 100), y.set_axis(y.index + 100))
+
+        changed = X.copy()
+        changed.iloc[0, 0] += 1
+        assert dataset_hash(changed, y) != dataset_hash(X, y)
+        assert dataset_hash(X.rename(columns={'has_ac': 'ac'}), y) != dataset_hash(X, y)
+
+
+class TestRunRecorder:
+    """Test record contents and the append-only log"""
+
+    def test_record_fields(self, data, tmp_path):
+        """Test: Record has dataset, per-family fit time, memory, bytes and latency percentiles"""
+        X, y = data
+        log_path = str(tmp_path / 'run_log.jsonl')
+        model_path = str(tmp_path / 'model.pkl')
+
+        recorder = RunRecorder('train_test.py', X, y, log_path=log_path)
+        with recorder.time_fit('Linear Regression'):
+            model = LinearRegression().fit(X, y)
+        recorder.add_search_time('Linear Regression', 0.5)
+        joblib.dump(model, model_path)
+        record = recorder.finish(model, X, model_path=model_path, metrics={'test_r2': 0.9})
+
+        assert record['dataset']['features'] == ['household_size', 'has_ac']
+        assert record['dataset']['target'] == 'energy_consumption_kwh'
+        assert record['dataset']['rows'] == 200
+        assert record['fit_seconds']['Linear Regression'] > 0
+        assert record['search_seconds'] == {'Linear Regression': 0.5}
+        assert record['model']['type'] == 'LinearRegression'
+        assert len(record['model']['sha256']) == 64
+        latency = record['latency']
+        assert latency['single_row']['p50_ms'] <= latency['single_row']['p99_ms']
+        assert latency['batch_10000']['p50_ms'] > 0
+        assert record['metrics'] == {'test_r2': 0.9}
+
+    def test_log_is_append_only(self, data, tmp_path):
+        """Test: Each run appends a line; a torn last line is skipped"""
+        X, y = data
+        log_path = tmp_path / 'run_log.jsonl'
+        model = LinearRegression().fit(X, y)
+
+        first = RunRecorder('a.py', X, y, log_path=str(log_path)).finish(model, X)
+        second = RunRecorder('b.py', X, y, log_path=str(log_path)).finish(model, X)
+        with open(log_path, 'a') as f:
+            f.write('{"run_id": "tor')
+
+        records = read_run_log(str(log_path))
+        assert [r['run_id'] for r in records] == [first['run_id'], second['run_id']]
+        assert last_record(str(log_path), 'a.py')['run_id'] == first['run_id']
+
+    def test_summary_compares_with_previous(self, data, tmp_path):
+        """Test: The printed summary shows the change against the previous run"""
+        X, y = data
+        model = LinearRegression().fit(X, y)
+        record = RunRecorder('a.py', X, y, log_path=str(tmp_path / 'log.jsonl')).build(model, X)
+        previous = dict(record, model=dict(record['model'], bytes=record['model']['bytes'] * 2))
+
+        assert 'vs previous' not in format_run_record(record)
+        assert '-50% vs previous' in format_run_record(record, previous)
@@ -0,0 +1,140 @@
+# tests/test_session_store.py
+"""
+Tests for the server-side conversation session store
+"""
+import pytest
+import streamlit as st
+from conversation.manager import ConversationManager
+from conversation.session_store import (
+    MemorySessionStore, SQLiteSessionStore, create_session_store,
+    compact_message, expand_message, empty_record, MAX_MESSAGES, MAX_HISTORY
+)
+
+
+class FakeClock:
+    """Manually advanced time source"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(params=['memory', 'sqlite'])
+def store_and_clock(request, tmp_path):
+    clock = FakeClock()
+    if request.param == 'memory':
+        store = MemorySessionStore(max_sessions=3, ttl_seconds=60, clock=clock)
+    else:
+        store = SQLiteSessionStore(str(tmp_path / 'sessions.db'), ttl_seconds=60, clock=clock)
+    return store, clock
+
+
+class TestSessionStore:
+    """Test both backends behave the same"""
+
+    def test_roundtrip(self, store_and_clock):
+        """Test: Stored record is returned for the same session only"""
+        store, _ = store_and_clock
+        store.put('a', {'messages': [['u', 'hi', '10:00']], 'history': []})
+
+        assert store.get('a')['messages'] == [['u', 'hi', '10:00']]
+        assert store.get('b') == empty_record()
+
+    def test_caps_applied(self, store_and_clock):
+        """Test: Messages and history are capped per session"""
+        store, _ = store_and_clock
+        store.put('a', {
+            'messages': [['u', str(i), ''] for i in range(MAX_MESSAGES + 20)],
+            'history': [{'predicted_bill': i} for i in range(MAX_HISTORY + 5)]
+        })
+        record = store.get('a')
+
+        assert len(record['messages']) == MAX_MESSAGES
+        assert record['messages'][-1][1] == str(MAX_MESSAGES + 19)
+        assert len(record['history']) == MAX_HISTORY
+
+    def test_idle_sessions_expire(self, store_and_clock):
+        """Test: Sessions idle past the TTL are dropped"""
+        store, clock = store_and_clock
+        store.put('a', {'messages': [['u', 'hi', '']], 'history': []})
+
+        clock.now = 30
+        assert store.get('a')['messages']  # access refreshes the TTL
+        clock.now = 80
+        assert store.get('a')['messages']
+        clock.now = 200
+        store.put('b', empty_record())
+        assert store.get('a') == empty_record()
+        assert len(store) == 1
+
+
+class TestMemoryStoreLRU:
+    """Test process-wide session bound"""
+
+    def test_least_recently_used_evicted(self):
+        """Test: Oldest session is evicted beyond max_sessions"""
+        store = MemorySessionStore(max_sessions=2, ttl_seconds=60, clock=FakeClock())
+        store.put('a', empty_record())
+        store.put('b', empty_record())
+        store.get('a')
+        store.put('c', empty_record())
+
+        assert len(store) == 2
+        assert 'b' not in store._records
+        assert 'a' in store._records
+
+
+class TestCompactMessages:
+    """Test compact message records"""
+
+    def test_compact_roundtrip(self):
+        """Test: Compact record expands back to the UI dict"""
+        message = {'role': 'assistant', 'content': 'สวัสดี', 'timestamp': '10:00'}
+        assert compact_message(message) == ['a', 'สวัสดี', '10:00']
+        assert expand_message(compact_message(message)) == message
+
+    def test_create_from_spec(self, tmp_path):
+        """Test: Backend selected from spec string"""
+        assert isinstance(create_session_store('memory'), MemorySessionStore)
+        assert isinstance(create_session_store(f"sqlite:{tmp_path / 's.db'}"), SQLiteSessionStore)
+        with pytest.raises(ValueError):
+            create_session_store('redis://x')
+
+
+class TestManagerHistory:
+    """Test ConversationManager keeps history bounded"""
+
+    @pytest.fixture
+    def manager(self, mocker):
+        class SessionState(dict):
+            def __getattr__(self, key):
+                if key in self:
+                    return self[key]
+                raise AttributeError(key)
+
+            def __setattr__(self, key, value):
+                self[key] = value
+
+        mocker.patch('streamlit.session_state', SessionState())
+        return ConversationManager(store=MemorySessionStore())
+
+    def test_history_capped_after_many_predictions(self, manager):
+        """Test: Repeated predictions never grow history past the cap"""
+        st.session_state.user_inputs = {'household_size': 3}
+        for i in range(MAX_HISTORY * 3):
+            st.session_state.current_prediction = {'amount': float(i)}
+            manager.save_to_history()
+
+        assert len(manager.chat_history) == MAX_HISTORY
+        assert manager.chat_history[-1]['predicted_bill'] == MAX_HISTORY * 3 - 1
+        assert 'chat_history' not in st.session_state
+        assert 'messages' not in st.session_state
+
+    def test_messages_live_in_store(self, manager):
+        """Test: Messages are stored compactly, not in session state"""
+        manager.start_conversation()
+        record = manager.store.get(st.session_state.session_id)
+
+        assert record['messages'][0][0] == 'a'
+        assert manager.messages[0]['role'] == 'assistant'
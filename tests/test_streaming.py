@@ -0,0 +1,94 @@
+# tests/test_streaming.py
+"""
+Tests for chunked streaming preprocessing (training/streaming.py)
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from training.streaming import hash_split, stream_pipeline, list_shards, iter_shards, ShardWriter
+from training.feature_pipeline import OUTPUT_COLUMNS
+
+
+@pytest.fixture
+def raw_csv(tmp_path):
+    """Small raw export with household_id/date keys"""
+    n = 2000
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'Household_ID': [f'H{i % 100:03d}' for i in range(n)],
+        'Date': (np.datetime64('2024-01-01') + np.arange(n) // 100).astype(str),
+        'Energy_Consumption_kWh': rng.uniform(1, 30, n).round(2),
+        'Household_Size': rng.integers(1, 8, n),
+        'Has_AC': rng.choice(['Yes', 'No'], n)
+    })
+    path = tmp_path / 'raw.csv'
+    df.to_csv(path, index=False)
+    return str(path)
+
+
+def read_split(output_dir, split):
+    return pd.concat(iter_shards(output_dir, split), ignore_index=True)
+
+
+class TestHashSplit:
+    """Test deterministic train/test assignment"""
+
+    def test_fraction_and_determinism(self):
+        """Test: About test_fraction of keys go to test, same every call"""
+        keys = pd.DataFrame({'id': np.arange(20_000)})
+        first = hash_split(keys, 0.2)
+
+        assert np.array_equal(first, hash_split(keys, 0.2))
+        assert 0.18 < first.mean() < 0.22
+
+    def test_independent_of_row_order(self):
+        """Test: A key's split does not depend on its position"""
+        keys = pd.DataFrame({'id': np.arange(1000)})
+        shuffled = keys.sample(frac=1, random_state=0)
+
+        assert np.array_equal(hash_split(keys, 0.3)[shuffled.index], hash_split(shuffled, 0.3))
+
+    def test_rejects_bad_fraction(self):
+        """Test: Fraction outside [0, 1] is rejected"""
+        with pytest.raises(ValueError):
+            hash_split(pd.DataFrame({'id': [1]}), 1.5)
+
+
+class TestStreamPipeline:
+    """Test chunked processing into shards"""
+
+    def test_split_same_for_any_chunk_size(self, raw_csv, tmp_path):
+        """Test: Chunk size changes the shard count, not the split"""
+        small = stream_pipeline(raw_csv, str(tmp_path / 'small'), chunk_size=300)
+        large = stream_pipeline(raw_csv, str(tmp_path / 'large'), chunk_size=5000)
+
+        assert small['chunks'] == 7 and large['chunks'] == 1
+        assert small['rows_written'] == large['rows_written']
+        assert len(list_shards(str(tmp_path / 'small'), 'train')) == 7
+
+        small_test = read_split(str(tmp_path / 'small'), 'test')
+        large_test = read_split(str(tmp_path / 'large'), 'test')
+        assert np.allclose(np.sort(small_test['energy_consumption_kwh']),
+                           np.sort(large_test['energy_consumption_kwh']))
+
+    def test_shards_have_model_columns(self, raw_csv, tmp_path):
+        """Test: Shards hold the final feature/target columns"""
+        result = stream_pipeline(raw_csv, str(tmp_path / 'out'), chunk_size=1000)
+        train = read_split(str(tmp_path / 'out'), 'train')
+
+        assert list(train.columns) == OUTPUT_COLUMNS
+        assert sum(result['rows_written'].values()) == result['rows_read']
+        assert [t.name for t in result['timings']][0] == 'standardize_columns'
+
+    def test_shards_are_append_only(self, raw_csv, tmp_path):
+        """Test: A second run appends new shards instead of overwriting"""
+        output_dir = str(tmp_path / 'out')
+        stream_pipeline(raw_csv, output_dir, chunk_size=1000)
+        first = list_shards(output_dir, 'train')
+        stream_pipeline(raw_csv, output_dir, chunk_size=1000)
+
+        shards = list_shards(output_dir, 'train')
+        assert len(shards) == 2 * len(first)
+        assert shards[:len(first)] == first
+        assert ShardWriter(output_dir).next_index['train'] == len(shards)
@@ -0,0 +1,107 @@
+# tests/test_style_registry.py
+"""
+Tests for the style registry (CSS built once per process, sent once per session)
+"""
+import pytest
+import streamlit as st
+from utils import style_registry
+from utils.style_registry import (
+    emit_style, emit_styles, file_css, theme_css, strip_style_tags, SESSION_KEY
+)
+
+
+@pytest.fixture
+def mock_html(mocker):
+    """Fresh session and captured component payloads"""
+    st.session_state.pop(SESSION_KEY, None)
+    yield mocker.patch('utils.style_registry.components.html')
+    st.session_state.pop(SESSION_KEY, None)
+
+
+class TestCssCache:
+    """Test process-wide CSS caching"""
+
+    def test_theme_css_generated_once(self, mocker):
+        """Test: generate_css runs once per theme content"""
+        import utils.theme_system as theme_system
+        style_registry._css_cache.clear()
+        spy = mocker.spy(theme_system, 'generate_css')
+
+        first = theme_css('dark')
+        second = theme_css('dark')
+
+        assert first is second
+        assert spy.call_count == 1
+
+    def test_file_css_invalidated_on_change(self, tmp_path):
+        """Test: Editing the stylesheet is picked up"""
+        path = tmp_path / 'styles.css'
+        path.write_text('body { color: red; }')
+        assert 'red' in file_css(str(path))
+
+        path.write_text('body { color: blue; } /* longer */')
+        assert 'blue' in file_css(str(path))
+        assert file_css(str(tmp_path / 'missing.css')) == ''
+
+    def test_strip_style_tags(self):
+        """Test: <style> wrapper is removed, bare CSS kept"""
+        assert strip_style_tags('\n  <style>\na { b: c; }\n</style>\n  ').strip() == 'a { b: c; }'
+        assert strip_style_tags('a { b: c; }') == 'a { b: c; }'
+
+
+class TestEmitOncePerSession:
+    """Test styles are sent to the browser once per session"""
+
+    def test_second_run_sends_nothing(self, mock_html):
+        """Test: Re-emitting the same style on a rerun is a no-op"""
+        assert emit_style('message', '<style>.a { color: red; }</style>')
+        assert not emit_style('message', '<style>.a { color: red; }</style>')
+        assert mock_html.call_count == 1
+
+    def test_changed_css_is_resent(self, mock_html):
+        """Test: New content for the same name gets a new id"""
+        emit_style('message', '.a { color: red; }')
+        assert emit_style('message', '.a { color: blue; }')
+        assert mock_html.call_count == 2
+
+    def test_batch_uses_one_component(self, mock_html):
+        """Test: Several pending styles share one component"""
+        sent = emit_styles({'one': '.a {}', 'two': '.b {}'})
+
+        assert sent == ['one', 'two']
+        assert mock_html.call_count == 1
+        assert mock_html.call_args.kwargs['height'] == 0
+
+    def test_payload_cannot_close_script(self, mock_html):
+        """Test: '</script>' inside CSS is escaped in the injected script"""
+        emit_style('evil', '.a { content: "</script>"; }')
+        html = mock_html.call_args[0][0]
+        assert html.count('</script>') == 1
+
+    def test_landing_css_not_resent(self, mock_html, mocker):
+        """Test: The landing page stylesheet goes through the registry, not st.markdown"""
+        from components.landing import render_landing_page
+        mock_markdown = mocker.patch('streamlit.markdown')
+        mocker.patch('streamlit.columns', return_value=[mocker.MagicMock() for _ in range(3)])
+        mocker.patch('streamlit.button', return_value=False)
+
+        render_landing_page()
+        render_landing_page()
+
+        assert mock_html.call_count == 1
+        assert not any('<style>' in call.args[0] for call in mock_markdown.call_args_list)
+
+    def test_loading_overlay_css_not_resent(self, mock_html, mocker):
+        """Test: The loading overlay sends its stylesheet once; reruns only send the markup"""
+        from utils.js_injector import inject_loading_overlay
+        mock_markdown = mocker.patch('streamlit.markdown')
+        st.session_state['is_processing'] = True
+        try:
+            inject_loading_overlay()
+            inject_loading_overlay()
+        finally:
+            st.session_state.pop('is_processing', None)
+
+        assert mock_html.call_count == 1
+        assert mock_markdown.call_count == 2
+        assert not any('<style>' in call.args[0] for call in mock_markdown.call_args_list)
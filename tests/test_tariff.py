@@ -0,0 +1,108 @@
+# tests/test_tariff.py
+"""
+Tests for the tiered tariff engine (core/tariff.py)
+"""
+import numpy as np
+import pytest
+
+from core.tariff import Tariff, TariffSchedule, default_tariff
+
+SIMPLE = {
+    'name': 'test',
+    'ft_per_kwh': 0.5,
+    'vat_rate': 0.1,
+    'schedules': [
+        {'name': 'small', 'max_kwh': 50, 'service_charge': 5,
+         'blocks': [[20, 1.0], [None, 2.0]]},
+        {'name': 'large', 'max_kwh': None, 'service_charge': 10,
+         'blocks': [[100, 3.0], [200, 4.0], [None, 5.0]]}
+    ]
+}
+
+
+def reference_bill(kwh, data=SIMPLE):
+    """Straightforward per-value loop over the blocks"""
+    schedule = next(s for s in data['schedules'] if s['max_kwh'] is None or kwh <= s['max_kwh'])
+    energy, lower = 0.0, 0.0
+    for upper, rate in schedule['blocks']:
+        upper = np.inf if upper is None else upper
+        energy += max(min(kwh, upper) - lower, 0) * rate
+        lower = upper
+    return (energy + kwh * data['ft_per_kwh'] + schedule['service_charge']) * (1 + data['vat_rate'])
+
+
+class TestTariffSchedule:
+    """Test the compiled block arrays"""
+
+    def test_cumulative_blocks(self):
+        """Test: Cumulative charge at each block start"""
+        schedule = TariffSchedule('s', [(100, 3.0), (200, 4.0), (None, 5.0)])
+        np.testing.assert_array_equal(schedule.edges, [0, 100, 200])
+        np.testing.assert_array_equal(schedule.cumulative, [0, 300, 700])
+        assert schedule.energy_charge(250) == 950
+
+    def test_invalid_blocks(self):
+        """Test: Closed last block or non-increasing limits raise ValueError"""
+        with pytest.raises(ValueError):
+            TariffSchedule('s', [(100, 3.0)])
+        with pytest.raises(ValueError):
+            TariffSchedule('s', [(100, 3.0), (50, 4.0), (None, 5.0)])
+
+
+class TestTariff:
+    """Test whole-bill pricing"""
+
+    def test_matches_reference(self):
+        """Test: Vectorized bills equal a per-value block loop, across schedule and block edges"""
+        tariff = Tariff.from_dict(SIMPLE)
+        kwh = np.array([0, 10, 20, 35, 50, 50.5, 100, 150, 200, 999])
+        expected = [reference_bill(k) for k in kwh]
+        np.testing.assert_allclose(tariff.bill(kwh), expected)
+        assert tariff.bill(35.0) == pytest.approx(reference_bill(35.0))
+
+    def test_breakdown_sums_to_total(self):
+        """Test: energy + ft + service + vat == total"""
+        parts = Tariff.from_dict(SIMPLE).breakdown(np.array([10.0, 150.0]))
+        np.testing.assert_allclose(parts['energy'] + parts['ft'] + parts['service'] + parts['vat'],
+                                   parts['total'])
+        np.testing.assert_array_equal(parts['schedule'], [0, 1])
+
+    def test_nan_and_negative(self):
+        """Test: NaN stays NaN (invalid batch rows), negative kWh priced as 0"""
+        tariff = Tariff.from_dict(SIMPLE)
+        bills = tariff.bill(np.array([np.nan, -5.0]))
+        assert np.isnan(bills[0])
+        assert bills[1] == pytest.approx(tariff.bill(0.0))
+
+    def test_fingerprint_tracks_data(self):
+        """Test: Changing a rate changes the fingerprint"""
+        changed = dict(SIMPLE, ft_per_kwh=0.6)
+        assert Tariff.from_dict(SIMPLE).fingerprint != Tariff.from_dict(changed).fingerprint
+
+    def test_fingerprint_of_direct_construction(self):
+        """Test: Tariffs built without from_dict get distinct fingerprints (result cache key)"""
+        def flat(rate):
+            return Tariff('flat', [TariffSchedule('flat', [(None, rate)])])
+
+        assert flat(4.2).fingerprint == flat(4.2).fingerprint
+        assert flat(4.2).fingerprint != flat(5.0).fingerprint
+        assert flat(4.2).fingerprint
+        assert Tariff.from_dict(SIMPLE).fingerprint == Tariff.from_dict(dict(SIMPLE)).fingerprint
+
+
+class TestDefaultTariff:
+    """Test the shipped Thai residential tariff"""
+
+    def test_progressive(self):
+        """Test: Average rate rises with consumption above the type 1.1 cap"""
+        tariff = default_tariff()
+        bills = tariff.bill(np.array([200.0, 400.0, 800.0]))
+        rates = bills / np.array([200.0, 400.0, 800.0])
+        assert np.all(np.diff(rates) > 0)
+        assert tariff.describe(100.0)['schedule'].startswith('1.1')
+
+    def test_million_households(self):
+        """Test: One call prices a million values"""
+        kwh = np.random.default_rng(0).uniform(0, 1000, 1_000_000)
+        bills = default_tariff().bill(kwh)
+        assert bills.shape == kwh.shape and np.isfinite(bills).all()
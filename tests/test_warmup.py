@@ -0,0 +1,168 @@
+# tests/test_warmup.py
+"""
+Tests for the startup warm-up and readiness endpoint (core/warmup.py)
+"""
+import json
+import os
+import socket
+import threading
+import urllib.error
+import urllib.request
+
+import joblib
+import pytest
+
+from core import HotSwapPredictor, PredictionCore, ResultCache, Warmup, model_signature, serve_health, warm_predictor
+from core.predictor import MODEL_FILENAME
+from core import warmup as warmup_module
+from core.warmup import FAILED, PENDING, READY, process_warmup
+from tests.model_helpers import make_pipeline, predicted_kwh
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def get_health(port: int):
+    try:
+        with urllib.request.urlopen(f'http://127.0.0.1:{port}/health', timeout=5) as response:
+            return response.status, json.load(response)
+    except urllib.error.HTTPError as e:
+        return e.code, json.load(e)
+
+
+def make_core(models_path: str) -> PredictionCore:
+    return PredictionCore(models_path=models_path, use_prediction_table=False,
+                          use_compiled_model=False, result_cache=ResultCache())
+
+
+class TestWarmup:
+    """Test the background warm-up and its readiness report"""
+
+    def test_ready_after_steps(self):
+        """Test: Ready only once the load and every step ran, with per-step timings"""
+        order = []
+        warmup = Warmup(lambda: order.append('load') or 'value',
+                        steps=[('first', order.append), ('second', order.append)])
+        assert warmup.health()['status'] == PENDING and not warmup.ready
+
+        assert warmup.start() is warmup and warmup.start() is warmup  # idempotent
+        assert warmup.wait(10)
+        assert order == ['load', 'value', 'value']
+        assert warmup.value == 'value'
+        health = warmup.health()
+        assert health['status'] == READY and health['error'] is None
+        assert list(health['steps_ms']) == ['load', 'first', 'second']
+
+    def test_failure_reported(self):
+        """Test: A failing step leaves the warm-up not ready, with the reason"""
+        def broken(value):
+            raise RuntimeError("no model")
+
+        warmup = Warmup(lambda: 'value', steps=[('dummy_batch', broken)])
+        assert warmup.run() is False
+        assert warmup.status == FAILED and warmup.value is None
+        assert 'no model' in warmup.health()['error']
+
+    def test_failure_retried_with_backoff(self, monkeypatch):
+        """Test: A failed warm-up is retried only after its backoff, then recovers"""
+        clock = {'now': 100.0}
+        monkeypatch.setattr(warmup_module.time, 'monotonic', lambda: clock['now'])
+        model = {'published': False}
+
+        def load():
+            if not model['published']:
+                raise FileNotFoundError("no model")
+            return 'value'
+
+        warmup = Warmup(load, backoff=5.0)
+        assert warmup.run() is False and warmup.failures == 1
+        assert warmup.retry() is False  # backoff not over
+
+        clock['now'] += 5.0
+        assert warmup.retry() is True
+        assert warmup.wait(10) is False and warmup.failures == 2
+        clock['now'] += 5.0
+        assert warmup.retry() is False  # delay doubled
+
+        model['published'] = True
+        clock['now'] += 5.0
+        assert warmup.retry() is True
+        assert warmup.wait(10) and warmup.value == 'value'
+        assert warmup.health()['error'] is None and warmup.failures == 0
+        assert warmup.retry() is False
+
+    def test_health_endpoint(self):
+        """Test: /health answers 503 while warming and 200 once ready"""
+        release = threading.Event()
+        warmup = Warmup(lambda: release.wait(10))
+        server = serve_health(warmup, free_port(), host='127.0.0.1')
+        try:
+            warmup.start()
+            status, body = get_health(server.server_port)
+            assert status == 503 and body['ready'] is False
+
+            release.set()
+            assert warmup.wait(10)
+            status, body = get_health(server.server_port)
+            assert status == 200 and body['status'] == READY
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_one_per_process(self, monkeypatch):
+        """Test: The first caller builds and starts the warm-up; later callers adopt it"""
+        monkeypatch.setattr(warmup_module, '_process_warmup', None)
+        first = process_warmup(lambda: Warmup(lambda: 'value'))
+        second = process_warmup(lambda: pytest.fail("built twice"))
+        assert second is first
+        assert first.wait(10) and first.value == 'value'
+
+
+class TestWarmPredictor:
+    """Test the dummy batch against real predictors"""
+
+    def test_full_grid(self, tmp_path):
+        """Test: The dummy batch predicts the whole input grid and leaves the result cache untouched"""
+        joblib.dump(make_pipeline(100.0), tmp_path / MODEL_FILENAME)
+        core = make_core(str(tmp_path))
+        assert warm_predictor(core) == 240
+        assert core.result_cache.stats()['misses'] == 0
+
+    def test_no_model_fails(self, tmp_path):
+        """Test: Without a model the warm-up raises instead of reporting ready"""
+        core = make_core(str(tmp_path))
+        with pytest.raises(Exception):
+            warm_predictor(core)
+
+    def test_hot_swap_warms_before_swap(self, tmp_path):
+        """Test: A reloaded predictor is warmed before it serves; a failed warm-up keeps the old one"""
+        joblib.dump(make_pipeline(100.0), tmp_path / MODEL_FILENAME)
+        warmed = []
+        fail = {'on': False}
+
+        def warm(candidate):
+            if fail['on']:
+                raise RuntimeError("warm-up failed")
+            warmed.append(candidate)
+
+        handle = HotSwapPredictor(lambda: make_core(str(tmp_path)),
+                                  lambda: model_signature(str(tmp_path)), warm=warm)
+        old = handle.current
+
+        joblib.dump(make_pipeline(200.0), tmp_path / MODEL_FILENAME)
+        os.utime(tmp_path / MODEL_FILENAME, ns=(1, 1))
+        assert handle.refresh()
+        handle.wait(10)
+        assert warmed == [handle.current] and handle.current is not old
+        assert predicted_kwh(handle.current) == pytest.approx(800.0, abs=0.5)
+
+        fail['on'] = True
+        joblib.dump(make_pipeline(300.0), tmp_path / MODEL_FILENAME)
+        os.utime(tmp_path / MODEL_FILENAME, ns=(2, 2))
+        assert handle.refresh()
+        handle.wait(10)
+        assert handle.swaps == 1 and 'warm-up failed' in handle.last_error
+        assert predicted_kwh(handle.current) == pytest.approx(800.0, abs=0.5)
@@ -0,0 +1,19 @@
+"""
+Roo-Lot Training - Offline Data and Model Utilities
+
+Shared by the scripts in scripts/ (preprocessing, training, evaluation).
+Not imported by the Streamlit app.
+"""
+
+from .feature_pipeline import Stage, StageTiming, default_stages, run_stages, format_stage_report
+from .dataset_store import load_dataset, write_dataset
+
+__all__ = [
+    'Stage',
+    'StageTiming',
+    'default_stages',
+    'run_stages',
+    'format_stage_report',
+    'load_dataset',
+    'write_dataset'
+]
@@ -0,0 +1,151 @@
+"""
+Roo-Lot Training - Processed Dataset Storage
+
+Processed datasets are written as typed columnar files (Parquet) with compact
+dtypes, next to the CSV kept for humans and the report, plus a schema
+manifest. Every script loads through load_dataset(), which prefers the
+columnar file, reads only the requested columns and falls back to the CSV
+(with the same dtypes) when pyarrow or the Parquet file is missing.
+
+Layout (data/processed/):
+    train.parquet, train.csv
+    test.parquet, test.csv
+    schema.json   - {name: {format, path, rows, columns: {column: dtype}}}
+"""
+import json
+import os
+from datetime import datetime
+from typing import Dict, Optional, Sequence
+
+DEFAULT_DATA_DIR = 'data/processed'
+MANIFEST_FILENAME = 'schema.json'
+MANIFEST_VERSION = 1
+
+# int8 flags/counts and float32 ratios; the target stays float64 so metrics
+# reproduce exactly
+COMPACT_DTYPES = {
+    'household_size': 'int8',
+    'has_ac': 'int8',
+    'month': 'int8',
+    'season_hot': 'int8',
+    'season_rainy': 'int8',
+    'weekend_ratio': 'float32',
+    'energy_consumption_kwh': 'float64'
+}
+
+
+def columnar_available() -> bool:
+    """True when pyarrow (Parquet engine) is installed"""
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def compact_frame(df):
+    """Cast known columns to their compact dtypes (others untouched)"""
+    dtypes = {column: dtype for column, dtype in COMPACT_DTYPES.items() if column in df.columns}
+    return df.astype(dtypes)
+
+
+def read_manifest(data_dir: str = DEFAULT_DATA_DIR) -> Dict:
+    """Schema manifest ({} if missing or unreadable)"""
+    try:
+        with open(os.path.join(data_dir, MANIFEST_FILENAME), encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if manifest.get('version') == MANIFEST_VERSION else {}
+
+
+def _write_manifest(data_dir: str, manifest: Dict) -> None:
+    """Write the manifest atomically"""
+    path = os.path.join(data_dir, MANIFEST_FILENAME)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def write_dataset(df, name: str, data_dir: str = DEFAULT_DATA_DIR, write_csv: bool = True) -> Dict:
+    """
+    Save a processed dataset as Parquet (+ CSV) and record it in the manifest
+
+    Args:
+        df: Processed DataFrame
+        name: Dataset name ('train', 'test', ...)
+        data_dir: Output directory
+        write_csv: Also write <name>.csv
+
+    Returns:
+        dict: Manifest entry for the dataset
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    df = compact_frame(df).reset_index(drop=True)
+
+    if write_csv:
+        df.to_csv(os.path.join(data_dir, f'{name}.csv'), index=False)
+
+    if columnar_available():
+        filename = f'{name}.parquet'
+        tmp_path = os.path.join(data_dir, f'{filename}.tmp')
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, os.path.join(data_dir, filename))
+        file_format = 'parquet'
+    else:
+        filename = f'{name}.csv'
+        file_format = 'csv'
+
+    entry = {
+        'format': file_format,
+        'path': filename,
+        'rows': len(df),
+        'columns': {column: str(dtype) for column, dtype in df.dtypes.items()},
+        'written_at': datetime.now().isoformat(timespec='seconds')
+    }
+    manifest = read_manifest(data_dir) or {'version': MANIFEST_VERSION, 'datasets': {}}
+    manifest['datasets'][name] = entry
+    _write_manifest(data_dir, manifest)
+    return entry
+
+
+def load_dataset(name: str, columns: Optional[Sequence[str]] = None,
+                 data_dir: str = DEFAULT_DATA_DIR):
+    """
+    Load a processed dataset, preferring the columnar file
+
+    Args:
+        name: Dataset name ('train', 'test', ...)
+        columns: Only these columns (None = all)
+        data_dir: Directory holding the dataset
+
+    Returns:
+        DataFrame with compact dtypes
+
+    Raises:
+        FileNotFoundError: Neither Parquet nor CSV exists
+    """
+    import pandas as pd
+
+    columns = list(columns) if columns is not None else None
+    parquet_path = os.path.join(data_dir, f'{name}.parquet')
+    if columnar_available() and os.path.exists(parquet_path):
+        return pd.read_parquet(parquet_path, columns=columns)
+
+    csv_path = os.path.join(data_dir, f'{name}.csv')
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"Dataset '{name}' not found in {data_dir}")
+
+    header = pd.read_csv(csv_path, nrows=0).columns
+    usecols = columns if columns is not None else list(header)
+    dtypes = {column: dtype for column, dtype in COMPACT_DTYPES.items() if column in usecols}
+    df = pd.read_csv(csv_path, usecols=usecols, dtype=dtypes)
+    return df[usecols]
+
+
+def dataset_exists(name: str, data_dir: str = DEFAULT_DATA_DIR) -> bool:
+    """True if the dataset has a Parquet or CSV file"""
+    return any(
+        os.path.exists(os.path.join(data_dir, f'{name}.{ext}')) for ext in ('parquet', 'csv')
+    )
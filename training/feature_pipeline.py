@@ -0,0 +1,159 @@
+"""
+Roo-Lot Training - Feature Pipeline
+
+Columnar stage graph that turns the raw Kaggle household export into model
+features. Every stage is a whole-column operation (factorized labels mapped
+through small lookup tables, isin/between masks, indexed calendar lookups) -
+no apply, iterrows or per-row Python - so multi-million-row exports run in
+seconds.
+
+Each stage is timed; format_stage_report() prints rows/second per stage.
+"""
+import time
+from typing import Callable, List, NamedTuple, Optional
+
+import numpy as np
+
+from core.calendar_features import features_from_dates
+
+TARGET_COLUMN = 'energy_consumption_kwh'
+FEATURE_COLUMNS = ['household_size', 'has_ac', 'season_hot', 'season_rainy', 'weekend_ratio']
+OUTPUT_COLUMNS = FEATURE_COLUMNS + [TARGET_COLUMN]
+
+# Synthetic date distribution (the Kaggle export covers a single month)
+SYNTHETIC_YEAR = 2025
+
+HAS_AC_VALUES = {'yes': 1, 'no': 0, 'true': 1, 'false': 0, '1': 1, '0': 0}
+HOUSEHOLD_SIZE_RANGE = (1, 20)
+
+
+class Stage(NamedTuple):
+    """One node of the pipeline: a named DataFrame -> DataFrame function"""
+    name: str
+    func: Callable
+
+
+class StageTiming(NamedTuple):
+    """Timing of one executed stage"""
+    name: str
+    rows_in: int
+    rows_out: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_in / self.seconds if self.seconds > 0 else float('inf')
+
+
+def standardize_columns(df):
+    """Lower-case/strip column names and normalize the target column name"""
+    df = df.rename(columns=lambda c: c.strip().lower())
+    if TARGET_COLUMN not in df.columns:
+        possible_targets = [c for c in df.columns if 'consumption' in c or 'kwh' in c]
+        if possible_targets:
+            df = df.rename(columns={possible_targets[0]: TARGET_COLUMN})
+    return df
+
+
+def synthetic_dates(n: int, rng: np.random.Generator, year: int = SYNTHETIC_YEAR) -> np.ndarray:
+    """n dates drawn uniformly from every day of `year` (datetime64[D])"""
+    start = np.datetime64(f'{year}-01-01', 'D')
+    n_days = (np.datetime64(f'{year + 1}-01-01', 'D') - start).astype(int)
+    return start + rng.integers(0, n_days, size=n)
+
+
+def assign_synthetic_dates(rng: Optional[np.random.Generator] = None):
+    """Stage factory: spread rows over SYNTHETIC_YEAR (fix for single-month data)"""
+    rng = rng if rng is not None else np.random.default_rng()
+
+    def assign(df):
+        return df.assign(date=synthetic_dates(len(df), rng))
+    return assign
+
+
+def encode_has_ac(values) -> np.ndarray:
+    """
+    Encode Yes/No style labels as 1/0 (-1 for anything else)
+
+    Only the few distinct labels are normalized in Python; every row is then
+    encoded with one indexed lookup on the factorized codes.
+    """
+    import pandas as pd
+
+    if pd.api.types.is_numeric_dtype(values):
+        numeric = np.asarray(values, dtype=float)
+        return np.where(np.isin(numeric, (0, 1)), numeric, -1).astype(np.int64)
+
+    codes, uniques = pd.factorize(values)
+    # Trailing -1 catches NaN (factorize code -1)
+    lookup = np.array([HAS_AC_VALUES.get(str(label).strip().lower(), -1) for label in uniques] + [-1])
+    return lookup[codes]
+
+
+def clean_rows(df):
+    """Encode has_ac as 0/1 and keep rows with a valid household size and AC flag"""
+    has_ac = encode_has_ac(df['has_ac'])
+    low, high = HOUSEHOLD_SIZE_RANGE
+    mask = df['household_size'].between(low, high).to_numpy() & (has_ac >= 0)
+    return df.loc[mask].assign(has_ac=has_ac[mask])
+
+
+def add_calendar_features(df):
+    """Season flags and weekend ratio via the shared (year, month) lookup table"""
+    calendar = features_from_dates(df['date'])
+    return df.assign(
+        month=calendar['month'],
+        season_hot=calendar['season_hot'].astype(int),
+        season_rainy=calendar['season_rainy'].astype(int),
+        weekend_ratio=calendar['weekend_ratio']
+    )
+
+
+def select_output_columns(df):
+    """Final model columns (features + target)"""
+    return df[OUTPUT_COLUMNS]
+
+
+def default_stages(rng: Optional[np.random.Generator] = None) -> List[Stage]:
+    """Raw Kaggle export -> model features"""
+    return [
+        Stage('standardize_columns', standardize_columns),
+        Stage('synthetic_dates', assign_synthetic_dates(rng)),
+        Stage('clean_rows', clean_rows),
+        Stage('calendar_features', add_calendar_features),
+        Stage('select_columns', select_output_columns)
+    ]
+
+
+def run_stages(df, stages: List[Stage], timings: Optional[List[StageTiming]] = None):
+    """
+    Run stages in order, timing each one
+
+    Args:
+        df: Input DataFrame
+        stages: Pipeline stages
+        timings: Optional list that receives one StageTiming per stage
+
+    Returns:
+        DataFrame: Output of the last stage
+    """
+    for stage in stages:
+        rows_in = len(df)
+        start = time.perf_counter()
+        df = stage.func(df)
+        elapsed = time.perf_counter() - start
+        if timings is not None:
+            timings.append(StageTiming(stage.name, rows_in, len(df), elapsed))
+    return df
+
+
+def format_stage_report(timings: List[StageTiming]) -> str:
+    """Per-stage timing table with rows/second"""
+    lines = [f"{'Stage':<22}{'Rows in':>12}{'Rows out':>12}{'Seconds':>10}{'Rows/s':>16}"]
+    for t in timings:
+        lines.append(f"{t.name:<22}{t.rows_in:>12,}{t.rows_out:>12,}{t.seconds:>10.4f}{t.rows_per_second:>16,.0f}")
+    total = sum(t.seconds for t in timings)
+    rows = timings[0].rows_in if timings else 0
+    lines.append(f"{'TOTAL':<22}{rows:>12,}{timings[-1].rows_out if timings else 0:>12,}"
+                 f"{total:>10.4f}{(rows / total if total > 0 else 0):>16,.0f}")
+    return '\n'.join(lines)
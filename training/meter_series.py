@@ -0,0 +1,210 @@
+"""
+Roo-Lot Training - Multi-Meter Next-Month Features and Batch Forecasting
+
+Long-format version of training/next_month.py: one row per (meter, month)
+for any number of meters, columns as in the household sheet plus a meter id:
+
+    meter_id, date, amount(unit), electric_price, people, note
+
+The table is sorted once by (meter, date); every per-meter feature is then
+a vectorized operation on flat arrays instead of a Python loop or a
+groupby-apply per meter:
+
+- lagK_unit: value K rows back, masked where that row belongs to another meter
+- rollW_unit: mean of the last W months from one cumulative sum per column
+- is_break / breaks_rollW: break months (note contains "ปิดเทอม")
+- target_next_bill: next row's bill, masked at each meter's last month
+
+A pooled model is fit on every meter's complete examples, and
+BatchForecaster scores the latest month of every meter with a single
+predict() call.
+"""
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+from .next_month import BREAK_NOTE, TARGET_COLUMN, IncrementalRidge, clean_rows
+
+METER_COLUMN = 'meter_id'
+DEFAULT_LAGS = (1, 2)
+DEFAULT_WINDOWS = (3, 6)
+DEFAULT_FEATURES = ['current_unit', 'is_break', 'month', 'people', 'lag1_unit',
+                    'roll3_unit', 'breaks_roll3']
+
+
+def sort_meters(df, meter_col: str = METER_COLUMN):
+    """Clean rows and sort by (meter, date) - one stable lexsort for the whole table"""
+    df = clean_rows(df)
+    order = np.lexsort((df['date'].to_numpy(), df[meter_col].to_numpy()))
+    return df.iloc[order].reset_index(drop=True)
+
+
+def group_positions(meters: np.ndarray) -> np.ndarray:
+    """Row position within its meter's run (0 at each meter's first month), for sorted ids"""
+    n = len(meters)
+    if n == 0:
+        return np.zeros(0, dtype=np.int64)
+    starts = np.flatnonzero(np.r_[True, meters[1:] != meters[:-1]])
+    run_lengths = np.diff(np.r_[starts, n])
+    return np.arange(n) - np.repeat(starts, run_lengths)
+
+
+def grouped_shift(values: np.ndarray, positions: np.ndarray, k: int) -> np.ndarray:
+    """values shifted k rows down within each meter (NaN where the meter has < k earlier rows)"""
+    shifted = np.full(len(values), np.nan)
+    if 0 < k < len(values):
+        shifted[k:] = values[:-k]
+    shifted[positions < k] = np.nan
+    return shifted
+
+
+def grouped_lead(values: np.ndarray, meters: np.ndarray) -> np.ndarray:
+    """Next row's value within each meter (NaN at each meter's last row)"""
+    lead = np.full(len(values), np.nan)
+    if len(values) > 1:
+        lead[:-1] = values[1:]
+        lead[:-1][meters[1:] != meters[:-1]] = np.nan
+    return lead
+
+
+def grouped_rolling_mean(values: np.ndarray, positions: np.ndarray, window: int) -> np.ndarray:
+    """Mean of the current and window-1 previous months of the same meter (NaN until full or if any is NaN)"""
+    missing = np.isnan(values)
+    csum = np.concatenate([[0.0], np.cumsum(np.where(missing, 0.0, values))])
+    cmissing = np.concatenate([[0], np.cumsum(missing)])
+    idx = np.arange(len(values))
+    start = np.maximum(idx + 1 - window, 0)
+    mean = (csum[idx + 1] - csum[start]) / window
+    mean[(positions < window - 1) | (cmissing[idx + 1] > cmissing[start])] = np.nan
+    return mean
+
+
+def add_meter_features(df, lags: Sequence[int] = DEFAULT_LAGS,
+                       windows: Sequence[int] = DEFAULT_WINDOWS,
+                       meter_col: str = METER_COLUMN):
+    """
+    Per-meter target, lags, rolling means and break flags
+
+    Args:
+        df: sort_meters() output
+        lags: Unit lags (months back)
+        windows: Rolling-mean windows (months, including the current one)
+        meter_col: Meter id column
+
+    Returns:
+        DataFrame: df with the feature columns (NaN where history is too short)
+    """
+    import pandas as pd
+
+    meters = df[meter_col].to_numpy()
+    positions = group_positions(meters)
+    units = df['amount(unit)'].to_numpy(dtype=np.float64)
+    breaks = df['note'].str.contains(BREAK_NOTE, na=False).to_numpy()
+
+    features = {
+        TARGET_COLUMN: grouped_lead(df['electric_price'].to_numpy(dtype=np.float64), meters),
+        'current_bill': df['electric_price'].to_numpy(dtype=np.float64),
+        'current_unit': units,
+        'is_break': breaks.astype(np.int8),
+        'month': df['date'].dt.month.to_numpy(),
+        'people': pd.to_numeric(df['people']).to_numpy(dtype=np.float64),
+        'history_months': positions + 1
+    }
+    for k in lags:
+        features[f'lag{k}_unit'] = grouped_shift(units, positions, k)
+    for w in windows:
+        features[f'roll{w}_unit'] = grouped_rolling_mean(units, positions, w)
+        features[f'breaks_roll{w}'] = grouped_rolling_mean(breaks.astype(np.float64), positions, w) * w
+
+    out = df.copy()
+    for name, values in features.items():
+        out[name] = values
+    return out
+
+
+def training_examples(features_df, features: Sequence[str] = DEFAULT_FEATURES):
+    """Rows with a target and every model feature defined"""
+    mask = features_df[list(features) + [TARGET_COLUMN]].notna().all(axis=1)
+    return features_df[mask]
+
+
+def latest_months(features_df, meter_col: str = METER_COLUMN):
+    """Each meter's most recent month (the row whose next bill is unknown)"""
+    meters = features_df[meter_col].to_numpy()
+    last = np.r_[meters[1:] != meters[:-1], True] if len(meters) else np.zeros(0, dtype=bool)
+    return features_df[last]
+
+
+def fit_pooled(features_df, features: Sequence[str] = DEFAULT_FEATURES,
+               alpha: float = 1.0) -> IncrementalRidge:
+    """One Ridge over every meter's complete examples (statistics, so new months can be folded in)"""
+    examples = training_examples(features_df, features)
+    state = IncrementalRidge(list(features), alpha)
+    state.update(examples[list(features)], examples[TARGET_COLUMN])
+    return state
+
+
+class BatchForecaster:
+    """
+    Next-month bill for every meter in one predict() call
+
+    Args:
+        model: Fitted regressor over `features`
+        features: Model feature columns
+        lags: Lags used by the features
+        windows: Rolling windows used by the features
+        meter_col: Meter id column
+    """
+
+    def __init__(self, model, features: Sequence[str] = DEFAULT_FEATURES,
+                 lags: Sequence[int] = DEFAULT_LAGS, windows: Sequence[int] = DEFAULT_WINDOWS,
+                 meter_col: str = METER_COLUMN):
+        self.model = model
+        self.features = list(features)
+        self.lags = tuple(lags)
+        self.windows = tuple(windows)
+        self.meter_col = meter_col
+
+    def forecast(self, long_df, features_df=None):
+        """
+        Forecast the month after each meter's latest month
+
+        Meters with too little history for the features get NaN.
+
+        Args:
+            long_df: Raw long-format table (ignored when features_df is given)
+            features_df: Already computed add_meter_features() output
+
+        Returns:
+            DataFrame: meter_id, last_month, forecast_next_bill, history_months
+        """
+        import pandas as pd
+
+        if features_df is None:
+            features_df = add_meter_features(sort_meters(long_df, self.meter_col),
+                                             self.lags, self.windows, self.meter_col)
+        latest = latest_months(features_df, self.meter_col)
+        X = latest[self.features]
+        ready = X.notna().all(axis=1).to_numpy()
+
+        forecast = np.full(len(latest), np.nan)
+        if ready.any():
+            forecast[ready] = self.model.predict(X[ready])
+
+        return pd.DataFrame({
+            self.meter_col: latest[self.meter_col].to_numpy(),
+            'last_month': latest['date'].to_numpy(),
+            'forecast_next_bill': forecast,
+            'history_months': latest['history_months'].to_numpy()
+        })
+
+
+def forecast_summary(forecasts) -> Dict[str, Optional[float]]:
+    """Meters scored, meters skipped for short history, and the mean forecast"""
+    scored = forecasts['forecast_next_bill'].notna()
+    return {
+        'meters': int(len(forecasts)),
+        'scored': int(scored.sum()),
+        'insufficient_history': int((~scored).sum()),
+        'mean_forecast': float(forecasts.loc[scored, 'forecast_next_bill'].mean()) if scored.any() else None
+    }
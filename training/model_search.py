@@ -0,0 +1,302 @@
+"""
+Roo-Lot Training - Parallel Model-Family Search
+
+Cross-validated hyperparameter search over several model families at once.
+The CV folds and their scaled matrices (StandardScaler fit on each training
+fold only, as the Pipeline in GridSearchCV would) are computed once and
+shipped to every worker when the pool starts. Every (family, params, fold)
+fit is then one task on a single process pool, so all cores stay busy
+instead of one family's small grid at a time.
+
+Finished fits are appended to a JSONL checkpoint as they complete; a rerun
+with the same data and fold settings skips them, so an interrupted search
+resumes where it stopped.
+"""
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import numpy as np
+
+DEFAULT_N_SPLITS = 5
+DEFAULT_SEED = 42
+
+
+class SearchTask(NamedTuple):
+    """One fit: a family's estimator with one parameter set on one fold"""
+    family: str
+    params: Dict
+    fold: int
+    n_samples: Optional[int] = None  # first n training rows of the fold (None = all)
+
+
+class TaskResult(NamedTuple):
+    """Validation score of one finished task"""
+    family: str
+    params: Dict
+    fold: int
+    score: float
+    seconds: float
+
+
+class CandidateScore(NamedTuple):
+    """Cross-validated score of one (family, params) candidate"""
+    family: str
+    params: Dict
+    mean_score: float
+    std_score: float
+    fit_seconds: float
+
+
+def default_families() -> Dict:
+    """
+    Model families and grids searched by train_model_v2
+
+    Returns:
+        dict: family name -> {'model': estimator, 'params': grid}
+    """
+    from sklearn.ensemble import RandomForestRegressor
+    from sklearn.linear_model import Lasso, LinearRegression, Ridge
+
+    return {
+        'Linear Regression': {'model': LinearRegression(), 'params': {}},
+        'Ridge': {'model': Ridge(), 'params': {'alpha': [0.01, 0.1, 1.0, 10.0, 100.0]}},
+        'Lasso': {'model': Lasso(), 'params': {'alpha': [0.001, 0.01, 0.1, 1.0, 10.0]}},
+        # n_jobs=1: parallelism comes from the pool, not from inside a fit
+        'Random Forest': {
+            'model': RandomForestRegressor(random_state=DEFAULT_SEED, n_jobs=1),
+            'params': {
+                'n_estimators': [50, 100],
+                'max_depth': [10, 20, None],
+                'min_samples_split': [2, 5]
+            }
+        }
+    }
+
+
+def build_folds(X, y, n_splits: int = DEFAULT_N_SPLITS, seed: int = DEFAULT_SEED) -> List[Dict]:
+    """
+    Split once and scale each fold with a scaler fit on its training part
+
+    Training rows are stored in shuffled order, so the first n rows of a
+    fold are a random subsample (used by budgeted searches).
+
+    Returns:
+        list: One dict per fold with X_train, y_train, X_val, y_val (float64)
+    """
+    from sklearn.model_selection import KFold
+    from sklearn.preprocessing import StandardScaler
+
+    X = np.asarray(X, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    rng = np.random.default_rng(seed)
+    folds = []
+    for train_idx, val_idx in KFold(n_splits, shuffle=True, random_state=seed).split(X):
+        train_idx = rng.permutation(train_idx)
+        scaler = StandardScaler().fit(X[train_idx])
+        folds.append({
+            'X_train': scaler.transform(X[train_idx]),
+            'y_train': y[train_idx],
+            'X_val': scaler.transform(X[val_idx]),
+            'y_val': y[val_idx]
+        })
+    return folds
+
+
+def search_id(X, y, n_splits: int, seed: int) -> str:
+    """Identity of a search: data contents plus fold settings"""
+    digest = hashlib.sha256()
+    digest.update(np.ascontiguousarray(X, dtype=np.float64).tobytes())
+    digest.update(np.ascontiguousarray(y, dtype=np.float64).tobytes())
+    digest.update(f'{n_splits}:{seed}'.encode())
+    return digest.hexdigest()[:16]
+
+
+def expand_tasks(families: Dict, n_splits: int) -> List[SearchTask]:
+    """Every (family, params, fold) combination"""
+    from sklearn.model_selection import ParameterGrid
+
+    return [
+        SearchTask(family, dict(params), fold)
+        for family, config in families.items()
+        for params in ParameterGrid(config['params'])
+        for fold in range(n_splits)
+    ]
+
+
+def task_key(family: str, params: Dict, fold: int) -> str:
+    """Stable checkpoint key of a task"""
+    return json.dumps([family, params, fold], sort_keys=True, default=str)
+
+
+class Checkpoint:
+    """
+    Append-only JSONL record of finished tasks
+
+    Records from another search_id (different data or folds) are ignored,
+    as is a torn last line from an interrupted write.
+    """
+
+    def __init__(self, path: Optional[str], search: str):
+        self.path = path
+        self.search = search
+        self.done = {}
+        if path and os.path.exists(path):
+            self._drop_torn_line(path)
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue
+                    if record.get('search') != search:
+                        continue
+                    result = TaskResult(record['family'], record['params'], record['fold'],
+                                        record['score'], record['seconds'])
+                    self.done[task_key(result.family, result.params, result.fold)] = result
+
+    @staticmethod
+    def _drop_torn_line(path: str) -> None:
+        """Truncate a partial last line so new records start on their own line"""
+        with open(path, 'rb+') as f:
+            data = f.read()
+            if data and not data.endswith(b'\n'):
+                f.truncate(data.rfind(b'\n') + 1)
+
+    def add(self, result: TaskResult) -> None:
+        self.done[task_key(result.family, result.params, result.fold)] = result
+        if not self.path:
+            return
+        record = dict(result._asdict(), search=self.search)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, default=str) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+
+# Fold matrices of the current worker process (set once by the pool initializer)
+_worker_folds = None
+_worker_families = None
+
+
+def _init_worker(folds: List[Dict], families: Dict) -> None:
+    global _worker_folds, _worker_families
+    _worker_folds = folds
+    _worker_families = families
+
+
+def _run_task(task: SearchTask) -> TaskResult:
+    """Fit one candidate on one fold and score it on the validation part"""
+    from sklearn.base import clone
+    from sklearn.metrics import r2_score
+
+    fold = _worker_folds[task.fold]
+    rows = slice(task.n_samples)
+    model = clone(_worker_families[task.family]['model']).set_params(**task.params)
+    start = time.perf_counter()
+    model.fit(fold['X_train'][rows], fold['y_train'][rows])
+    seconds = time.perf_counter() - start
+    score = r2_score(fold['y_val'], model.predict(fold['X_val']))
+    return TaskResult(task.family, task.params, task.fold, float(score), seconds)
+
+
+@contextmanager
+def worker_pool(folds: List[Dict], families: Dict, n_jobs: int):
+    """
+    Process pool whose workers hold the fold matrices
+
+    Yields None when n_jobs == 1 (tasks then run in-process).
+    """
+    if n_jobs == 1:
+        _init_worker(folds, families)
+        yield None
+        return
+
+    # No plain fork: the parent may already run BLAS/OpenMP threads
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(folds, families),
+                             mp_context=multiprocessing.get_context(method)) as pool:
+        yield pool
+
+
+def execute(tasks: List[SearchTask], pool) -> Iterable[TaskResult]:
+    """Yield results as tasks finish (in-process when pool is None)"""
+    if pool is None:
+        for task in tasks:
+            yield _run_task(task)
+        return
+
+    futures = [pool.submit(_run_task, task) for task in tasks]
+    for future in as_completed(futures):
+        yield future.result()
+
+
+def run_search(X, y, families: Optional[Dict] = None, n_splits: int = DEFAULT_N_SPLITS,
+               n_jobs: Optional[int] = None, checkpoint_path: Optional[str] = None,
+               seed: int = DEFAULT_SEED, verbose: bool = False) -> List[CandidateScore]:
+    """
+    Cross-validate every family's grid on shared folds with one process pool
+
+    Args:
+        X: Training features
+        y: Training target
+        families: name -> {'model': estimator, 'params': grid} (default_families())
+        n_splits: CV folds
+        n_jobs: Worker processes (default: all cores; 1 runs in-process)
+        checkpoint_path: JSONL file for finished fits (None = no checkpoint)
+        seed: Fold shuffle seed
+        verbose: Print progress per finished task
+
+    Returns:
+        list: CandidateScore per (family, params), best mean score first
+    """
+    families = families if families is not None else default_families()
+    n_jobs = n_jobs or os.cpu_count() or 1
+
+    checkpoint = Checkpoint(checkpoint_path, search_id(X, y, n_splits, seed))
+    tasks = expand_tasks(families, n_splits)
+    pending = [t for t in tasks if task_key(t.family, t.params, t.fold) not in checkpoint.done]
+    if verbose and len(pending) < len(tasks):
+        print(f"Resuming search: {len(tasks) - len(pending)}/{len(tasks)} fits already done")
+
+    if pending:
+        folds = build_folds(X, y, n_splits, seed)
+        with worker_pool(folds, families, n_jobs) as pool:
+            for i, result in enumerate(execute(pending, pool), start=1):
+                checkpoint.add(result)
+                if verbose:
+                    print(f"  [{i}/{len(pending)}] {result.family} {result.params} "
+                          f"fold {result.fold}: R2={result.score:.4f} ({result.seconds:.2f}s)")
+
+    return summarize(checkpoint.done[task_key(t.family, t.params, t.fold)] for t in tasks)
+
+
+def summarize(results: Iterable[TaskResult]) -> List[CandidateScore]:
+    """Aggregate fold results per (family, params), best mean score first"""
+    grouped = {}
+    for result in results:
+        grouped.setdefault(task_key(result.family, result.params, -1), []).append(result)
+
+    scores = []
+    for fold_results in grouped.values():
+        values = np.array([r.score for r in fold_results])
+        scores.append(CandidateScore(
+            fold_results[0].family, fold_results[0].params,
+            float(values.mean()), float(values.std()),
+            float(sum(r.seconds for r in fold_results))
+        ))
+    return sorted(scores, key=lambda s: s.mean_score, reverse=True)
+
+
+def best_per_family(scores: List[CandidateScore]) -> Dict[str, CandidateScore]:
+    """Highest mean CV score of each family"""
+    best = {}
+    for score in scores:
+        if score.family not in best or score.mean_score > best[score.family].mean_score:
+            best[score.family] = score
+    return best
@@ -0,0 +1,196 @@
+"""
+Roo-Lot Training - Size/Latency-Aware Model Selection
+
+Test R² alone picks a 2 MB RandomForest even when a linear model is within
+noise of it. This module measures what serving a candidate costs and can
+choose the cheapest model whose R² is within a tolerance of the best:
+
+- size_bytes: serialized size with the same joblib.dump settings as the save
+- load_ms: time to unpickle that payload
+- single_p50_ms / single_p99_ms: predict() latency for one row
+- batch_p50_ms / batch_p99_ms: predict() latency for batch_rows rows
+
+With r2_tolerance=0 the selection is the plain best test R², as before.
+"""
+import io
+import json
+import os
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+import numpy as np
+
+DEFAULT_BATCH_ROWS = 10_000
+DEFAULT_SINGLE_REPEATS = 200
+DEFAULT_BATCH_REPEATS = 10
+DEFAULT_LOAD_REPEATS = 3
+
+# prefer -> profile field minimized among candidates within the tolerance
+SELECTION_CRITERIA = {
+    'size': 'size_bytes',
+    'latency': 'single_p50_ms',
+    'batch_latency': 'batch_p50_ms',
+    'load': 'load_ms'
+}
+
+
+class ArtifactProfile(NamedTuple):
+    """Serving cost of one fitted model"""
+    size_bytes: int
+    load_ms: float
+    single_p50_ms: float
+    single_p99_ms: float
+    batch_p50_ms: float
+    batch_p99_ms: float
+    batch_rows: int
+
+
+class Candidate(NamedTuple):
+    """Fitted model with its test score and serving profile"""
+    name: str
+    model: object
+    r2: float
+    profile: ArtifactProfile
+
+
+def latency_ms(func: Callable, repeats: int) -> np.ndarray:
+    """Wall time of each of `repeats` calls, in milliseconds (after one warm-up call)"""
+    func()
+    timings = np.empty(repeats)
+    for i in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings[i] = time.perf_counter() - start
+    return timings * 1000
+
+
+def batch_frame(X, rows: int):
+    """First `rows` rows of X, tiled when X is shorter"""
+    if len(X) >= rows:
+        return X.iloc[:rows] if hasattr(X, 'iloc') else X[:rows]
+    reps = -(-rows // len(X))
+    if hasattr(X, 'iloc'):
+        import pandas as pd
+        return pd.concat([X] * reps, ignore_index=True).iloc[:rows]
+    return np.concatenate([X] * reps)[:rows]
+
+
+def profile_model(model, X, batch_rows: int = DEFAULT_BATCH_ROWS,
+                  dump_kwargs: Optional[Dict] = None,
+                  single_repeats: int = DEFAULT_SINGLE_REPEATS,
+                  batch_repeats: int = DEFAULT_BATCH_REPEATS) -> ArtifactProfile:
+    """
+    Measure size, load time and inference latency of a fitted model
+
+    Args:
+        model: Fitted estimator or pipeline
+        X: Sample inputs (DataFrame as served, e.g. X_test)
+        batch_rows: Rows per batch prediction (X is tiled if shorter)
+        dump_kwargs: joblib.dump options used when the model is saved
+        single_repeats: Single-row predictions timed
+        batch_repeats: Batch predictions timed
+
+    Returns:
+        ArtifactProfile
+    """
+    import joblib
+
+    buffer = io.BytesIO()
+    joblib.dump(model, buffer, **(dump_kwargs or {}))
+    payload = buffer.getvalue()
+
+    def load():
+        joblib.load(io.BytesIO(payload))
+
+    single = X.iloc[:1] if hasattr(X, 'iloc') else X[:1]
+    batch = batch_frame(X, batch_rows)
+    load_times = latency_ms(load, DEFAULT_LOAD_REPEATS)
+    single_times = latency_ms(lambda: model.predict(single), single_repeats)
+    batch_times = latency_ms(lambda: model.predict(batch), batch_repeats)
+
+    return ArtifactProfile(
+        size_bytes=len(payload),
+        load_ms=float(np.median(load_times)),
+        single_p50_ms=float(np.percentile(single_times, 50)),
+        single_p99_ms=float(np.percentile(single_times, 99)),
+        batch_p50_ms=float(np.percentile(batch_times, 50)),
+        batch_p99_ms=float(np.percentile(batch_times, 99)),
+        batch_rows=len(batch)
+    )
+
+
+def select_model(candidates: List[Candidate], r2_tolerance: float = 0.0,
+                 prefer: str = 'size') -> Candidate:
+    """
+    Cheapest candidate whose R² is within r2_tolerance of the best
+
+    Args:
+        candidates: Profiled candidates
+        r2_tolerance: Allowed R² gap to the best candidate (0 = best R² only)
+        prefer: 'size', 'latency', 'batch_latency' or 'load'
+
+    Returns:
+        Candidate: Selected model (ties broken by higher R²)
+    """
+    if not candidates:
+        raise ValueError("No candidates to select from")
+    if prefer not in SELECTION_CRITERIA:
+        raise ValueError(f"Unknown selection criterion: {prefer}")
+    if r2_tolerance < 0:
+        raise ValueError("r2_tolerance must be >= 0")
+
+    best_r2 = max(c.r2 for c in candidates)
+    if r2_tolerance == 0:
+        return next(c for c in candidates if c.r2 == best_r2)
+
+    field = SELECTION_CRITERIA[prefer]
+    eligible = [c for c in candidates if c.r2 >= best_r2 - r2_tolerance]
+    return min(eligible, key=lambda c: (getattr(c.profile, field), -c.r2))
+
+
+def selection_metadata(candidates: List[Candidate], selected: Candidate,
+                       r2_tolerance: float, prefer: str) -> Dict:
+    """JSON-ready summary of every candidate's score and serving cost"""
+    return {
+        'selected': selected.name,
+        'r2_tolerance': r2_tolerance,
+        'prefer': prefer if r2_tolerance > 0 else 'r2',
+        'candidates': {
+            c.name: dict(
+                test_r2=float(c.r2),
+                **{field: (float(value) if isinstance(value, float) else int(value))
+                   for field, value in c.profile._asdict().items()}
+            )
+            for c in candidates
+        }
+    }
+
+
+def format_selection_table(candidates: List[Candidate], selected: Candidate) -> str:
+    """Candidates with R², size, load time and latency (selected marked *)"""
+    lines = [f"  {'Model':<20}{'Test R2':>9}{'Size':>11}{'Load ms':>9}"
+             f"{'1-row p50':>11}{'batch p50':>11}"]
+    for c in sorted(candidates, key=lambda c: c.r2, reverse=True):
+        p = c.profile
+        mark = '*' if c.name == selected.name else ' '
+        lines.append(f"{mark} {c.name:<20}{c.r2:>9.4f}{p.size_bytes / 1024:>9.1f}KB{p.load_ms:>9.2f}"
+                     f"{p.single_p50_ms:>9.3f}ms{p.batch_p50_ms:>9.2f}ms")
+    return '\n'.join(lines)
+
+
+def write_model_metadata(path: str, metadata: Dict) -> None:
+    """Write model metadata JSON atomically (numpy scalars converted)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(metadata, f, indent=2, default=json_default)
+    os.replace(tmp_path, path)
+
+
+def json_default(value):
+    """json.dump default: numpy scalars/arrays to Python, anything else to str"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
@@ -0,0 +1,313 @@
+"""
+Roo-Lot Training - Next-Month Bill Model (incremental)
+
+Feature logic and an incrementally updatable Ridge model for the monthly
+bill series used by scripts/retrain_v2.py.
+
+A new month only changes the tail of the series: it supplies the target of
+the previous month's row and lags for itself. Instead of rebuilding every
+lag and refitting, IncrementalRidge keeps Ridge's sufficient statistics
+(n, Σx, Σy, XᵀX, Xᵀy) plus the last TAIL_ROWS raw rows. append() runs the
+same feature code on tail + new rows only, folds the newly completed
+examples into the statistics and re-solves a d x d system - the result is
+exactly sklearn Ridge fit on every example, in milliseconds.
+
+Published artifacts are versioned and switched atomically:
+    <base>.versions/v000001.pkl, v000001.state.json, ...
+    <base>.json   - pointer to the current version (replaced atomically)
+    <base>.pkl    - copy of the current model for existing consumers
+"""
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+BREAK_NOTE = "ปิดเทอม"
+DEFAULT_PEOPLE = 2
+TARGET_COLUMN = 'target_next_bill'
+RAW_COLUMNS = ['date', 'amount(unit)', 'electric_price', 'people', 'note']
+CANDIDATE_FEATURES = ['current_bill', 'current_unit', 'lag1_unit', 'lag2_unit', 'is_break', 'month', 'people']
+
+# Raw rows needed to rebuild the features of the newest rows (2 lags + the row itself)
+TAIL_ROWS = 3
+
+STATE_VERSION = 1
+
+
+def clean_rows(df):
+    """Row-local cleaning: break months without a head count -> 0 people, else 2; parse dates"""
+    import pandas as pd
+
+    df = df.copy()
+    df['note'] = df['note'].fillna('')
+    mask_break = df['note'].str.contains(BREAK_NOTE, na=False)
+    df.loc[mask_break & df['people'].isna(), 'people'] = 0
+    df['people'] = df['people'].fillna(DEFAULT_PEOPLE)
+    df['date'] = pd.to_datetime(df['date'], format='%m/%d/%Y', errors='coerce')
+    return df
+
+
+def add_features(df):
+    """Target (next bill), current values, lags, break flag and month - NaN where undefined"""
+    import pandas as pd
+
+    df = df.copy()
+    df[TARGET_COLUMN] = df['electric_price'].shift(-1)
+    df['current_bill'] = df['electric_price']
+    df['current_unit'] = df['amount(unit)']
+    df['lag1_unit'] = df['amount(unit)'].shift(1)
+    df['lag2_unit'] = df['amount(unit)'].shift(2)
+    df['is_break'] = df['note'].str.contains(BREAK_NOTE, na=False).astype(int)
+    df['month'] = df['date'].dt.month
+    df['people'] = pd.to_numeric(df['people'])
+    return df
+
+
+def complete_examples(df):
+    """Rows with every lag and a target (lag rows at the start, last row at the end drop out)"""
+    return df.dropna().reset_index(drop=True)
+
+
+class IncrementalRidge:
+    """
+    Ridge regression maintained from sufficient statistics
+
+    Matches sklearn.linear_model.Ridge(alpha, fit_intercept=True) fit on every
+    example seen so far: the centered Gram matrix is XᵀX - n·x̄x̄ᵀ.
+
+    Args:
+        features: Feature columns, in model order
+        alpha: L2 penalty
+    """
+
+    def __init__(self, features: List[str], alpha: float = 1.0):
+        d = len(features)
+        self.features = list(features)
+        self.alpha = alpha
+        self.n = 0
+        self.sum_x = np.zeros(d)
+        self.sum_y = 0.0
+        self.xtx = np.zeros((d, d))
+        self.xty = np.zeros(d)
+        self.tail = []  # last TAIL_ROWS cleaned raw rows (records)
+
+    def update(self, X, y) -> None:
+        """Fold examples into the statistics"""
+        X = np.asarray(X, dtype=np.float64).reshape(-1, len(self.features))
+        y = np.asarray(y, dtype=np.float64)
+        self.n += len(y)
+        self.sum_x += X.sum(axis=0)
+        self.sum_y += y.sum()
+        self.xtx += X.T @ X
+        self.xty += X.T @ y
+
+    def solve(self):
+        """(coef, intercept) of the Ridge fit on every example so far"""
+        if self.n == 0:
+            raise ValueError("No examples yet")
+        mean_x = self.sum_x / self.n
+        mean_y = self.sum_y / self.n
+        gram = self.xtx - self.n * np.outer(mean_x, mean_x)
+        cross = self.xty - self.n * mean_x * mean_y
+        coef = np.linalg.solve(gram + self.alpha * np.eye(len(self.features)), cross)
+        return coef, float(mean_y - mean_x @ coef)
+
+    def to_model(self):
+        """Fitted sklearn Ridge with the current solution"""
+        from sklearn.linear_model import Ridge
+
+        coef, intercept = self.solve()
+        model = Ridge(alpha=self.alpha)
+        model.coef_ = coef
+        model.intercept_ = intercept
+        model.n_features_in_ = len(self.features)
+        model.feature_names_in_ = np.array(self.features, dtype=object)
+        return model
+
+    @classmethod
+    def from_history(cls, cleaned, features: List[str], alpha: float = 1.0,
+                     examples=None) -> 'IncrementalRidge':
+        """
+        Statistics from a full cleaned series
+
+        Args:
+            cleaned: clean_rows() output sorted by date
+            features: Model features
+            alpha: L2 penalty
+            examples: Examples to fit (default: every complete example of the series)
+        """
+        state = cls(features, alpha)
+        if examples is None:
+            examples = complete_examples(add_features(cleaned))
+        state.update(examples[features], examples[TARGET_COLUMN])
+        state.tail = _tail_records(cleaned)
+        return state
+
+    def append(self, new_rows) -> Dict:
+        """
+        Add new months: features for the tail only, then update the fit
+
+        Args:
+            new_rows: Raw rows (RAW_COLUMNS) newer than the last row seen
+
+        Returns:
+            dict: 'rows_added', 'examples_added', 'errors' (one-step-ahead
+                error of the previous model on each new example), 'seconds'
+
+        Raises:
+            ValueError: A new row is not after the last row seen
+        """
+        import pandas as pd
+
+        start = time.perf_counter()
+        new = clean_rows(new_rows[RAW_COLUMNS]).sort_values('date')
+        tail = pd.DataFrame.from_records(self.tail, columns=RAW_COLUMNS)
+        tail['date'] = pd.to_datetime(tail['date'])
+        if len(tail) and new['date'].min() <= tail['date'].max():
+            raise ValueError("New rows must be after the last month already trained on")
+
+        window = pd.concat([tail, new], ignore_index=True)
+        engineered = add_features(window)
+        # The last tail row gets its target now; earlier tail rows were already counted
+        fresh = complete_examples(engineered.iloc[max(len(tail) - 1, 0):])
+
+        errors = []
+        if len(fresh) and self.n:
+            previous = self.to_model()
+            errors = (fresh[TARGET_COLUMN] - previous.predict(fresh[self.features])).tolist()
+        self.update(fresh[self.features], fresh[TARGET_COLUMN])
+        self.tail = _tail_records(window)
+
+        return {
+            'rows_added': len(new),
+            'examples_added': len(fresh),
+            'errors': errors,
+            'seconds': time.perf_counter() - start
+        }
+
+    def to_state(self) -> Dict:
+        return {
+            'version': STATE_VERSION,
+            'features': self.features,
+            'alpha': self.alpha,
+            'n': self.n,
+            'sum_x': self.sum_x.tolist(),
+            'sum_y': self.sum_y,
+            'xtx': self.xtx.tolist(),
+            'xty': self.xty.tolist(),
+            'tail': self.tail
+        }
+
+    @classmethod
+    def from_state(cls, state: Dict) -> 'IncrementalRidge':
+        if state.get('version') != STATE_VERSION:
+            raise ValueError(f"Unsupported state version: {state.get('version')}")
+        model = cls(state['features'], state['alpha'])
+        model.n = state['n']
+        model.sum_x = np.array(state['sum_x'])
+        model.sum_y = state['sum_y']
+        model.xtx = np.array(state['xtx'])
+        model.xty = np.array(state['xty'])
+        model.tail = state['tail']
+        return model
+
+
+def _tail_records(cleaned) -> List[Dict]:
+    """Last TAIL_ROWS raw rows as JSON-ready records"""
+    tail = cleaned[RAW_COLUMNS].tail(TAIL_ROWS).copy()
+    tail['date'] = tail['date'].dt.strftime('%Y-%m-%d')
+    return [
+        {k: (v.item() if isinstance(v, np.generic) else v) for k, v in record.items()}
+        for record in tail.to_dict('records')
+    ]
+
+
+def pointer_path(base_path: str) -> str:
+    """<base>.json for <base>.pkl"""
+    return f'{os.path.splitext(base_path)[0]}.json'
+
+
+def read_pointer(base_path: str) -> Optional[Dict]:
+    """Current published version (None if nothing published yet)"""
+    try:
+        with open(pointer_path(base_path), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def load_published(base_path: str) -> Optional[IncrementalRidge]:
+    """Incremental state of the current version"""
+    pointer = read_pointer(base_path)
+    if pointer is None:
+        return None
+    directory = os.path.dirname(pointer_path(base_path))
+    with open(os.path.join(directory, pointer['state']), encoding='utf-8') as f:
+        return IncrementalRidge.from_state(json.load(f))
+
+
+def publish(state: IncrementalRidge, base_path: str, info: Optional[Dict] = None) -> Dict:
+    """
+    Write a new version and switch the pointer to it atomically
+
+    Version files are created exclusively and never overwritten; readers see
+    either the old or the new pointer, never a partial file.
+
+    Args:
+        state: Model state to publish
+        base_path: Model path, e.g. models/model_v2_next_month.pkl
+        info: Extra pointer fields (metrics, ...)
+
+    Returns:
+        dict: The new pointer
+    """
+    import joblib
+
+    root = os.path.splitext(base_path)[0]
+    directory = os.path.dirname(base_path) or '.'
+    versions_dir = f'{root}.versions'
+    os.makedirs(versions_dir, exist_ok=True)
+
+    previous = read_pointer(base_path)
+    version = (previous['version'] if previous else 0) + 1
+    while True:
+        name = f'v{version:06d}'
+        model_file = os.path.join(versions_dir, f'{name}.pkl')
+        state_file = os.path.join(versions_dir, f'{name}.state.json')
+        try:
+            with open(model_file, 'xb') as f:
+                joblib.dump(state.to_model(), f)
+            break
+        except FileExistsError:
+            version += 1
+    _atomic_write_text(state_file, json.dumps(state.to_state()))
+
+    pointer = {
+        'version': version,
+        'model': os.path.relpath(model_file, directory),
+        'state': os.path.relpath(state_file, directory),
+        'n_examples': state.n,
+        'features': state.features,
+        'published_at': datetime.now().isoformat(timespec='seconds')
+    }
+    pointer.update(info or {})
+
+    # Legacy path first, then the pointer: the pointer never names a model
+    # that is not fully in place
+    tmp_model = f'{base_path}.tmp'
+    joblib.dump(state.to_model(), tmp_model)
+    os.replace(tmp_model, base_path)
+    _atomic_write_text(pointer_path(base_path), json.dumps(pointer, indent=2))
+    return pointer
+
+
+def _atomic_write_text(path: str, text: str) -> None:
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
@@ -0,0 +1,225 @@
+"""
+Roo-Lot Training - IQR Outlier Filter
+
+Rows outside [Q1 - k·IQR, Q3 + k·IQR] in any target column are dropped.
+All column quartiles come from one quantile call, every column is checked
+in one vectorized comparison, and the frame is indexed once with the
+combined mask - instead of a quantile/copy per column on a shrinking frame.
+Bounds are therefore computed on the full data, not on the rows surviving
+earlier columns.
+
+For inputs too large to hold or sort, ColumnQuantileSketch estimates the
+quartiles in one streaming pass (KLL-style compactors, O(k log n) memory);
+the bounds are then applied chunk by chunk and the per-chunk reports merged.
+
+Per-column counts:
+- flagged: rows outside that column's bounds
+- removed: rows attributed to the first failing column in column order
+  (sums to the total removed, like the old per-column loop)
+"""
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+IQR_MULTIPLIER = 1.5
+QUARTILES = (0.25, 0.75)
+
+# Items per compactor level; rank error is roughly 1/DEFAULT_SKETCH_SIZE
+DEFAULT_SKETCH_SIZE = 2048
+
+
+class IQRBounds(NamedTuple):
+    """Accepted range per column"""
+    columns: Tuple[str, ...]
+    lower: np.ndarray
+    upper: np.ndarray
+
+    def as_dict(self) -> Dict[str, Tuple[float, float]]:
+        return {c: (float(lo), float(hi)) for c, lo, hi in zip(self.columns, self.lower, self.upper)}
+
+
+class OutlierReport(NamedTuple):
+    """Rows before/after the filter and per-column counts"""
+    rows_in: int
+    rows_out: int
+    flagged: Dict[str, int]
+    removed: Dict[str, int]
+
+    @property
+    def total_removed(self) -> int:
+        return self.rows_in - self.rows_out
+
+
+def bounds_from_quartiles(columns: Sequence[str], q1, q3,
+                          multiplier: float = IQR_MULTIPLIER) -> IQRBounds:
+    q1 = np.asarray(q1, dtype=np.float64)
+    q3 = np.asarray(q3, dtype=np.float64)
+    iqr = q3 - q1
+    return IQRBounds(tuple(columns), q1 - multiplier * iqr, q3 + multiplier * iqr)
+
+
+def iqr_bounds(df, columns: Sequence[str], multiplier: float = IQR_MULTIPLIER) -> IQRBounds:
+    """Exact bounds: both quartiles of every column in one quantile() call"""
+    quartiles = df[list(columns)].quantile(list(QUARTILES))
+    return bounds_from_quartiles(columns, quartiles.iloc[0].to_numpy(), quartiles.iloc[1].to_numpy(),
+                                 multiplier)
+
+
+def outlier_mask(df, bounds: IQRBounds) -> Tuple[np.ndarray, OutlierReport]:
+    """
+    Combined keep-mask for all columns
+
+    A missing value fails its column's check (as the old >=/<= filter did).
+
+    Returns:
+        (keep, report): Boolean mask over df's rows and its OutlierReport
+    """
+    values = df[list(bounds.columns)].to_numpy(dtype=np.float64)
+    inside = (values >= bounds.lower) & (values <= bounds.upper)
+    keep = inside.all(axis=1)
+
+    failing = ~inside
+    first_failing = np.argmax(failing, axis=1)[~keep]
+    removed = np.bincount(first_failing, minlength=len(bounds.columns))
+    flagged = failing.sum(axis=0)
+
+    report = OutlierReport(
+        rows_in=len(df),
+        rows_out=int(keep.sum()),
+        flagged={c: int(n) for c, n in zip(bounds.columns, flagged)},
+        removed={c: int(n) for c, n in zip(bounds.columns, removed)}
+    )
+    return keep, report
+
+
+def filter_outliers(df, columns: Sequence[str], multiplier: float = IQR_MULTIPLIER,
+                    bounds: Optional[IQRBounds] = None):
+    """
+    Drop IQR outliers in one pass
+
+    Args:
+        df: Input frame
+        columns: Columns checked
+        multiplier: k in Q1 - k·IQR / Q3 + k·IQR
+        bounds: Precomputed bounds (e.g. from a sketch); computed from df if None
+
+    Returns:
+        (DataFrame, OutlierReport)
+    """
+    if bounds is None:
+        bounds = iqr_bounds(df, columns, multiplier)
+    keep, report = outlier_mask(df, bounds)
+    return df[keep], report
+
+
+def merge_reports(reports: List[OutlierReport]) -> OutlierReport:
+    """Sum of per-chunk reports"""
+    columns = list(reports[0].flagged) if reports else []
+    return OutlierReport(
+        rows_in=sum(r.rows_in for r in reports),
+        rows_out=sum(r.rows_out for r in reports),
+        flagged={c: sum(r.flagged[c] for r in reports) for c in columns},
+        removed={c: sum(r.removed[c] for r in reports) for c in columns}
+    )
+
+
+def format_outlier_report(report: OutlierReport) -> str:
+    """Per-column lines for columns with removals, then the total"""
+    lines = []
+    for column, removed in report.removed.items():
+        if removed > 0:
+            extra = report.flagged[column] - removed
+            also = f" ({extra} more also outside other columns' bounds)" if extra else ''
+            lines.append(f"  {column}: Removed {removed} outliers{also}")
+    lines.append(f"\nTotal outliers removed: {report.total_removed}")
+    return '\n'.join(lines)
+
+
+class QuantileSketch:
+    """
+    Streaming approximate quantiles of one column (KLL-style compactor stack)
+
+    Level h holds items of weight 2^h. A full level is sorted and every other
+    item (random offset) moves up, halving its size; memory stays at about
+    size·log2(n/size) items whatever the stream length.
+
+    Args:
+        size: Items per level before it is compacted
+        seed: Offset randomness (fixed for reproducible bounds)
+    """
+
+    def __init__(self, size: int = DEFAULT_SKETCH_SIZE, seed: int = 0):
+        self.size = size
+        self.levels: List[np.ndarray] = [np.empty(0)]
+        self.count = 0
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values) -> None:
+        """Add a chunk of values (NaN ignored)"""
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        self.count += len(values)
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self._compact()
+
+    def _compact(self) -> None:
+        h = 0
+        while h < len(self.levels):
+            level = self.levels[h]
+            if len(level) > self.size:
+                level = np.sort(level)
+                # Odd leftover stays at this level, so total weight is preserved exactly
+                keep_last = len(level) % 2
+                body = level[:len(level) - keep_last]
+                promoted = body[self._rng.integers(2)::2]
+                self.levels[h] = level[len(level) - keep_last:]
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def quantiles(self, qs: Sequence[float]) -> np.ndarray:
+        """Approximate quantiles (NaN if the sketch is empty)"""
+        if self.count == 0:
+            return np.full(len(qs), np.nan)
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(level), 2.0 ** h) for h, level in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        items, cumulative = items[order], np.cumsum(weights[order])
+        # Item whose cumulative weight first reaches q of the total
+        ranks = np.asarray(qs, dtype=np.float64) * cumulative[-1]
+        index = np.minimum(np.searchsorted(cumulative, ranks, side='left'), len(items) - 1)
+        return items[index]
+
+
+class ColumnQuantileSketch:
+    """
+    QuantileSketch per column, fed chunk by chunk
+
+    Args:
+        columns: Columns sketched
+        size: Items per compactor level
+    """
+
+    def __init__(self, columns: Sequence[str], size: int = DEFAULT_SKETCH_SIZE):
+        self.columns = tuple(columns)
+        self.sketches = {c: QuantileSketch(size, seed=i) for i, c in enumerate(self.columns)}
+
+    def update(self, df) -> None:
+        for column, sketch in self.sketches.items():
+            sketch.update(df[column].to_numpy())
+
+    def quantiles(self, qs: Sequence[float], columns: Optional[Sequence[str]] = None):
+        """DataFrame shaped like df[columns].quantile(qs) (default: every sketched column)"""
+        import pandas as pd
+
+        columns = list(columns) if columns is not None else list(self.columns)
+        return pd.DataFrame({c: self.sketches[c].quantiles(qs) for c in columns}, index=list(qs))
+
+    def iqr_bounds(self, columns: Optional[Sequence[str]] = None,
+                   multiplier: float = IQR_MULTIPLIER) -> IQRBounds:
+        """Approximate IQR bounds of some or all sketched columns"""
+        columns = list(columns) if columns is not None else list(self.columns)
+        quartiles = self.quantiles(QUARTILES, columns)
+        return bounds_from_quartiles(columns, quartiles.iloc[0].to_numpy(),
+                                     quartiles.iloc[1].to_numpy(), multiplier)
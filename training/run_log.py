@@ -0,0 +1,267 @@
+"""
+Roo-Lot Training - Run Records
+
+Every training entry point appends one structured record per run to an
+append-only JSONL log (models/run_log.jsonl), so regressions between
+retrains show up as a diff between two lines:
+
+- dataset: content hash, rows, feature list, target
+- fit_seconds: wall time per model family (search_seconds for CV searches)
+- peak_rss_bytes: peak resident memory of the process (and of pool workers)
+- model: type, path, bytes on disk, sha256
+- latency: p50/p99 predict() time for 1 row and for 10k rows
+- metrics: whatever the script evaluated (test R², MAE, ...)
+
+Records are only ever appended; a torn last line from an interrupted write
+is skipped when reading.
+"""
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+from .model_selection import ArtifactProfile, DEFAULT_BATCH_ROWS, json_default, profile_model
+
+RUN_LOG_PATH = 'models/run_log.jsonl'
+RECORD_VERSION = 1
+
+
+def dataset_hash(X, y=None) -> str:
+    """Content hash of the training data (row order and values, not the index)"""
+    import pandas as pd
+
+    digest = hashlib.sha256()
+    for part in (X, y):
+        if part is None:
+            continue
+        if not isinstance(part, (pd.DataFrame, pd.Series)):
+            part = pd.DataFrame(part)
+        digest.update(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes())
+        if isinstance(part, pd.DataFrame):
+            digest.update(','.join(map(str, part.columns)).encode())
+    return digest.hexdigest()[:16]
+
+
+def file_sha256(path: str) -> str:
+    """sha256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def peak_memory() -> Dict[str, Optional[int]]:
+    """Peak RSS in bytes of this process and its finished children (None where unsupported)"""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return {'self': None, 'children': None}
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    scale = 1 if sys.platform == 'darwin' else 1024
+    return {
+        'self': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale,
+        'children': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * scale
+    }
+
+
+def git_commit() -> Optional[str]:
+    """Current commit of the working tree (None outside a git checkout)"""
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                                text=True, timeout=5, check=True)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+class RunRecorder:
+    """
+    Collects one training run's facts and appends them to the run log
+
+    Usage:
+        recorder = RunRecorder('train_model_v2.py', X_train, y_train)
+        with recorder.time_fit('Ridge'):
+            model.fit(X_train, y_train)
+        recorder.finish(model, X_test, model_path='models/model.pkl', metrics={...})
+
+    Args:
+        script: Entry point name
+        X: Training features (hashed, feature list taken from its columns)
+        y: Training target (hashed)
+        features: Feature names (default: X.columns)
+        log_path: Run log file
+    """
+
+    def __init__(self, script: str, X, y=None, features: Optional[Sequence[str]] = None,
+                 log_path: str = RUN_LOG_PATH):
+        self.script = script
+        self.log_path = log_path
+        self.started = time.perf_counter()
+        self.started_at = datetime.now().isoformat(timespec='seconds')
+        self.fit_seconds = {}
+        self.search_seconds = {}
+        self.dataset = {
+            'hash': dataset_hash(X, y),
+            'rows': len(X),
+            'features': list(features) if features is not None else list(getattr(X, 'columns', [])),
+            'target': getattr(y, 'name', None)
+        }
+
+    @contextmanager
+    def time_fit(self, family: str):
+        """Add the wall time of the block to fit_seconds[family]"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add_fit_time(family, time.perf_counter() - start)
+
+    def add_fit_time(self, family: str, seconds: float) -> None:
+        self.fit_seconds[family] = self.fit_seconds.get(family, 0.0) + seconds
+
+    def add_search_time(self, family: str, seconds: float) -> None:
+        """CV search time of a family (summed fit time of its candidates)"""
+        self.search_seconds[family] = self.search_seconds.get(family, 0.0) + seconds
+
+    def build(self, model, X_sample, model_path: Optional[str] = None, metrics: Optional[Dict] = None,
+              profile: Optional[ArtifactProfile] = None, extra: Optional[Dict] = None) -> Dict:
+        """
+        Assemble the run record
+
+        Args:
+            model: Final fitted model
+            X_sample: Inputs for the latency benchmark (tiled to 10k rows)
+            model_path: Saved artifact (bytes and sha256 taken from disk)
+            metrics: Evaluation results
+            profile: Already measured ArtifactProfile of the model (skips re-measuring)
+            extra: Script-specific fields
+
+        Returns:
+            dict: The record
+        """
+        if profile is None or profile.batch_rows != DEFAULT_BATCH_ROWS:
+            profile = profile_model(model, X_sample)
+
+        final = model.steps[-1][1] if hasattr(model, 'steps') else model
+        model_info = {'type': type(final).__name__, 'bytes': profile.size_bytes}
+        if model_path and os.path.exists(model_path):
+            model_info.update(path=os.path.relpath(model_path), bytes=os.path.getsize(model_path),
+                              sha256=file_sha256(model_path))
+
+        memory = peak_memory()
+        record = {
+            'version': RECORD_VERSION,
+            'run_id': uuid.uuid4().hex[:12],
+            'script': self.script,
+            'started_at': self.started_at,
+            'finished_at': datetime.now().isoformat(timespec='seconds'),
+            'total_seconds': time.perf_counter() - self.started,
+            'git_commit': git_commit(),
+            'environment': {
+                'python': platform.python_version(),
+                'sklearn': _package_version('sklearn'),
+                'numpy': _package_version('numpy'),
+                'machine': platform.machine(),
+                'cpu_count': os.cpu_count()
+            },
+            'dataset': self.dataset,
+            'fit_seconds': self.fit_seconds,
+            'search_seconds': self.search_seconds,
+            'peak_rss_bytes': memory['self'],
+            'peak_rss_children_bytes': memory['children'],
+            'model': model_info,
+            'latency': {
+                'single_row': {'p50_ms': profile.single_p50_ms, 'p99_ms': profile.single_p99_ms},
+                f'batch_{profile.batch_rows}': {'p50_ms': profile.batch_p50_ms, 'p99_ms': profile.batch_p99_ms},
+                'load_ms': profile.load_ms
+            },
+            'metrics': metrics or {}
+        }
+        if extra:
+            record['extra'] = extra
+        return record
+
+    def finish(self, model, X_sample, model_path: Optional[str] = None, metrics: Optional[Dict] = None,
+               profile: Optional[ArtifactProfile] = None, extra: Optional[Dict] = None) -> Dict:
+        """Build the record, append it to the run log and print a summary"""
+        record = self.build(model, X_sample, model_path, metrics, profile, extra)
+        previous = last_record(self.log_path, self.script)
+        append_run_record(record, self.log_path)
+        print(format_run_record(record, previous))
+        return record
+
+
+def append_run_record(record: Dict, path: str = RUN_LOG_PATH) -> None:
+    """Append one record as a JSON line (never rewrites earlier lines)"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    line = json.dumps(record, default=json_default, separators=(',', ':'))
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(line + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def read_run_log(path: str = RUN_LOG_PATH) -> List[Dict]:
+    """All complete records, oldest first"""
+    if not os.path.exists(path):
+        return []
+    records = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+def last_record(path: str = RUN_LOG_PATH, script: Optional[str] = None) -> Optional[Dict]:
+    """Most recent record (of one script when given)"""
+    records = [r for r in read_run_log(path) if script is None or r.get('script') == script]
+    return records[-1] if records else None
+
+
+def format_run_record(record: Dict, previous: Optional[Dict] = None) -> str:
+    """One-screen summary, with the change against the previous run of the script"""
+    latency = record['latency']
+    batch_key = next(k for k in latency if k.startswith('batch_'))
+    rows = [
+        ('Model bytes', record['model']['bytes'], _get(previous, 'model', 'bytes'), '{:,.0f}'),
+        ('1-row p50 ms', latency['single_row']['p50_ms'], _get(previous, 'latency', 'single_row', 'p50_ms'), '{:.3f}'),
+        ('1-row p99 ms', latency['single_row']['p99_ms'], _get(previous, 'latency', 'single_row', 'p99_ms'), '{:.3f}'),
+        (f'{batch_key} p50 ms', latency[batch_key]['p50_ms'], _get(previous, 'latency', batch_key, 'p50_ms'), '{:.2f}'),
+        (f'{batch_key} p99 ms', latency[batch_key]['p99_ms'], _get(previous, 'latency', batch_key, 'p99_ms'), '{:.2f}'),
+        ('Total seconds', record['total_seconds'], _get(previous, 'total_seconds'), '{:.1f}')
+    ]
+    if record.get('peak_rss_bytes'):
+        rows.append(('Peak RSS MB', record['peak_rss_bytes'] / 2 ** 20,
+                     (_get(previous, 'peak_rss_bytes') or 0) / 2 ** 20 or None, '{:.1f}'))
+
+    lines = [f"Run {record['run_id']} ({record['script']}, dataset {record['dataset']['hash']})"]
+    for label, value, before, fmt in rows:
+        change = ''
+        if before:
+            change = f"  ({(value - before) / before:+.0%} vs previous)"
+        lines.append(f"  {label:<22}{fmt.format(value):>14}{change}")
+    return '\n'.join(lines)
+
+
+def _get(record: Optional[Dict], *keys):
+    for key in keys:
+        if not isinstance(record, dict):
+            return None
+        record = record.get(key)
+    return record
+
+
+def _package_version(name: str) -> Optional[str]:
+    module = sys.modules.get(name)
+    return getattr(module, '__version__', None) if module else None
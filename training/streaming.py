@@ -0,0 +1,196 @@
+"""
+Roo-Lot Training - Streaming Preprocessing
+
+Chunked mode for inputs larger than memory (multi-GB smart-meter dumps):
+the CSV is read chunk_size rows at a time, each chunk runs through the
+feature stage graph, and rows go to train/test by a hash of their row key.
+The split is therefore reproducible and independent of chunk size or row
+order. Results are appended as numbered shards, so peak memory is one chunk
+whatever the input size.
+
+Shard layout (ParquetShardWriter writes .parquet with compact dtypes):
+    <output_dir>/train/part-00000.csv, part-00001.csv, ...
+    <output_dir>/test/part-00000.csv, ...
+"""
+import os
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from .feature_pipeline import StageTiming, default_stages, run_stages, standardize_columns
+from .dataset_store import compact_frame
+
+DEFAULT_CHUNK_SIZE = 250_000
+DEFAULT_TEST_FRACTION = 0.2
+
+# Raw Kaggle export columns identifying one reading
+DEFAULT_KEY_COLUMNS = ('household_id', 'date')
+
+# Resolution of the hash split (fractions are rounded to 1/HASH_BUCKETS)
+HASH_BUCKETS = 10_000
+
+SPLITS = ('train', 'test')
+
+
+def hash_split(keys, test_fraction: float = DEFAULT_TEST_FRACTION) -> np.ndarray:
+    """
+    Deterministic train/test assignment from row keys
+
+    Args:
+        keys: DataFrame (or Series) of key columns
+        test_fraction: Share of keys assigned to test
+
+    Returns:
+        np.ndarray: True for test rows
+    """
+    import pandas as pd
+
+    if not 0 <= test_fraction <= 1:
+        raise ValueError("test_fraction must be between 0 and 1")
+    hashes = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+    return (hashes % HASH_BUCKETS) < int(round(test_fraction * HASH_BUCKETS))
+
+
+class ShardWriter:
+    """
+    Append-only shard files per split
+
+    Shards are never rewritten: numbering continues after the shards already
+    in the directory, and each file is written to a temp name and renamed.
+    """
+
+    def __init__(self, output_dir: str, suffix: str = '.csv'):
+        self.output_dir = output_dir
+        self.suffix = suffix
+        self.next_index = {}
+        self.rows_written = {split: 0 for split in SPLITS}
+        self.paths = {split: [] for split in SPLITS}
+        for split in SPLITS:
+            os.makedirs(os.path.join(output_dir, split), exist_ok=True)
+            self.next_index[split] = len(list_shards(output_dir, split, suffix))
+
+    def write(self, split: str, df) -> Optional[str]:
+        """Write one shard (skipped when df is empty); returns its path"""
+        if len(df) == 0:
+            return None
+        index = self.next_index[split]
+        path = os.path.join(self.output_dir, split, f'part-{index:05d}{self.suffix}')
+        tmp_path = f'{path}.tmp'
+        self._write_file(df, tmp_path)
+        os.replace(tmp_path, path)
+
+        self.next_index[split] = index + 1
+        self.rows_written[split] += len(df)
+        self.paths[split].append(path)
+        return path
+
+    def _write_file(self, df, path: str) -> None:
+        df.to_csv(path, index=False)
+
+
+class ParquetShardWriter(ShardWriter):
+    """Append-only Parquet shards with compact dtypes (needs pyarrow)"""
+
+    def __init__(self, output_dir: str):
+        super().__init__(output_dir, suffix='.parquet')
+
+    def _write_file(self, df, path: str) -> None:
+        compact_frame(df).to_parquet(path, index=False)
+
+
+def list_shards(output_dir: str, split: str, suffix: str = '.csv') -> List[str]:
+    """Shard paths of one split in write order"""
+    split_dir = os.path.join(output_dir, split)
+    if not os.path.isdir(split_dir):
+        return []
+    return sorted(
+        os.path.join(split_dir, name) for name in os.listdir(split_dir)
+        if name.startswith('part-') and name.endswith(suffix)
+    )
+
+
+def iter_shards(output_dir: str, split: str, columns: Optional[Sequence[str]] = None,
+                suffix: str = '.csv') -> Iterator:
+    """Yield the DataFrame of each shard of a split (.csv or .parquet)"""
+    import pandas as pd
+
+    for path in list_shards(output_dir, split, suffix):
+        if suffix == '.parquet':
+            yield pd.read_parquet(path, columns=columns)
+        else:
+            yield pd.read_csv(path, usecols=columns)
+
+
+def stream_pipeline(csv_path: str, output_dir: str, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                    test_fraction: float = DEFAULT_TEST_FRACTION,
+                    key_columns: Optional[Sequence[str]] = None, seed: int = 42,
+                    writer: Optional[ShardWriter] = None) -> Dict:
+    """
+    Preprocess a CSV chunk by chunk into train/test shards
+
+    Args:
+        csv_path: Raw export (any size)
+        output_dir: Shard directory (shards are appended)
+        chunk_size: Rows held in memory at a time
+        test_fraction: Share of row keys assigned to test
+        key_columns: Row key for the split (default household_id + date when
+            present, otherwise every raw column)
+        seed: Seed for synthetic dates (chunk i uses [seed, i])
+        writer: Custom ShardWriter (e.g. a columnar format)
+
+    Returns:
+        dict: 'rows_read', 'rows_written' per split, 'chunks', 'timings'
+            (StageTiming per stage summed over chunks), 'shards' per split
+    """
+    import pandas as pd
+
+    writer = writer or ShardWriter(output_dir)
+    totals = {}
+    rows_read = 0
+    chunks = 0
+
+    for chunk_index, chunk in enumerate(pd.read_csv(csv_path, chunksize=chunk_size)):
+        chunk = standardize_columns(chunk)
+        keys = _key_frame(chunk, key_columns)
+        is_test = pd.Series(hash_split(keys, test_fraction), index=chunk.index)
+
+        timings = []
+        rng = np.random.default_rng([seed, chunk_index])
+        out = run_stages(chunk, default_stages(rng), timings)
+        _accumulate(totals, timings)
+
+        test_mask = is_test.loc[out.index].to_numpy()
+        writer.write('train', out[~test_mask])
+        writer.write('test', out[test_mask])
+
+        rows_read += len(chunk)
+        chunks += 1
+
+    return {
+        'rows_read': rows_read,
+        'rows_written': dict(writer.rows_written),
+        'chunks': chunks,
+        'timings': list(totals.values()),
+        'shards': {split: list(paths) for split, paths in writer.paths.items()}
+    }
+
+
+def _key_frame(chunk, key_columns: Optional[Sequence[str]]):
+    """Columns identifying each row for the hash split"""
+    if key_columns is None:
+        present = [c for c in DEFAULT_KEY_COLUMNS if c in chunk.columns]
+        key_columns = present if len(present) == len(DEFAULT_KEY_COLUMNS) else list(chunk.columns)
+    return chunk[list(key_columns)]
+
+
+def _accumulate(totals: Dict, timings: List[StageTiming]) -> None:
+    """Sum per-chunk stage timings by stage name"""
+    for t in timings:
+        previous = totals.get(t.name)
+        if previous is None:
+            totals[t.name] = t
+        else:
+            totals[t.name] = StageTiming(
+                t.name, previous.rows_in + t.rows_in,
+                previous.rows_out + t.rows_out, previous.seconds + t.seconds
+            )
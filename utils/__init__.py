@@ -9,11 +9,14 @@ from .js_injector import (
     inject_loading_overlay,
     inject_quick_reply_styles
 )
+from .latency_budget import ux_delay, get_latency_budget
 
 __all__ = [
     'ElectricityPredictor',
     'inject_smooth_scroll',
     'inject_custom_scrollbar',
     'inject_loading_overlay',
-    'inject_quick_reply_styles'
+    'inject_quick_reply_styles',
+    'ux_delay',
+    'get_latency_budget'
 ]
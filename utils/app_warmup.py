@@ -0,0 +1,61 @@
+"""
+Roo-Lot Chatbot - Startup Warm-Up
+
+Builds the app's process-wide warm-up (core.warmup): the hot-swappable
+predictor, a full-grid dummy batch and the stylesheet caches, plus the
+readiness endpoint when ROO_LOT_HEALTH_PORT is set.
+
+The compiled model artifact (models/*.compiled.npz, gitignored) is exported
+on first load if missing, since only its memory-mapped arrays are shared
+between worker processes.
+
+Everything here runs off the script thread, so the predictor is a headless
+PredictionCore (Streamlit calls would be dropped there); the app reports
+load problems and prediction errors itself (utils.model_predictor).
+
+Started by scripts/serve_app.py before Streamlit accepts connections, or by
+the first script run under plain `streamlit run app_chatbot.py`.
+"""
+import os
+
+from core.hot_swap import HotSwapPredictor
+from core.predictor import PredictionCore
+from core.warmup import HEALTH_PORT_ENV, Warmup, process_warmup, serve_health, warm_predictor
+from utils.style_registry import warm_styles
+
+# Stylesheets emitted on every page (name -> path, as passed to emit_style)
+APP_STYLESHEETS = {'global': os.path.join('assets', 'styles.css')}
+
+
+def build_app_warmup(save_prediction_table: bool = False) -> Warmup:
+    """
+    New (not started) warm-up for the app
+
+    Args:
+        save_prediction_table: Write the prediction table artifact if missing or stale
+
+    Returns:
+        Warmup: value is a HotSwapPredictor once ready
+    """
+    def load():
+        # Export the compiled artifact if missing: workers share only its mapped arrays
+        return HotSwapPredictor(lambda: PredictionCore(save_prediction_table=save_prediction_table,
+                                                       save_compiled_model=True),
+                                warm=warm_predictor)
+
+    return Warmup(load, steps=[
+        ('dummy_batch', lambda handle: warm_predictor(handle.current)),
+        ('css', lambda handle: warm_styles(APP_STYLESHEETS))
+    ])
+
+
+def start_app_warmup() -> Warmup:
+    """Start (or return, retrying after a failure) this process's warm-up and its readiness endpoint"""
+    def build():
+        warmup = build_app_warmup()
+        port = os.environ.get(HEALTH_PORT_ENV)
+        if port:
+            serve_health(warmup, int(port))
+        return warmup
+
+    return process_warmup(build)
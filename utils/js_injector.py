@@ -4,6 +4,7 @@ Roo-Lot Chatbot - JavaScript Injector
 
 import streamlit as st
 import streamlit.components.v1 as components
+from utils.style_registry import emit_style
 
 def inject_smooth_scroll():
     """Inject JavaScript for smooth auto-scrolling to latest message"""
@@ -47,9 +48,9 @@ def inject_smooth_scroll():
     """, height=0)
 
 def inject_custom_scrollbar():
-    """Inject custom scrollbar styles"""
+    """Inject custom scrollbar styles (sent once per session)"""
     
-    st.markdown("""
+    emit_style('scrollbar', """
     <style>
     /* Custom scrollbar for chat container */
     [data-testid="stVerticalBlock"]::-webkit-scrollbar {
@@ -69,20 +70,13 @@ def inject_custom_scrollbar():
         background: #2a2a2a;
     }
     </style>
-    """, unsafe_allow_html=True)
+    """)
 
 def inject_loading_overlay():
-    """Inject loading overlay for predictions"""
+    """Inject loading overlay for predictions (styles sent once per session)"""
     
     if st.session_state.get('is_processing', False):
-        st.markdown("""
-        <div class="loading-overlay">
-            <div class="loading-spinner">
-                <div class="spinner-ring"></div>
-                <div class="spinner-text">กำลังคำนวณ...</div>
-            </div>
-        </div>
-        
+        emit_style('loading-overlay', """
         <style>
         .loading-overlay {
             position: fixed;
@@ -97,11 +91,11 @@ def inject_loading_overlay():
             z-index: 9999;
             animation: fadeIn 0.3s ease-out;
         }
-        
+
         .loading-spinner {
             text-align: center;
         }
-        
+
         .spinner-ring {
             width: 60px;
             height: 60px;
@@ -111,25 +105,33 @@ def inject_loading_overlay():
             border-radius: 50%;
             animation: spin 1s linear infinite;
         }
-        
+
         .spinner-text {
             font-family: var(--font-mono);
             font-size: 14px;
             color: var(--color-text-secondary);
         }
-        
+
         @keyframes spin {
             to {
                 transform: rotate(360deg);
             }
         }
         </style>
+        """)
+        st.markdown("""
+        <div class="loading-overlay">
+            <div class="loading-spinner">
+                <div class="spinner-ring"></div>
+                <div class="spinner-text">กำลังคำนวณ...</div>
+            </div>
+        </div>
         """, unsafe_allow_html=True)
 
 def inject_quick_reply_styles():
-    """Inject styles for quick reply buttons"""
+    """Inject styles for quick reply buttons (sent once per session)"""
     
-    st.markdown("""
+    emit_style('quick-reply', """
     <style>
     /* Quick reply container */
     .quick-replies {
@@ -163,4 +165,4 @@ def inject_quick_reply_styles():
         transform: translateY(0);
     }
     </style>
-    """, unsafe_allow_html=True)
+    """)
@@ -0,0 +1,45 @@
+"""
+Roo-Lot Chatbot - UX Latency Budget
+
+Single switch for artificial server-side pauses in the conversation flow.
+Perceived "thinking" time is handled by CSS animations in the browser, so in
+production the budget is 0 and no Streamlit script thread ever sleeps.
+Set ROO_LOT_LATENCY_BUDGET (seconds) to re-enable capped pauses, e.g. for
+demos or recording screenshots.
+"""
+
+import os
+import time
+
+LATENCY_BUDGET_ENV = 'ROO_LOT_LATENCY_BUDGET'
+DEFAULT_LATENCY_BUDGET = 0.0
+
+
+def get_latency_budget() -> float:
+    """
+    Max seconds any single UX pause may block the script thread
+
+    Returns:
+        float: Budget from ROO_LOT_LATENCY_BUDGET (invalid/negative -> default)
+    """
+    try:
+        budget = float(os.environ.get(LATENCY_BUDGET_ENV, DEFAULT_LATENCY_BUDGET))
+    except ValueError:
+        return DEFAULT_LATENCY_BUDGET
+    return max(budget, 0.0)
+
+
+def ux_delay(seconds: float) -> float:
+    """
+    Pause for UX purposes, capped by the latency budget
+
+    Args:
+        seconds: Requested pause
+
+    Returns:
+        float: Seconds actually slept (0 when the budget is 0)
+    """
+    delay = min(max(seconds, 0.0), get_latency_budget())
+    if delay > 0:
+        time.sleep(delay)
+    return delay
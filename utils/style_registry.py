@@ -0,0 +1,184 @@
+"""
+Roo-Lot Chatbot - Style Registry
+
+Builds every stylesheet once per process and sends it to the browser once
+per session.
+
+- Generated CSS (themes, assets/styles.css) is cached process-wide, keyed by
+  name and a hash of its source (theme dict / file mtime+size), so editing a
+  theme or the stylesheet invalidates the entry automatically.
+- emit_style() injects a <style id="roo-lot-style-<name>-<hash>"> element into
+  the parent document's <head> through a zero-height component. The element
+  outlives the Streamlit rerun that created it, so later reruns of the same
+  session send nothing; the id guard makes repeated emits no-ops in the
+  browser and replaces older versions of the same style name.
+"""
+
+import functools
+import hashlib
+import json
+import os
+import re
+import threading
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+STYLE_ID_PREFIX = 'roo-lot-style'
+SESSION_KEY = '_emitted_styles'
+
+_STYLE_TAG = re.compile(r'^\s*<style[^>]*>(.*)</style>\s*$', re.DOTALL)
+
+_css_cache = {}
+_cache_lock = threading.Lock()
+
+
+def content_hash(content) -> str:
+    """Short stable hash of a string or JSON-serializable object"""
+    if not isinstance(content, str):
+        content = json.dumps(content, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()[:12]
+
+
+def strip_style_tags(css: str) -> str:
+    """Return the stylesheet body of a '<style>...</style>' block"""
+    match = _STYLE_TAG.match(css)
+    return match.group(1) if match else css
+
+
+def cached_css(name: str, source_hash: str, build) -> str:
+    """
+    Build CSS once per process for (name, source_hash)
+
+    Args:
+        name: Style name (e.g. 'theme-dark')
+        source_hash: Hash of whatever the CSS is generated from
+        build: Zero-argument callable producing the CSS
+
+    Returns:
+        str: Cached CSS
+    """
+    key = (name, source_hash)
+    css = _css_cache.get(key)
+    if css is None:
+        css = build()
+        with _cache_lock:
+            # Drop stale versions of the same style
+            for stale in [k for k in _css_cache if k[0] == name]:
+                del _css_cache[stale]
+            _css_cache[key] = css
+    return css
+
+
+def theme_css(theme_name: str = 'dark') -> str:
+    """Cached utils.theme_system.generate_css for a theme"""
+    from utils.theme_system import THEMES, generate_css
+
+    theme = THEMES.get(theme_name, THEMES['dark'])
+    return cached_css(f'theme-{theme_name}', content_hash(theme), lambda: generate_css(theme_name))
+
+
+def file_css(path: str) -> str:
+    """
+    Cached contents of a stylesheet on disk
+
+    Returns:
+        str: File contents ('' if the file does not exist)
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return ''
+
+    def read():
+        with open(path, encoding='utf-8') as f:
+            return f.read()
+
+    return cached_css(f'file-{path}', f'{stat.st_mtime_ns}-{stat.st_size}', read)
+
+
+def warm_styles(files: dict) -> int:
+    """
+    Read and prepare file stylesheets before the first session needs them
+
+    Only fills the process-wide caches (no Streamlit calls), so it can run on
+    the startup warm-up thread.
+
+    Args:
+        files: emit name -> stylesheet path (same names later passed to emit_style)
+
+    Returns:
+        int: Stylesheets prepared
+    """
+    prepared = 0
+    for name, path in files.items():
+        css = file_css(path)
+        if css:
+            _prepare(name, css)
+            prepared += 1
+    return prepared
+
+
+def _injection_html(styles: dict) -> str:
+    """Script adding each style to the parent <head> unless already present"""
+    payload = [
+        {'id': style_id, 'name': name, 'css': css}
+        for name, (style_id, css) in styles.items()
+    ]
+    # Keep '</style>' / '</script>' inside the CSS from closing the script tag
+    data = json.dumps(payload, ensure_ascii=False).replace('</', '<\\/')
+    return f"""
+    <script>
+    const head = window.parent.document.head;
+    for (const style of {data}) {{
+        if (head.querySelector('#' + style.id)) continue;
+        head.querySelectorAll('style[data-roo-lot-style="' + style.name + '"]').forEach((old) => old.remove());
+        const element = window.parent.document.createElement('style');
+        element.id = style.id;
+        element.dataset.rooLotStyle = style.name;
+        element.textContent = style.css;
+        head.appendChild(element);
+    }}
+    </script>
+    """
+
+
+@functools.lru_cache(maxsize=256)
+def _prepare(name: str, css: str) -> tuple:
+    """(element id, stylesheet body) - memoized so reruns skip the hashing"""
+    body = strip_style_tags(css)
+    return f'{STYLE_ID_PREFIX}-{name}-{content_hash(body)}', body
+
+
+def emit_styles(styles: dict) -> list:
+    """
+    Send styles not yet emitted in this session, in one component
+
+    Args:
+        styles: name -> CSS (with or without <style> tags)
+
+    Returns:
+        list: Names actually sent on this run
+    """
+    emitted = st.session_state.setdefault(SESSION_KEY, set())
+
+    pending = {}
+    for name, css in styles.items():
+        style_id, body = _prepare(name, css)
+        if style_id not in emitted:
+            pending[name] = (style_id, body)
+
+    if pending:
+        components.html(_injection_html(pending), height=0)
+        emitted.update(style_id for style_id, _ in pending.values())
+    return list(pending)
+
+
+def emit_style(name: str, css: str) -> bool:
+    """
+    Send one style once per session
+
+    Returns:
+        bool: True if the style was sent on this run
+    """
+    return bool(emit_styles({name: css}))
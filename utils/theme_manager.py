@@ -14,6 +14,8 @@ from typing import Literal, Dict, Any, Optional
 from dataclasses import dataclass
 from pathlib import Path
 
+from utils.style_registry import emit_style
+
 ThemeOption = Literal["muji", "minimal", "dark"]
 LanguageOption = Literal["th", "en"]
 
@@ -300,7 +302,8 @@ class ThemeManager:
         </style>
         """
         
-        st.markdown(css, unsafe_allow_html=True)
+        # Sent once per session; a changed config yields a new style id
+        emit_style('theme-custom', css)
     
     @staticmethod
     def get_color_palette() -> Dict[str, str]: